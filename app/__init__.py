@@ -1,14 +1,30 @@
+import os
+
 from flask import Flask
 
-from app.config import Config
-from app.models import db, migrate
+from app.cache import init_cache
+from app.compaction import init_compaction
+from app.compression import init_compression
+from app.config import config_by_name, configure_engines
+from app.events import init_events
+from app.log import init_logging
+from app.metrics import init_metrics
+from app.models import db, init_migrate
+from app.replicas import init_replicas
+from app.scheduler import init_scheduler
+from app.sharding import init_sharding
+from app.templating import init_templates
+from app.write_queue import init_write_queue
 
 
-def create_app(config_object=None):
+def create_app(config_object=None, config_name=None):
     """Create and configure the Flask application.
 
     Args:
-        config_object (str): The configuration object to use.
+        config_object (dict): Configuration values overriding the profile.
+        config_name (str): The configuration profile to use: "development",
+            "testing" or "production". Defaults to the ``APP_CONFIG``
+            environment variable, then to "development".
 
     Returns:
         Flask: The configured Flask application.
@@ -16,18 +32,49 @@ def create_app(config_object=None):
     """
     app = Flask(__name__)
 
-    app.config.from_object(Config)
+    config_class = config_by_name[config_name or os.getenv("APP_CONFIG", "default")]
+    app.config.from_object(config_class)
     if config_object:
         app.config.update(config_object)
-    Config.init_app(app)
+    config_class.init_app(app)
+    init_logging(app)
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    configure_engines(app, db)
+    init_replicas(app)
+    init_sharding(app)
+    init_migrate(app)
+    init_cache(app)
+    init_events(app)
+    init_write_queue(app)
+    init_compaction(app)
+    init_scheduler(app)
+    init_compression(app)
+    init_templates(app)
 
+    from app.blueprints.api.api import api_bp
     from app.blueprints.errors.errors import errors_bp
+    from app.blueprints.events.events import events_bp
     from app.blueprints.main.main import main_bp
+    from app.blueprints.metrics.metrics import metrics_bp
+    from app.cli import profile_startup_command, tasks_cli
 
     app.register_blueprint(main_bp)
+    app.register_blueprint(api_bp)
     app.register_blueprint(errors_bp)
+    app.register_blueprint(events_bp)
+    app.cli.add_command(tasks_cli)
+    app.cli.add_command(profile_startup_command)
+
+    if app.config["ASYNC_API_ENABLED"]:
+        from app.async_services import init_async_db
+        from app.blueprints.async_api.async_api import async_api_bp
+
+        init_async_db(app)
+        app.register_blueprint(async_api_bp)
+
+    if app.config["METRICS_ENABLED"]:
+        init_metrics(app, db)
+        app.register_blueprint(metrics_bp)
 
     return app
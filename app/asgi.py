@@ -0,0 +1,60 @@
+import asyncio
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+
+
+class ThreadPoolWsgiToAsgi(WsgiToAsgi):
+    """Serves a WSGI application to ASGI servers on many threads at once.
+
+    asgiref's `WsgiToAsgi` runs every request on the one thread it keeps for
+    thread-sensitive code, so requests are served one at a time. Each request
+    runs in its own `ThreadSensitiveContext` here, asgiref's public way of
+    giving thread-sensitive code a thread per context, and at most
+    ``threads`` requests run at once. The async views they call still run
+    on the server's event loop, where pooled async connections live.
+    """
+
+    def __init__(self, wsgi_application, threads):
+        """Initialize the adapter.
+
+        Args:
+            wsgi_application (function): The WSGI application.
+            threads (int): The number of requests served at once.
+
+        Returns:
+            None
+
+        """
+        super().__init__(wsgi_application)
+        self.threads = threads
+        self._slots = asyncio.Semaphore(threads)
+
+    async def __call__(self, scope, receive, send):
+        """Serve one ASGI connection.
+
+        Args:
+            scope (dict): The connection scope.
+            receive (function): Receives the request messages.
+            send (function): Sends the response messages.
+
+        Returns:
+            None
+
+        """
+        async with self._slots, ThreadSensitiveContext():
+            await super().__call__(scope, receive, send)
+
+
+def create_asgi_app(app):
+    """Wrap a Flask application for ASGI servers.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        ThreadPoolWsgiToAsgi: The ASGI application, serving ``ASGI_THREADS``
+            requests at once.
+
+    """
+    return ThreadPoolWsgiToAsgi(app, app.config["ASGI_THREADS"])
@@ -0,0 +1,306 @@
+import logging
+from functools import wraps
+from time import perf_counter
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.config import is_memory_sqlite, sqlite_pragmas_listener
+from app.metrics import record_service_call
+from app.models import Task, db
+from app.recurrence import normalize_rule
+from app.services import (
+    TASK_COLUMNS,
+    TaskConflictError,
+    TaskNotFoundError,
+    commit_task_changes,
+    paginate_tasks,
+    read_task_rows,
+    stage_task_completion,
+    stage_task_creation,
+    stage_task_deletion,
+)
+
+logger = logging.getLogger(__name__)
+
+# Async drivers used when ASYNC_DATABASE_URI is not set.
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def async_database_uri(config):
+    """Return the URI of the async engine.
+
+    Args:
+        config (Config): The Flask application configuration.
+
+    Returns:
+        URL: ``ASYNC_DATABASE_URI`` if set, otherwise the database URI with
+            its driver replaced by the matching `ASYNC_DRIVERS` entry.
+
+    Raises:
+        ValueError: If no async driver is known for the database.
+
+    """
+    if config.get("ASYNC_DATABASE_URI"):
+        return make_url(config["ASYNC_DATABASE_URI"])
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend!r} databases.")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def init_async_db(app):
+    """Create the async engine and session factory of an application.
+
+    Pooled asyncio connections cannot be shared between event loops. Under a
+    WSGI server Flask runs every async view in its own loop, so connections
+    are opened per session unless ``ASYNC_POOL_SIZE`` is set, which is safe
+    when serving `asgi.py` as async views then share the server's loop.
+    In-memory SQLite databases keep a single connection instead, and are not
+    shared with the synchronous engine.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: If the async database driver is not installed.
+
+    """
+    url = async_database_uri(app.config)
+    if is_memory_sqlite(url):
+        options = {"poolclass": StaticPool}
+    elif app.config["ASYNC_POOL_SIZE"]:
+        options = {
+            "pool_size": app.config["ASYNC_POOL_SIZE"],
+            "max_overflow": app.config["SQLALCHEMY_MAX_OVERFLOW"],
+            "pool_timeout": app.config["SQLALCHEMY_POOL_TIMEOUT"],
+            "pool_recycle": app.config["SQLALCHEMY_POOL_RECYCLE"],
+        }
+    else:
+        options = {"poolclass": NullPool}
+    try:
+        engine = create_async_engine(url, **options)
+    except ImportError as exc:
+        raise RuntimeError(
+            "The async API needs the async extra: poetry install -E async."
+        ) from exc
+    if engine.dialect.name == "sqlite":
+        listener = sqlite_pragmas_listener(app.config)
+        event.listen(engine.sync_engine, "connect", listener)
+    app.extensions["async_engine"] = engine
+    app.extensions["async_db"] = async_sessionmaker(engine, expire_on_commit=False)
+
+
+def async_session():
+    """Open a session on the async engine of the current application.
+
+    Returns:
+        AsyncSession: The new session, to be used as an async context manager.
+
+    """
+    return current_app.extensions["async_db"]()
+
+
+def handle_async_db_errors(func):
+    """Wrap async database operations, log SQLAlchemy errors and time the calls.
+
+    Sessions are closed, and so rolled back, by the wrapped functions
+    themselves.
+
+    Args:
+        func (function): The coroutine function to be decorated.
+
+    Returns:
+        function: The wrapped coroutine function.
+
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = perf_counter()
+        outcome = "ok"
+        try:
+            return await func(*args, **kwargs)
+        except TaskNotFoundError:
+            outcome = "not_found"
+            raise
+        except TaskConflictError:
+            outcome = "conflict"
+            raise
+        except SQLAlchemyError:
+            outcome = "error"
+            logger.exception("Database error occurred in %s", func.__name__)
+            raise
+        finally:
+            record_service_call(
+                f"async_{func.__name__}", perf_counter() - start, outcome
+            )
+
+    return wrapper
+
+
+@handle_async_db_errors
+async def create_task(title, description, due_date, recurrence=None):
+    """Create a task object and add it to the database.
+
+    Args:
+        title (str): The title of the task.
+        description (str): The description of the task.
+        due_date (datetime): The due date of the task.
+        recurrence (str): An RFC 5545 RRULE making the task recur from its
+            due date.
+
+    Returns:
+        Task: The created task object.
+
+    Raises:
+        ValueError: If the recurrence rule is invalid or has no due date.
+
+    """
+    if recurrence:
+        recurrence = normalize_rule(recurrence, due_date)
+    async with async_session() as session:
+        task = await session.run_sync(
+            stage_task_creation, title, description, due_date, recurrence or None
+        )
+        await session.run_sync(commit_task_changes)
+    return task
+
+
+@handle_async_db_errors
+async def list_tasks(after=None, limit=None, sort="id", **filters):
+    """Retrieve a page of tasks using keyset pagination.
+
+    Args:
+        after (str): The cursor returned with the previous page, if any.
+        limit (int): The page size; clamped to ``TASKS_MAX_PER_PAGE``.
+        sort (str): Either ``"id"`` or ``"due_date"``.
+        **filters: The `app.services.list_tasks` filters.
+
+    Returns:
+        TaskPage: The requested page of task objects.
+
+    Raises:
+        ValueError: If the sort field is not supported.
+        InvalidCursorError: If the cursor cannot be decoded.
+
+    """
+    async with async_session() as session:
+        return await session.run_sync(
+            lambda sync_session: paginate_tasks(
+                db.select(Task), after, limit, sort, filters, sync_session
+            )
+        )
+
+
+@handle_async_db_errors
+async def list_task_rows(after=None, limit=None, sort="id", **filters):
+    """Retrieve a page of tasks as plain column rows.
+
+    Shares the listing cache of `app.services.list_task_rows`, keyed by the
+    data version read in the same session.
+
+    Args:
+        after (str): The cursor returned with the previous page, if any.
+        limit (int): The page size; clamped to ``TASKS_MAX_PER_PAGE``.
+        sort (str): Either ``"id"`` or ``"due_date"``.
+        **filters: The `app.services.list_tasks` filters.
+
+    Returns:
+        TaskPage: The requested page of rows with `TASK_COLUMNS` attributes.
+
+    Raises:
+        ValueError: If the sort field is not supported.
+        InvalidCursorError: If the cursor cannot be decoded.
+
+    """
+    async with async_session() as session:
+        return await session.run_sync(
+            lambda sync_session: read_task_rows(
+                after, limit, sort, filters, session=sync_session
+            )
+        )
+
+
+@handle_async_db_errors
+async def get_task_row(task_id):
+    """Retrieve a single task as a plain column row.
+
+    Args:
+        task_id (int): The ID of the task.
+
+    Returns:
+        Row: The task row with `TASK_COLUMNS` attributes.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+
+    """
+    async with async_session() as session:
+        result = await session.execute(
+            db.select(*TASK_COLUMNS).where(
+                Task.id == task_id, Task.deleted_at.is_(None)
+            )
+        )
+        row = result.first()
+    if row is None:
+        raise TaskNotFoundError(task_id)
+    return row
+
+
+@handle_async_db_errors
+async def complete_task(task_id, expected_version=None):
+    """Mark a task as completed.
+
+    Args:
+        task_id (int): The ID of the task to be completed.
+        expected_version (int): Only complete the task if it is still at this
+            version; by default any version is accepted.
+
+    Returns:
+        Task: The completed task object.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+        TaskConflictError: If the task is not at the expected version.
+
+    """
+    async with async_session() as session:
+        task = await session.run_sync(stage_task_completion, task_id, expected_version)
+        await session.run_sync(commit_task_changes)
+    return task
+
+
+@handle_async_db_errors
+async def delete_task(task_id, expected_version=None):
+    """Soft-delete a task; the compaction job purges it later.
+
+    Args:
+        task_id (int): The ID of the task to be deleted.
+        expected_version (int): Only delete the task if it is still at this
+            version; by default any version is accepted.
+
+    Returns:
+        Task: The deleted task object.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+        TaskConflictError: If the task is not at the expected version.
+
+    """
+    async with async_session() as session:
+        task = await session.run_sync(stage_task_deletion, task_id, expected_version)
+        await session.run_sync(commit_task_changes)
+    return task
@@ -0,0 +1,209 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context, url_for
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.blueprints.api.responses import (
+    conditional_response,
+    error_response,
+    if_match_version,
+    task_response,
+)
+from app.blueprints.listing import listing_filters, listing_page
+from app.serialization import EXPORT_FORMATS, export_chunks, serialize_task
+from app.services import (
+    InvalidCursorError,
+    TaskConflictError,
+    TaskNotFoundError,
+    cache_stats,
+    complete_task,
+    create_task,
+    delete_task,
+    get_task_row,
+    iter_task_rows,
+    task_stats,
+)
+from app.validation import TaskValidationError, clean_task_data
+
+api_bp = Blueprint("api_bp", __name__, url_prefix="/api/v1")
+
+
+@api_bp.errorhandler(SQLAlchemyError)
+def database_error(error):
+    """Report database errors as JSON.
+
+    Args:
+        error (SQLAlchemyError): The error that occurred.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return error_response("The database error has happened.", 500)
+
+
+@api_bp.errorhandler(TaskNotFoundError)
+def task_not_found(error):
+    """Report missing tasks as JSON.
+
+    Args:
+        error (TaskNotFoundError): The error that occurred.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return error_response(error.message, 404)
+
+
+@api_bp.errorhandler(TaskConflictError)
+def task_conflict(error):
+    """Report updates based on an outdated task version as JSON.
+
+    Args:
+        error (TaskConflictError): The error that occurred.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return error_response(error.message, 412, version=error.version)
+
+
+@api_bp.route("/tasks", methods=["GET"])
+def list_tasks_view():
+    """List tasks with the same pagination and filters as the index page.
+
+    A ``q`` query parameter searches titles and descriptions instead.
+
+    Returns:
+        Response: The JSON page of tasks and the cursor of the next page.
+
+    """
+    try:
+        page = listing_page(request.args, listing_filters(request.args))
+    except InvalidCursorError as exc:
+        return error_response(exc.message, 400)
+    return conditional_response(
+        jsonify(
+            tasks=[serialize_task(row) for row in page.items],
+            next_cursor=page.next_cursor,
+            limit=page.limit,
+        )
+    )
+
+
+@api_bp.route("/tasks/export", methods=["GET"])
+def export_tasks_view():
+    """Stream every task matching the listing filters as CSV or NDJSON.
+
+    The ``format`` query parameter selects ``csv`` (default) or ``ndjson``.
+
+    Returns:
+        Response: The streamed export.
+
+    """
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return error_response(f"Unsupported export format: {export_format!r}.", 400)
+    filters = listing_filters(request.args)
+    del filters["limit"], filters["sort"]
+    chunks = export_chunks(iter_task_rows(**filters), export_format)
+    return Response(
+        stream_with_context(chunks),
+        content_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename=tasks.{export_format}"},
+    )
+
+
+@api_bp.route("/tasks/<int:task_id>", methods=["GET"])
+def get_task_view(task_id):
+    """Return a single task.
+
+    Args:
+        task_id (int): The ID of the task.
+
+    Returns:
+        Response: The JSON task.
+
+    """
+    return task_response(get_task_row(task_id)).make_conditional(request)
+
+
+@api_bp.route("/tasks", methods=["POST"])
+def create_task_view():
+    """Create a task from a JSON body.
+
+    Returns:
+        tuple: The JSON task, the HTTP status code and the Location header.
+
+    """
+    try:
+        data = clean_task_data(request.get_json(silent=True) or {})
+    except TaskValidationError as exc:
+        return error_response("Invalid task.", 400, errors=exc.errors)
+    task = create_task(
+        data["title"],
+        data["description"],
+        data["due_date"],
+        recurrence=data["recurrence"],
+    )
+    location = url_for("api_bp.get_task_view", task_id=task.id)
+    return jsonify(serialize_task(task)), 201, {"Location": location}
+
+
+@api_bp.route("/tasks/<int:task_id>/complete", methods=["POST"])
+def complete_task_view(task_id):
+    """Mark a task as complete, if still at the If-Match version.
+
+    Args:
+        task_id (int): The ID of the task to be marked as complete.
+
+    Returns:
+        Response: The JSON task.
+
+    """
+    try:
+        expected_version = if_match_version()
+    except ValueError as exc:
+        return error_response(str(exc), 400)
+    return task_response(complete_task(task_id, expected_version))
+
+
+@api_bp.route("/tasks/<int:task_id>", methods=["DELETE"])
+def delete_task_view(task_id):
+    """Delete a task, if still at the If-Match version.
+
+    Args:
+        task_id (int): The ID of the task to be deleted.
+
+    Returns:
+        tuple: An empty body and the HTTP status code.
+
+    """
+    try:
+        expected_version = if_match_version()
+    except ValueError as exc:
+        return error_response(str(exc), 400)
+    delete_task(task_id, expected_version)
+    return "", 204
+
+
+@api_bp.route("/stats", methods=["GET"])
+def task_stats_view():
+    """Return the total, open, completed, overdue and due today task counts.
+
+    Returns:
+        Response: The JSON task counts.
+
+    """
+    return conditional_response(jsonify(task_stats()))
+
+
+@api_bp.route("/cache", methods=["GET"])
+def cache_stats_view():
+    """Return the task listing cache counters of the serving worker.
+
+    Returns:
+        Response: The JSON cache counters.
+
+    """
+    return jsonify(cache_stats())
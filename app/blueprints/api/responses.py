@@ -0,0 +1,69 @@
+from flask import jsonify, request
+
+from app.serialization import serialize_task
+
+
+def error_response(message, status, **extra):
+    """Build a JSON error response.
+
+    Args:
+        message (str): The error message.
+        status (int): The HTTP status code.
+        **extra: Additional fields for the response body.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return jsonify(error=message, **extra), status
+
+
+def conditional_response(response):
+    """Tag a response with an ETag and honour If-None-Match.
+
+    Args:
+        response (Response): The response to tag.
+
+    Returns:
+        Response: The response, turned into a 304 if the client copy is fresh.
+
+    """
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+def task_response(task):
+    """Build the JSON response of a single task, tagged with its version.
+
+    The version changes with every update of the task, which makes it the
+    ETag to send back in If-Match to update the task conditionally.
+
+    Args:
+        task (Row): A task row or Task object.
+
+    Returns:
+        Response: The JSON task.
+
+    """
+    response = jsonify(serialize_task(task))
+    response.set_etag(str(task.version))
+    return response
+
+
+def if_match_version():
+    """Return the task version an update request is conditional on.
+
+    Returns:
+        int: The version sent in the If-Match header, or None if the request
+            is unconditional.
+
+    Raises:
+        ValueError: If the header does not hold a single task version.
+
+    """
+    if not request.if_match or request.if_match.star_tag:
+        return None
+    tags = list(request.if_match.as_set())
+    if len(tags) == 1 and tags[0].isdigit():
+        return int(tags[0])
+    raise ValueError("If-Match must hold a single task version.")
@@ -0,0 +1,153 @@
+from flask import Blueprint, jsonify, request, url_for
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import async_services
+from app.blueprints.api.responses import (
+    conditional_response,
+    error_response,
+    if_match_version,
+    task_response,
+)
+from app.blueprints.listing import listing_filters
+from app.serialization import serialize_task
+from app.services import InvalidCursorError, TaskConflictError, TaskNotFoundError
+from app.validation import TaskValidationError, clean_task_data
+
+async_api_bp = Blueprint("async_api_bp", __name__, url_prefix="/api/v1/async")
+
+
+@async_api_bp.errorhandler(SQLAlchemyError)
+def database_error(error):
+    """Report database errors as JSON.
+
+    Args:
+        error (SQLAlchemyError): The error that occurred.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return error_response("The database error has happened.", 500)
+
+
+@async_api_bp.errorhandler(TaskNotFoundError)
+def task_not_found(error):
+    """Report missing tasks as JSON.
+
+    Args:
+        error (TaskNotFoundError): The error that occurred.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return error_response(error.message, 404)
+
+
+@async_api_bp.errorhandler(TaskConflictError)
+def task_conflict(error):
+    """Report updates based on an outdated task version as JSON.
+
+    Args:
+        error (TaskConflictError): The error that occurred.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return error_response(error.message, 412, version=error.version)
+
+
+@async_api_bp.route("/tasks", methods=["GET"])
+async def list_tasks_view():
+    """List tasks with the same pagination and filters as ``/api/v1/tasks``.
+
+    Returns:
+        Response: The JSON page of tasks and the cursor of the next page.
+
+    """
+    try:
+        page = await async_services.list_task_rows(
+            after=request.args.get("after"), **listing_filters(request.args)
+        )
+    except InvalidCursorError as exc:
+        return error_response(exc.message, 400)
+    return conditional_response(
+        jsonify(
+            tasks=[serialize_task(row) for row in page.items],
+            next_cursor=page.next_cursor,
+            limit=page.limit,
+        )
+    )
+
+
+@async_api_bp.route("/tasks/<int:task_id>", methods=["GET"])
+async def get_task_view(task_id):
+    """Return a single task.
+
+    Args:
+        task_id (int): The ID of the task.
+
+    Returns:
+        Response: The JSON task.
+
+    """
+    row = await async_services.get_task_row(task_id)
+    return task_response(row).make_conditional(request)
+
+
+@async_api_bp.route("/tasks", methods=["POST"])
+async def create_task_view():
+    """Create a task from a JSON body.
+
+    Returns:
+        tuple: The JSON task, the HTTP status code and the Location header.
+
+    """
+    try:
+        data = clean_task_data(request.get_json(silent=True) or {})
+    except TaskValidationError as exc:
+        return error_response("Invalid task.", 400, errors=exc.errors)
+    task = await async_services.create_task(
+        data["title"], data["description"], data["due_date"], data["recurrence"]
+    )
+    location = url_for("async_api_bp.get_task_view", task_id=task.id)
+    return jsonify(serialize_task(task)), 201, {"Location": location}
+
+
+@async_api_bp.route("/tasks/<int:task_id>/complete", methods=["POST"])
+async def complete_task_view(task_id):
+    """Mark a task as complete, if still at the If-Match version.
+
+    Args:
+        task_id (int): The ID of the task to be marked as complete.
+
+    Returns:
+        Response: The JSON task.
+
+    """
+    try:
+        expected_version = if_match_version()
+    except ValueError as exc:
+        return error_response(str(exc), 400)
+    task = await async_services.complete_task(task_id, expected_version)
+    return task_response(task)
+
+
+@async_api_bp.route("/tasks/<int:task_id>", methods=["DELETE"])
+async def delete_task_view(task_id):
+    """Delete a task, if still at the If-Match version.
+
+    Args:
+        task_id (int): The ID of the task to be deleted.
+
+    Returns:
+        tuple: An empty body and the HTTP status code.
+
+    """
+    try:
+        expected_version = if_match_version()
+    except ValueError as exc:
+        return error_response(str(exc), 400)
+    await async_services.delete_task(task_id, expected_version)
+    return "", 204
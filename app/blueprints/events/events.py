@@ -0,0 +1,67 @@
+from flask import Blueprint, Response, abort, current_app, request
+
+from app.events import change_log_in_order
+
+events_bp = Blueprint("events_bp", __name__)
+
+
+def _last_event_id():
+    """Return the event id a reconnecting client resumes from.
+
+    Browsers send it in the ``Last-Event-ID`` header; clients that cannot
+    set headers may use the ``last_event_id`` query parameter instead.
+
+    Returns:
+        int: The event id, or None for new clients.
+
+    """
+    value = request.headers.get("Last-Event-ID", request.args.get("last_event_id"))
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        abort(400, description="Invalid Last-Event-ID.")
+
+
+@events_bp.route("/events", methods=["GET"])
+def events():
+    """Stream task changes as Server-Sent Events.
+
+    New clients receive the changes committed after they connect; clients
+    sending the id of the last event they received get the changes they
+    missed first. Idle streams carry a keep-alive comment every
+    ``EVENTS_HEARTBEAT`` seconds. The feed is only available on an unsharded
+    SQLite database, see `change_log_in_order`.
+
+    Returns:
+        Response: The event stream.
+
+    """
+    if "shards" in current_app.extensions:
+        # The change log of the other shards is not published.
+        abort(501, description="The change feed does not support sharding.")
+    if not change_log_in_order(current_app):
+        abort(501, description="The change feed only supports SQLite.")
+    broker = current_app.extensions["change_broker"]
+    last_id = broker.start()
+    after_id = _last_event_id()
+    if after_id is None:
+        after_id = last_id
+    heartbeat = current_app.config["EVENTS_HEARTBEAT"]
+
+    def stream(after_id):
+        while True:
+            events = broker.events_after(after_id, heartbeat)
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for _, event in events:
+                yield event
+            after_id = events[-1][0]
+
+    return Response(
+        stream(after_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,74 @@
+from datetime import date
+
+from app.services import TASK_SORT_FIELDS, list_task_rows, search_tasks
+
+
+def _parse_bool(value):
+    """Parse a boolean query string value.
+
+    Args:
+        value (str): The raw query string value.
+
+    Returns:
+        bool: The parsed value.
+
+    Raises:
+        ValueError: If the value is not a recognised boolean.
+
+    """
+    lowered = value.lower()
+    if lowered in ("1", "true", "yes"):
+        return True
+    if lowered in ("0", "false", "no"):
+        return False
+    raise ValueError(value)
+
+
+def listing_filters(args):
+    """Extract the task listing filters from query string arguments.
+
+    Unparseable values are ignored rather than rejected.
+
+    Args:
+        args (MultiDict): The request query string arguments.
+
+    Returns:
+        dict: Keyword arguments for `list_tasks`, without the cursor.
+
+    """
+    sort = args.get("sort", "id")
+    return {
+        "limit": args.get("limit", type=int),
+        "completed": args.get("completed", type=_parse_bool),
+        "due_from": args.get("due_from", type=date.fromisoformat),
+        "due_to": args.get("due_to", type=date.fromisoformat),
+        "title_prefix": args.get("title") or None,
+        "sort": sort if sort in TASK_SORT_FIELDS else "id",
+    }
+
+
+def listing_page(args, filters, version=None):
+    """Fetch the page of task rows requested by the query string.
+
+    A non-empty ``q`` argument searches titles and descriptions, ranked by
+    relevance; otherwise the tasks are listed in ``sort`` order.
+
+    Args:
+        args (MultiDict): The request query string arguments.
+        filters (dict): The filters returned by `listing_filters`.
+        version (Row): The data version read by the caller, if any.
+
+    Returns:
+        TaskPage: The requested page.
+
+    Raises:
+        InvalidCursorError: If the ``after`` cursor cannot be decoded.
+
+    """
+    query = args.get("q", "").strip()
+    if query:
+        search_filters = {k: v for k, v in filters.items() if k != "sort"}
+        return search_tasks(
+            query, after=args.get("after"), version=version, **search_filters
+        )
+    return list_task_rows(after=args.get("after"), version=version, **filters)
@@ -1,36 +1,193 @@
 # app/main.py
-from flask import Blueprint, flash, redirect, render_template, url_for
+import hashlib
+import time
+from datetime import date, timezone
+
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    jsonify,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+from markupsafe import Markup
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.forms import TaskForm
+from app.blueprints.listing import listing_filters, listing_page
 from app.services import (
+    InvalidCursorError,
     TaskNotFoundError,
+    TaskPage,
     complete_task,
+    complete_tasks,
     create_task,
+    create_tasks,
+    data_version,
     delete_task,
-    list_tasks,
+    delete_tasks,
+    task_cache,
 )
+from app.validation import TaskValidationError, clean_task_data
 
 main_bp = Blueprint("main_bp", __name__)
 
 
+def _index_etag(version):
+    """Build the ETag of the index page.
+
+    Besides the task data, the page embeds the CSRF token of the session,
+    which expires after ``WTF_CSRF_TIME_LIMIT`` seconds; the ETag changes at
+    least that often so that cached pages never carry an expired token.
+
+    Args:
+        version (int): The data version.
+
+    Returns:
+        str: The unquoted ETag.
+
+    """
+    parts = [str(version)]
+    if current_app.config.get("WTF_CSRF_ENABLED", True):
+        field_name = current_app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token")
+        parts.append(session.get(field_name, ""))
+        time_limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+        if time_limit:
+            parts.append(str(int(time.time() // time_limit)))
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def _with_validators(response, version):
+    """Add the caching headers of the index page to a response.
+
+    Args:
+        response (Response): The response.
+        version (Row): The data version returned by `data_version`.
+
+    Returns:
+        Response: The response.
+
+    """
+    response.set_etag(_index_etag(version.version), weak=True)
+    response.last_modified = version.updated_at.replace(tzinfo=timezone.utc)
+    response.cache_control.no_cache = True
+    response.cache_control.private = True
+    return response
+
+
 @main_bp.route("/", methods=["GET", "POST"])
 def index():
     """Render the main page with a task form and list of tasks.
 
+    GET requests are answered with 304 Not Modified, without querying the
+    tasks or rendering the page, when the client copy is still current.
+
     Returns:
-        str: Rendered HTML template for the main page.
+        Response: Rendered HTML template for the main page.
 
     """
+    # Deferred: WTForms is only needed by this page, not by the JSON routes.
+    from app.forms import TaskForm
+
     form = TaskForm()
-    tasks = []
+    filters = listing_filters(request.args)
+    version = None
+    task_list = None
     try:
         if form.validate_on_submit():
-            create_task(form.title.data, form.description.data, form.due_date.data)
-        tasks = list_tasks()
+            create_task(
+                form.title.data,
+                form.description.data,
+                form.due_date.data,
+                recurrence=form.recurrence.data or None,
+            )
+        elif request.method == "GET" and not session.get("_flashes"):
+            version = data_version()
+            not_modified = _with_validators(current_app.response_class(), version)
+            if not_modified.make_conditional(request).status_code == 304:
+                return not_modified
+        task_list = _render_task_list(filters, version)
+    except InvalidCursorError:
+        version = None
+        flash("Invalid page link.")
     except SQLAlchemyError:
+        version = None
         flash("The database error has happened.")
-    return render_template("index.html", form=form, tasks=tasks)
+    response = make_response(
+        render_template(
+            "index.html",
+            form=form,
+            task_list=task_list or _task_list_html(TaskPage()),
+            filters=filters,
+            search=request.args.get("q", ""),
+        )
+    )
+    if version is not None:
+        _with_validators(response, version)
+    return response
+
+
+def _task_list_html(page):
+    """Render the task list and page navigation of the index page.
+
+    Args:
+        page (TaskPage): The page of tasks to render.
+
+    Returns:
+        Markup: The rendered fragment.
+
+    """
+    query = request.args.to_dict()
+    query.pop("after", None)
+    next_url = first_url = None
+    if page.next_cursor:
+        next_url = url_for("main_bp.index", **query, after=page.next_cursor)
+    if "after" in request.args:
+        first_url = url_for("main_bp.index", **query)
+    return Markup(
+        render_template(
+            "_task_list.html",
+            tasks=page.items,
+            next_url=next_url,
+            first_url=first_url,
+        )
+    )
+
+
+def _render_task_list(filters, version):
+    """Return the task list fragment of the index page, cached if possible.
+
+    Fragments are cached with the task listings, keyed by the data version
+    and the query string, so that a write made by any worker is seen at once.
+    The rows are read for the same data version, so a page cached before
+    the write is never rendered under the new key.
+
+    Args:
+        filters (dict): The filters returned by `listing_filters`.
+        version (Row): The data version, or None to bypass the cache.
+
+    Returns:
+        Markup: The rendered fragment.
+
+    Raises:
+        InvalidCursorError: If the ``after`` cursor cannot be decoded.
+
+    """
+    if version is None or not current_app.config["TEMPLATE_FRAGMENT_CACHE"]:
+        return _task_list_html(listing_page(request.args, filters, version))
+    key = repr(
+        ("index_task_list", version.version, sorted(request.args.items(multi=True)))
+    )
+    fragment = task_cache().get(key)
+    if fragment is None:
+        fragment = _task_list_html(listing_page(request.args, filters, version))
+        task_cache().set(key, str(fragment))
+        return fragment
+    return Markup(fragment)
 
 
 @main_bp.route("/complete_task/<int:task_id>", methods=["POST"])
@@ -73,3 +230,153 @@ def delete_task_route(task_id):
     except SQLAlchemyError:
         flash("The database error has happened.")
     return redirect(url_for("main_bp.index"))
+
+
+def _json_error(message, status, **extra):
+    """Build a JSON error response.
+
+    Args:
+        message (str): The error message.
+        status (int): The HTTP status code.
+        **extra: Additional fields for the response body.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    return jsonify(error=message, **extra), status
+
+
+def _json_task_ids():
+    """Read the ``ids`` list of a bulk request body.
+
+    Returns:
+        list: The requested task ids.
+
+    Raises:
+        ValueError: If the body does not contain a list of integer ids.
+
+    """
+    body = request.get_json(silent=True) or {}
+    task_ids = body.get("ids")
+    if not isinstance(task_ids, list) or not all(
+        isinstance(task_id, int) and not isinstance(task_id, bool)
+        for task_id in task_ids
+    ):
+        raise ValueError("Expected a list of integer task ids in 'ids'.")
+    return task_ids
+
+
+def _optional_date(value):
+    """Parse an optional ISO date.
+
+    Args:
+        value (str): The ISO formatted date, or None.
+
+    Returns:
+        date: The parsed date, or None.
+
+    Raises:
+        ValueError: If the value is not an ISO formatted date.
+
+    """
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid date: {value!r}.")
+    return date.fromisoformat(value)
+
+
+def _bulk_filters(data):
+    """Parse the ``filter`` object of a bulk delete request body.
+
+    Args:
+        data (dict): The raw filter values.
+
+    Returns:
+        dict: Keyword filters for `delete_tasks`.
+
+    Raises:
+        ValueError: If a filter value is invalid.
+
+    """
+    completed = data.get("completed")
+    if completed is not None and not isinstance(completed, bool):
+        raise ValueError("Filter 'completed' must be a boolean.")
+    return {
+        "completed": completed,
+        "due_from": _optional_date(data.get("due_from")),
+        "due_to": _optional_date(data.get("due_to")),
+        "title_prefix": data.get("title_prefix") or None,
+    }
+
+
+@main_bp.route("/create_tasks", methods=["POST"])
+def create_tasks_route():
+    """Create many tasks from a JSON body in a single transaction.
+
+    The body is ``{"tasks": [{"title": ..., "description": ..., "due_date": ...}]}``.
+    Nothing is created if any task is invalid.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    body = request.get_json(silent=True) or {}
+    tasks = body.get("tasks")
+    if not isinstance(tasks, list):
+        return _json_error("Expected a list of tasks in 'tasks'.", 400)
+    cleaned, errors = [], {}
+    for index, task in enumerate(tasks):
+        try:
+            cleaned.append(clean_task_data(task if isinstance(task, dict) else {}))
+        except TaskValidationError as exc:
+            errors[index] = exc.errors
+    if errors:
+        return _json_error("Invalid tasks.", 400, errors=errors)
+    try:
+        task_ids = create_tasks(cleaned)
+    except SQLAlchemyError:
+        return _json_error("The database error has happened.", 500)
+    return jsonify(created=task_ids), 201
+
+
+@main_bp.route("/complete_tasks", methods=["POST"])
+def complete_tasks_route():
+    """Mark the tasks listed in a JSON ``{"ids": [...]}`` body as complete.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    try:
+        result = complete_tasks(_json_task_ids())
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
+    except SQLAlchemyError:
+        return _json_error("The database error has happened.", 500)
+    return jsonify(completed=result.succeeded, not_found=result.not_found), 200
+
+
+@main_bp.route("/delete_tasks", methods=["POST"])
+def delete_tasks_route():
+    """Delete tasks by id or by filter.
+
+    The body is either ``{"ids": [...]}`` or ``{"filter": {"completed": ...,
+    "due_from": ..., "due_to": ..., "title_prefix": ...}}``.
+
+    Returns:
+        tuple: A tuple containing the JSON response and the HTTP status code.
+
+    """
+    body = request.get_json(silent=True) or {}
+    try:
+        if isinstance(body.get("filter"), dict):
+            result = delete_tasks(**_bulk_filters(body["filter"]))
+        else:
+            result = delete_tasks(_json_task_ids())
+    except ValueError as exc:
+        return _json_error(str(exc), 400)
+    except SQLAlchemyError:
+        return _json_error("The database error has happened.", 500)
+    return jsonify(deleted=result.succeeded, not_found=result.not_found), 200
@@ -0,0 +1,18 @@
+from flask import Blueprint, current_app
+
+metrics_bp = Blueprint("metrics_bp", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Expose the application metrics in the Prometheus text format.
+
+    Returns:
+        tuple: The rendered metrics, the HTTP status code and the content type.
+
+    """
+    return (
+        current_app.extensions["metrics"].render(),
+        200,
+        {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
@@ -0,0 +1,295 @@
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class CacheBackend(ABC):
+    """Base class of the task listing cache backends.
+
+    Subclasses implement `_get`, `_set` and `_clear`; hit and miss counting
+    is shared by all backends and guarded by ``_lock``, which subclasses may
+    use for their own state.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, ttl):
+        """Initialize the backend.
+
+        Args:
+            ttl (float): How long entries stay valid, in seconds.
+
+        Returns:
+            None
+
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the backend from the application configuration.
+
+        Args:
+            config (Config): The Flask application configuration.
+
+        Returns:
+            CacheBackend: The configured backend.
+
+        """
+        return cls(ttl=config["TASK_CACHE_TTL"])
+
+    def get(self, key):
+        """Return a cached value.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            object: The cached value, or None if missing or expired.
+
+        """
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Store a value.
+
+        Args:
+            key (str): The cache key.
+            value (object): The value to cache.
+
+        Returns:
+            None
+
+        """
+        self._set(key, value, self.clock() + self.ttl)
+
+    def clear(self):
+        """Drop every cached value.
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self.invalidations += 1
+        self._clear()
+
+    def stats(self):
+        """Return the cache counters.
+
+        Returns:
+            dict: The backend name and its hit, miss and invalidation counts.
+
+        """
+        with self._lock:
+            return {
+                "backend": type(self).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+    @abstractmethod
+    def _get(self, key):
+        """Return a cached value, or None if missing or expired."""
+
+    @abstractmethod
+    def _set(self, key, value, expires):
+        """Store a value until the ``expires`` time of `clock`."""
+
+    @abstractmethod
+    def _clear(self):
+        """Drop every cached value."""
+
+
+class NullCache(CacheBackend):
+    """Backend that caches nothing."""
+
+    def _get(self, key):
+        return None
+
+    def _set(self, key, value, expires):
+        pass
+
+    def _clear(self):
+        pass
+
+
+class LRUCache(CacheBackend):
+    """In-process least recently used cache with a time to live.
+
+    Each worker process has its own copy, so writes made by other workers
+    are only seen once the entries expire.
+    """
+
+    def __init__(self, ttl, maxsize):
+        """Initialize the cache.
+
+        Args:
+            ttl (float): How long entries stay valid, in seconds.
+            maxsize (int): The maximum number of entries.
+
+        Returns:
+            None
+
+        """
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the cache from the application configuration.
+
+        Args:
+            config (Config): The Flask application configuration.
+
+        Returns:
+            LRUCache: The configured cache.
+
+        """
+        return cls(ttl=config["TASK_CACHE_TTL"], maxsize=config["TASK_CACHE_MAXSIZE"])
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value, expires):
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """Cache stored in a local SQLite file shared by all worker processes.
+
+    Values are pickled. Invalidation deletes every entry, so a write made by
+    one worker is seen by all of them.
+    """
+
+    # Wall clock time, as expiry times are shared between processes.
+    clock = staticmethod(time.time)
+
+    def __init__(self, ttl, path):
+        """Initialize the cache.
+
+        Args:
+            ttl (float): How long entries stay valid, in seconds.
+            path (str): The path of the SQLite cache file.
+
+        Returns:
+            None
+
+        """
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the cache from the application configuration.
+
+        Args:
+            config (Config): The Flask application configuration.
+
+        Returns:
+            SQLiteCache: The configured cache.
+
+        """
+        return cls(ttl=config["TASK_CACHE_TTL"], path=config["TASK_CACHE_PATH"])
+
+    def _connection(self):
+        """Return the connection of the current thread.
+
+        Returns:
+            sqlite3.Connection: The connection.
+
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM task_cache WHERE key = ? AND expires >= ?",
+                (key, self.clock()),
+            )
+            .fetchone()
+        )
+        return pickle.loads(row[0]) if row else None
+
+    def _set(self, key, value, expires):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO task_cache (key, value, expires) "
+                "VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), expires),
+            )
+
+    def _clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM task_cache")
+
+
+CACHE_BACKENDS = {
+    "null": NullCache,
+    "memory": LRUCache,
+    "sqlite": SQLiteCache,
+}
+
+
+def init_cache(app):
+    """Create the task listing cache configured for an application.
+
+    ``TASK_CACHE_BACKEND`` is either one of the `CACHE_BACKENDS` names or a
+    `CacheBackend` subclass.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    backend = app.config["TASK_CACHE_BACKEND"]
+    if isinstance(backend, str):
+        backend = CACHE_BACKENDS[backend]
+    app.extensions["task_cache"] = backend.from_config(app.config)
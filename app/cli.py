@@ -0,0 +1,244 @@
+import csv
+import json
+import os
+import time
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.profiling import profile_startup
+from app.scheduler import DueDateScheduler
+from app.serialization import EXPORT_FORMATS, export_chunks
+from app.services import (
+    compact_tasks,
+    import_tasks,
+    iter_task_rows,
+    prune_changes,
+    reconcile_task_stats,
+)
+from app.validation import TaskValidationError, clean_task_data
+
+IMPORT_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+tasks_cli = AppGroup("tasks", help="Manage tasks.")
+
+
+@tasks_cli.command("export")
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(sorted(EXPORT_FORMATS)),
+    default="csv",
+    show_default=True,
+)
+@click.option(
+    "--output",
+    type=click.File("w", encoding="utf-8", lazy=True),
+    default="-",
+    help="Destination file, standard output by default.",
+)
+@click.option("--completed/--open", default=None, help="Filter by completion.")
+@click.option("--due-from", type=click.DateTime(["%Y-%m-%d"]), default=None)
+@click.option("--due-to", type=click.DateTime(["%Y-%m-%d"]), default=None)
+@click.option("--batch-size", type=click.IntRange(min=1), default=None)
+def export_command(export_format, output, completed, due_from, due_to, batch_size):
+    """Stream tasks as CSV or NDJSON in constant memory."""
+    rows = iter_task_rows(
+        batch_size=batch_size,
+        completed=completed,
+        due_from=_to_date(due_from),
+        due_to=_to_date(due_to),
+    )
+    for chunk in export_chunks(rows, export_format):
+        output.write(chunk)
+
+
+def _read_rows(fh, import_format):
+    """Read raw task rows from a CSV or NDJSON file.
+
+    Args:
+        fh (file): The open file.
+        import_format (str): "csv" or "ndjson".
+
+    Returns:
+        generator: ``(line_number, row)`` pairs; ``row`` is the raw line for
+            NDJSON lines that are not valid JSON.
+
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(fh)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(fh, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, line.rstrip("\n")
+
+
+def _clean_rows(rows, rejects, stats):
+    """Validate raw rows, writing the invalid ones to the rejects file.
+
+    Args:
+        rows (iterable): ``(line_number, row)`` pairs.
+        rejects (file): Where rejected rows are written as NDJSON, or None.
+        stats (dict): Counters updated with the number of rejected rows.
+
+    Returns:
+        generator: The cleaned task data.
+
+    """
+    for line_number, row in rows:
+        try:
+            if not isinstance(row, dict):
+                raise TaskValidationError({"row": ["Not a JSON object."]})
+            yield clean_task_data(row)
+        except TaskValidationError as exc:
+            stats["rejected"] += 1
+            if rejects is not None:
+                record = {"line": line_number, "row": row, "errors": exc.errors}
+                rejects.write(json.dumps(record) + "\n")
+
+
+@tasks_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "import_format",
+    type=click.Choice(["csv", "ndjson"]),
+    default=None,
+    help="Input format, inferred from the file extension by default.",
+)
+@click.option("--batch-size", type=click.IntRange(min=1), default=None)
+@click.option(
+    "--rejects",
+    type=click.File("w", encoding="utf-8", lazy=True),
+    default=None,
+    help="Write rejected rows and their errors to this NDJSON file.",
+)
+def import_command(path, import_format, batch_size, rejects):
+    """Import tasks from a CSV or NDJSON file in batches.
+
+    Rows are validated with the task form rules: a title of at most 100
+    characters, a description of at most 300 characters and an optional
+    YYYY-MM-DD due date, or an ISO datetime as written by the export.
+    """
+    if import_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in IMPORT_EXTENSIONS:
+            raise click.UsageError("Cannot infer the format, use --format.")
+        import_format = IMPORT_EXTENSIONS[extension]
+    stats = {"rejected": 0}
+    start = time.perf_counter()
+    with open(path, encoding="utf-8", newline="") as fh:
+        count = import_tasks(
+            _clean_rows(_read_rows(fh, import_format), rejects, stats),
+            batch_size=batch_size,
+        )
+    elapsed = time.perf_counter() - start
+    rate = (count + stats["rejected"]) / elapsed if elapsed else 0
+    click.echo(
+        f"Imported {count} tasks, rejected {stats['rejected']} rows "
+        f"in {elapsed:.2f}s ({rate:.0f} rows/sec)."
+    )
+
+
+@tasks_cli.command("compact")
+@click.option(
+    "--archive-after",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Days after completion, TASK_ARCHIVE_AFTER_DAYS by default.",
+)
+@click.option(
+    "--purge-after",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Days after deletion, TASK_PURGE_AFTER_DAYS by default.",
+)
+@click.option("--batch-size", type=click.IntRange(min=1), default=None)
+def compact_command(archive_after, purge_after, batch_size):
+    """Purge deleted tasks and move old completed tasks to the archive."""
+    start = time.perf_counter()
+    result = compact_tasks(archive_after, purge_after, batch_size)
+    click.echo(
+        f"Purged {result['purged']} deleted tasks and archived "
+        f"{result['archived']} completed tasks in "
+        f"{time.perf_counter() - start:.2f}s."
+    )
+
+
+@tasks_cli.command("prune-changes")
+@click.option(
+    "--keep",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Changes to keep, CHANGE_LOG_RETENTION by default.",
+)
+def prune_changes_command(keep):
+    """Delete the oldest entries of the task change log."""
+    click.echo(f"Pruned {prune_changes(keep)} task changes.")
+
+
+@tasks_cli.command("reconcile-stats")
+def reconcile_stats_command():
+    """Recompute the task statistics from the tasks table."""
+    stats = reconcile_task_stats()
+    click.echo(
+        f"{stats['open']} open and {stats['completed']} completed tasks, "
+        f"{stats['overdue']} overdue."
+    )
+
+
+@tasks_cli.command("run-scheduler")
+def run_scheduler_command():
+    """Fire the due date reminder and overdue hooks until interrupted."""
+    app = current_app._get_current_object()
+    scheduler = DueDateScheduler.from_config(app)
+    click.echo("Scheduling due dates, press Ctrl+C to stop.")
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.close()
+
+
+@click.command("profile-startup")
+@click.option("--limit", type=click.IntRange(min=1), default=15, show_default=True)
+@click.option(
+    "--config-name",
+    default=None,
+    help="Configuration profile, APP_CONFIG by default.",
+)
+def profile_startup_command(limit, config_name):
+    """Break down the cold start time of the application by package.
+
+    The application is imported and created in a fresh interpreter run with
+    ``-X importtime``, which makes the imports a little slower.
+    """
+    report = profile_startup(config_name)
+    click.echo(
+        f"Cold start: {report['total_ms']:.0f} ms "
+        f"({report['import_ms']:.0f} ms importing app, "
+        f"{report['create_app_ms']:.0f} ms in create_app)"
+    )
+    click.echo(f"{'package':<28} {'ms':>8} {'modules':>8}")
+    for package, milliseconds, modules in report["packages"][:limit]:
+        click.echo(f"{package:<28} {milliseconds:8.1f} {modules:8}")
+
+
+def _to_date(value):
+    """Convert an optional datetime parsed by click to a date.
+
+    Args:
+        value (datetime): The parsed value, or None.
+
+    Returns:
+        date: The date, or None.
+
+    """
+    return value.date() if isinstance(value, datetime) else None
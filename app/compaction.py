@@ -0,0 +1,72 @@
+import atexit
+import threading
+
+from app.services import compact_tasks
+
+
+class CompactionScheduler:
+    """Background thread running the task compaction job at an interval."""
+
+    def __init__(self, app, interval):
+        """Initialize the scheduler.
+
+        Args:
+            app (Flask): The application whose tasks are compacted.
+            interval (float): The time between runs, in seconds.
+
+        Returns:
+            None
+
+        """
+        self.app = app
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="task-compaction", daemon=True
+        )
+
+    def start(self):
+        """Start the thread; the first run happens after one interval.
+
+        Returns:
+            None
+
+        """
+        self._thread.start()
+
+    def close(self):
+        """Stop the thread, waiting for a running compaction to finish.
+
+        Returns:
+            None
+
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self.app.app_context():
+                    compact_tasks()
+            except Exception:
+                self.app.logger.exception("Task compaction failed.")
+
+
+def init_compaction(app):
+    """Schedule the task compaction job of an application, if enabled.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    if not app.config["COMPACTION_INTERVAL"]:
+        return
+    scheduler = CompactionScheduler(app, app.config["COMPACTION_INTERVAL"])
+    app.extensions["compaction"] = scheduler
+    scheduler.start()
+    atexit.register(scheduler.close)
@@ -0,0 +1,83 @@
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _choose_encoding(accept_encodings):
+    """Pick the best supported content encoding accepted by the client.
+
+    Args:
+        accept_encodings (Accept): The parsed ``Accept-Encoding`` header.
+
+    Returns:
+        str: ``"br"``, ``"gzip"`` or None.
+
+    """
+    gzip_quality = accept_encodings.quality("gzip")
+    if brotli is not None:
+        brotli_quality = accept_encodings.quality("br")
+        if brotli_quality and brotli_quality >= gzip_quality:
+            return "br"
+    return "gzip" if gzip_quality else None
+
+
+def compress_response(response):
+    """Compress a buffered response body with brotli or gzip.
+
+    Streamed responses, small bodies and other content types than the
+    configured ones are left untouched. Strong ETags become weak, as the
+    compressed representation is not byte-for-byte the tagged one.
+
+    Args:
+        response (Response): The response to compress.
+
+    Returns:
+        Response: The response.
+
+    """
+    config = current_app.config
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.is_streamed
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in config["COMPRESSION_MIMETYPES"]
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < config["COMPRESSION_MIN_SIZE"]:
+        return response
+    if encoding == "br":
+        data = brotli.compress(data, quality=config["COMPRESSION_BROTLI_QUALITY"])
+    else:
+        data = gzip.compress(data, compresslevel=config["COMPRESSION_LEVEL"], mtime=0)
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """Compress the responses of an application, if enabled.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    if app.config["COMPRESSION_ENABLED"]:
+        app.after_request(compress_response)
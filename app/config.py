@@ -1,21 +1,292 @@
-import logging
 import os
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
 
 class Config:
     """Base configuration."""
 
-    DEBUG = True
+    DEBUG = False
     TESTING = False
 
+    SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
+
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Read replicas, comma-separated. Read-only statements are sent to them in
+    # turn; a session or client that wrote reads from the primary for the
+    # next REPLICA_STICKY_SECONDS, to see its own writes despite the lag.
+    SQLALCHEMY_REPLICA_URIS = [
+        uri.strip() for uri in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    ]
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    # Additional databases tasks are partitioned across, comma-separated; the
+    # main database is the first shard. Sharded reads do not use the replicas.
+    SQLALCHEMY_SHARD_URIS = [
+        uri.strip() for uri in os.getenv("DATABASE_SHARD_URLS", "").split(",")
+    ]
+
+    # Connection pool settings, used for file and server databases.
+    SQLALCHEMY_POOL_SIZE = int(os.getenv("SQLALCHEMY_POOL_SIZE", "5"))
+    SQLALCHEMY_MAX_OVERFLOW = int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", "10"))
+    SQLALCHEMY_POOL_TIMEOUT = int(os.getenv("SQLALCHEMY_POOL_TIMEOUT", "30"))
+    SQLALCHEMY_POOL_RECYCLE = int(os.getenv("SQLALCHEMY_POOL_RECYCLE", "1800"))
+
+    # Pragmas applied to every new SQLite connection.
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # Server-side statement timeout for PostgreSQL and MySQL, 0 disables it.
+    DATABASE_STATEMENT_TIMEOUT_MS = int(os.getenv("DATABASE_STATEMENT_TIMEOUT_MS", "0"))
+
+    TASKS_PER_PAGE = int(os.getenv("TASKS_PER_PAGE", "50"))
+    TASKS_MAX_PER_PAGE = int(os.getenv("TASKS_MAX_PER_PAGE", "200"))
+
+    # Rows fetched per round trip when streaming exports.
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    # Rows inserted per executemany batch when importing tasks.
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+    # Write-behind mode: task mutations are queued to a background writer
+    # that commits up to WRITE_BEHIND_MAX_BATCH of them per transaction,
+    # collected for at most WRITE_BEHIND_INTERVAL_MS.
+    WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "0") == "1"
+    WRITE_BEHIND_INTERVAL_MS = float(os.getenv("WRITE_BEHIND_INTERVAL_MS", "5"))
+    WRITE_BEHIND_MAX_BATCH = int(os.getenv("WRITE_BEHIND_MAX_BATCH", "100"))
+
+    # Task listing cache: "memory" (per process), "sqlite" (shared) or "null".
+    TASK_CACHE_BACKEND = os.getenv("TASK_CACHE_BACKEND", "memory")
+    TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", "30"))
+    TASK_CACHE_MAXSIZE = int(os.getenv("TASK_CACHE_MAXSIZE", "256"))
+    TASK_CACHE_PATH = os.getenv("TASK_CACHE_PATH", "task_cache.db")
+
+    # Compaction: tasks soft-deleted more than TASK_PURGE_AFTER_DAYS ago are
+    # purged and tasks completed more than TASK_ARCHIVE_AFTER_DAYS ago move to
+    # the archive table, COMPACTION_BATCH_SIZE rows per transaction.
+    TASK_PURGE_AFTER_DAYS = float(os.getenv("TASK_PURGE_AFTER_DAYS", "7"))
+    TASK_ARCHIVE_AFTER_DAYS = float(os.getenv("TASK_ARCHIVE_AFTER_DAYS", "30"))
+    COMPACTION_BATCH_SIZE = int(os.getenv("COMPACTION_BATCH_SIZE", "1000"))
+    # Seconds between background compaction runs, 0 disables them. Enable it
+    # in a single process, or run `flask tasks compact` from cron instead.
+    COMPACTION_INTERVAL = float(os.getenv("COMPACTION_INTERVAL", "0"))
+
+    # Due date scheduler: reminder hooks fire DUE_REMINDER_LEAD seconds before
+    # a task is due and overdue hooks when it is. Tasks due within the next
+    # DUE_SCHEDULER_HORIZON seconds are kept in memory and new ones are read
+    # from the change log at least every DUE_SCHEDULER_POLL_INTERVAL seconds.
+    # Enable it in a single process, or run `flask tasks run-scheduler`.
+    DUE_SCHEDULER_ENABLED = os.getenv("DUE_SCHEDULER_ENABLED", "0") == "1"
+    DUE_REMINDER_LEAD = float(os.getenv("DUE_REMINDER_LEAD", "3600"))
+    DUE_SCHEDULER_HORIZON = float(os.getenv("DUE_SCHEDULER_HORIZON", "21600"))
+    DUE_SCHEDULER_POLL_INTERVAL = float(os.getenv("DUE_SCHEDULER_POLL_INTERVAL", "5"))
+    DUE_SCHEDULER_BATCH_SIZE = int(os.getenv("DUE_SCHEDULER_BATCH_SIZE", "1000"))
+
+    # Server-Sent Events change feed at /events. Each process polls the change
+    # log every EVENTS_POLL_INTERVAL seconds, or right after its own commits,
+    # and keeps the last EVENTS_BUFFER_SIZE events for its subscribers.
+    EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", "1"))
+    EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "1000"))
+    # Seconds between keep-alive comments on idle event streams.
+    EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+    # Number of task changes kept for clients resuming an event stream, pruned
+    # every CHANGE_LOG_PRUNE_INTERVAL seconds by processes serving /events.
+    CHANGE_LOG_RETENTION = int(os.getenv("CHANGE_LOG_RETENTION", "100000"))
+    CHANGE_LOG_PRUNE_INTERVAL = float(os.getenv("CHANGE_LOG_PRUNE_INTERVAL", "300"))
+
+    # Async JSON API at /api/v1/async, backed by an AsyncSession. Needs the
+    # "async" extra; the URI defaults to the async driver of DATABASE_URL.
+    ASYNC_API_ENABLED = os.getenv("ASYNC_API_ENABLED", "0") == "1"
+    ASYNC_DATABASE_URI = os.getenv("ASYNC_DATABASE_URL")
+    # Pooled async connections, 0 opens one per session. Only safe when every
+    # request shares one event loop, as under the asgi.py entry point.
+    ASYNC_POOL_SIZE = int(os.getenv("ASYNC_POOL_SIZE", "0"))
+    # Requests served at once by the threads of the asgi.py entry point.
+    ASGI_THREADS = int(os.getenv("ASGI_THREADS", "16"))
+
+    # Rendered task list fragments are cached with the task listings.
+    TEMPLATE_FRAGMENT_CACHE = os.getenv("TEMPLATE_FRAGMENT_CACHE", "1") == "1"
+    # Compiled Jinja templates shared between worker processes.
+    TEMPLATE_BYTECODE_CACHE = os.getenv("TEMPLATE_BYTECODE_CACHE", "1") == "1"
+    TEMPLATE_BYTECODE_CACHE_DIR = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR")
+    TEMPLATE_PRELOAD = os.getenv("TEMPLATE_PRELOAD", "1") == "1"
 
+    # Response compression; brotli is used when installed and accepted.
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1") == "1"
+    COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+    COMPRESSION_MIMETYPES = ("text/html", "application/json", "text/plain")
+
+    # Request, service and SQL timings exposed at /metrics.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+    # Log records are written to stderr as "text" or "json" lines, by a
+    # background thread unless LOG_QUEUE_ENABLED is off. LOG_SAMPLING keeps a
+    # share of the INFO records of busy loggers: "app.services=0.1,app=0.5".
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+    LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "1") == "1"
+    LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+
+    @staticmethod
+    def init_app(app):
+        """Initialize the database engine options."""
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            **engine_options(app.config),
+            **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+        }
+
+
+class DevelopmentConfig(Config):
+    """Development configuration."""
+
+    DEBUG = True
+
+
+class TestingConfig(Config):
+    """Testing configuration."""
+
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    WTF_CSRF_ENABLED = False
+
+
+class ProductionConfig(Config):
+    """Production configuration."""
+
+    SECRET_KEY = os.getenv("SECRET_KEY")
+    DATABASE_STATEMENT_TIMEOUT_MS = int(
+        os.getenv("DATABASE_STATEMENT_TIMEOUT_MS", "30000")
+    )
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+    # /metrics is unauthenticated and exposes per-endpoint traffic; opt in
+    # where it is only reachable by the scraper.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
 
     @staticmethod
     def init_app(app):
-        """Initialize logging with minimal configuration."""
-        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL, logging.INFO))
-        app.logger.setLevel(getattr(logging, Config.LOG_LEVEL, logging.INFO))
-        app.logger.info("Logging has been configured!")
+        """Initialize the application and refuse to start without a secret key."""
+        if not app.config["SECRET_KEY"]:
+            raise RuntimeError("SECRET_KEY must be set in production.")
+        Config.init_app(app)
+
+
+config_by_name = {
+    "development": DevelopmentConfig,
+    "testing": TestingConfig,
+    "production": ProductionConfig,
+    "default": DevelopmentConfig,
+}
+
+
+def is_memory_sqlite(url):
+    """Check whether a database URL points to an in-memory SQLite database.
+
+    Args:
+        url (URL): The database URL.
+
+    Returns:
+        bool: True for in-memory SQLite databases.
+
+    """
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(config):
+    """Build the SQLAlchemy engine options for the configured database.
+
+    Args:
+        config (Config): The Flask application configuration.
+
+    Returns:
+        dict: Keyword arguments for `sqlalchemy.create_engine`.
+
+    """
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    if is_memory_sqlite(url):
+        # In-memory databases live in a single, never recycled connection.
+        return {}
+    options = {
+        "pool_size": config["SQLALCHEMY_POOL_SIZE"],
+        "max_overflow": config["SQLALCHEMY_MAX_OVERFLOW"],
+        "pool_timeout": config["SQLALCHEMY_POOL_TIMEOUT"],
+        "pool_recycle": config["SQLALCHEMY_POOL_RECYCLE"],
+    }
+    if url.get_backend_name() == "sqlite":
+        return options
+    options["pool_pre_ping"] = True
+    timeout = config["DATABASE_STATEMENT_TIMEOUT_MS"]
+    if timeout and url.get_backend_name() == "postgresql":
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    elif timeout and url.get_backend_name() == "mysql":
+        options["connect_args"] = {
+            "init_command": f"SET SESSION max_execution_time={timeout}"
+        }
+    return options
+
+
+def extra_engine_options(config, setting):
+    """Build the SQLAlchemy engine options of additional databases.
+
+    Read replicas and shards are sized and tuned like the main database.
+
+    Args:
+        config (Config): The Flask application configuration.
+        setting (str): The setting listing the database URIs.
+
+    Returns:
+        list: ``(uri, options)`` pairs, in the configured order.
+
+    """
+    return [
+        (uri, engine_options({**config, "SQLALCHEMY_DATABASE_URI": uri}))
+        for uri in config[setting]
+        if uri
+    ]
+
+
+def sqlite_pragmas_listener(config):
+    """Build a connect event listener applying the configured SQLite pragmas.
+
+    Args:
+        config (Config): The Flask application configuration.
+
+    Returns:
+        function: The listener for the engine "connect" event.
+
+    """
+    pragmas = {
+        "journal_mode": config["SQLITE_JOURNAL_MODE"],
+        "synchronous": config["SQLITE_SYNCHRONOUS"],
+        "busy_timeout": config["SQLITE_BUSY_TIMEOUT_MS"],
+    }
+
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            if value not in (None, ""):
+                cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return set_sqlite_pragmas
+
+
+def configure_engines(app, db):
+    """Apply the configured pragmas to every new SQLite connection.
+
+    Args:
+        app (Flask): The Flask application.
+        db (SQLAlchemy): The Flask-SQLAlchemy extension.
+
+    Returns:
+        None
+
+    """
+    listener = sqlite_pragmas_listener(app.config)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", listener)
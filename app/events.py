@@ -0,0 +1,262 @@
+import json
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.engine import make_url
+
+from app.serialization import serialize_task
+from app.services import change_log_bounds, changes_since, prune_changes
+
+# Changes read from the change log per query.
+FETCH_LIMIT = 500
+
+
+def format_event(event_id, kind, data):
+    """Render a Server-Sent Event.
+
+    Args:
+        event_id (int): The event id, sent back by reconnecting clients.
+        kind (str): The event type.
+        data (dict): The JSON event payload.
+
+    Returns:
+        str: The event, terminated by a blank line.
+
+    """
+    return f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(data)}\n\n"
+
+
+def _change_event(change):
+    """Render a logged task change as a Server-Sent Event.
+
+    Created and completed tasks are sent in full, deleted tasks by id only;
+    bulk changes are sent as ``reset`` events without data.
+
+    Args:
+        change (Row): A row returned by `changes_since`.
+
+    Returns:
+        tuple: The change id and the rendered event.
+
+    """
+    if change.kind == "reset":
+        data = {}
+    elif change.completed is None:
+        data = {"id": change.id}
+    else:
+        data = serialize_task(change)
+    return change.change_id, format_event(change.change_id, change.kind, data)
+
+
+def change_log_in_order(app):
+    """Check whether the change log of an application commits in id order.
+
+    Readers poll for the changes above the last id they have seen, which
+    only works if no change commits after a higher id. SQLite runs one
+    write transaction at a time, so its ids always do; PostgreSQL and MySQL
+    hand out ids before commit, letting a slower transaction commit a lower
+    id that readers have already passed.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        bool: True if the application database is SQLite.
+
+    """
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    return url.get_backend_name() == "sqlite"
+
+
+class ChangeBroker:
+    """In-process publisher of the task change log to event stream clients.
+
+    A single thread per process reads the changes following the last one it
+    has seen, every ``poll_interval`` seconds or as soon as `publish` is
+    called after a local commit, so that changes committed by other
+    processes reach its clients as well. The rendered events are kept in a
+    ring buffer of ``buffer_size`` entries that every subscriber reads from,
+    which keeps the database load independent of the number of clients.
+    Only clients resuming from, or lagging behind, an event older than the
+    buffer read the change log themselves.
+    """
+
+    def __init__(
+        self, app, poll_interval, buffer_size, retention=None, prune_interval=None
+    ):
+        """Initialize the broker; the polling thread starts on first use.
+
+        Args:
+            app (Flask): The application whose change log is published.
+            poll_interval (float): How often to poll the change log, in seconds.
+            buffer_size (int): The number of recent events kept in memory.
+            retention (int): The number of changes kept when pruning the log.
+            prune_interval (float): How often to prune the change log, in
+                seconds; None disables pruning.
+
+        Returns:
+            None
+
+        """
+        self.app = app
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self.last_id = 0
+        self._events = deque(maxlen=buffer_size)
+        # Events following this id are all in the buffer.
+        self._floor = 0
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    def publish(self):
+        """Wake the polling thread after task changes have been committed.
+
+        Returns:
+            None
+
+        """
+        self._wake.set()
+
+    def start(self):
+        """Start polling the change log from its newest change, if needed.
+
+        Returns:
+            int: The id of the newest change published so far.
+
+        """
+        with self._lock:
+            if self._thread is None and not self._closed:
+                with self.app.app_context():
+                    self.last_id = self._floor = change_log_bounds().last or 0
+                self._thread = threading.Thread(
+                    target=self._run, name="change-feed", daemon=True
+                )
+                self._thread.start()
+        with self._condition:
+            return self.last_id
+
+    def close(self):
+        """Stop the polling thread.
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join()
+
+    def events_after(self, after_id, timeout):
+        """Return the events following an event id, waiting for new ones.
+
+        Args:
+            after_id (int): The id of the last event seen by the client.
+            timeout (float): How long to wait for new events, in seconds.
+
+        Returns:
+            list: ``(event id, event)`` tuples, oldest first; empty if no
+                event arrived in time.
+
+        """
+        with self._condition:
+            if after_id >= self.last_id:
+                self._condition.wait(timeout)
+            if after_id >= self._floor:
+                events = []
+                for event in reversed(self._events):
+                    if event[0] <= after_id:
+                        break
+                    events.append(event)
+                return events[::-1]
+        return self._replay(after_id)
+
+    def _replay(self, after_id):
+        """Read the events following an id older than the buffer from the log.
+
+        Clients resuming from a pruned change get a ``reset`` event instead,
+        telling them to reload their task list.
+
+        Args:
+            after_id (int): The id of the last event seen by the client.
+
+        Returns:
+            list: ``(event id, event)`` tuples, oldest first.
+
+        """
+        with self.app.app_context():
+            first = change_log_bounds().first
+            if first is not None and after_id >= first - 1:
+                events = [
+                    _change_event(c) for c in changes_since(after_id, FETCH_LIMIT)
+                ]
+                if events:
+                    return events
+        with self._condition:
+            last_id = self.last_id
+        return [(last_id, format_event(last_id, "reset", {}))]
+
+    def _run(self):
+        next_prune = time.monotonic()
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            try:
+                with self.app.app_context():
+                    self._poll()
+                    if self.prune_interval and time.monotonic() >= next_prune:
+                        prune_changes(self.retention)
+                        next_prune = time.monotonic() + self.prune_interval
+            except Exception:
+                self.app.logger.exception("Polling the task change log failed.")
+
+    def _poll(self):
+        """Append the changes committed since the last poll to the buffer.
+
+        Returns:
+            None
+
+        """
+        while True:
+            events = [
+                _change_event(c) for c in changes_since(self.last_id, FETCH_LIMIT)
+            ]
+            if not events:
+                return
+            with self._condition:
+                for event in events:
+                    if len(self._events) == self._events.maxlen:
+                        self._floor = self._events[0][0]
+                    self._events.append(event)
+                self.last_id = events[-1][0]
+                self._condition.notify_all()
+            if len(events) < FETCH_LIMIT:
+                return
+
+
+def init_events(app):
+    """Create the change broker of an application.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    app.extensions["change_broker"] = ChangeBroker(
+        app,
+        poll_interval=app.config["EVENTS_POLL_INTERVAL"],
+        buffer_size=app.config["EVENTS_BUFFER_SIZE"],
+        retention=app.config["CHANGE_LOG_RETENTION"],
+        prune_interval=app.config["CHANGE_LOG_PRUNE_INTERVAL"],
+    )
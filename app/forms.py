@@ -1,15 +1,42 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, SubmitField
 from wtforms.fields.datetime import DateField
-from wtforms.validators import DataRequired, Length, Optional
+from wtforms.validators import DataRequired, Length, Optional, ValidationError
+
+from app.recurrence import RECURRENCE_MAX_LENGTH, normalize_rule
+from app.validation import DESCRIPTION_MAX_LENGTH, TITLE_MAX_LENGTH
 
 
 class TaskForm(FlaskForm):
     """Form for creating a new task."""
 
-    title = StringField("Title", validators=[DataRequired(), Length(max=100)])
+    title = StringField(
+        "Title", validators=[DataRequired(), Length(max=TITLE_MAX_LENGTH)]
+    )
     description = StringField(
-        "Description", validators=[DataRequired(), Length(max=300)]
+        "Description", validators=[DataRequired(), Length(max=DESCRIPTION_MAX_LENGTH)]
     )
     due_date = DateField("Due date", validators=[Optional()])
+    recurrence = StringField(
+        "Repeats (RRULE, e.g. FREQ=WEEKLY)",
+        validators=[Optional(), Length(max=RECURRENCE_MAX_LENGTH)],
+    )
     submit = SubmitField("Create Task")
+
+    def validate_recurrence(self, field):
+        """Check that the recurrence rule is valid and has a due date.
+
+        Args:
+            field (StringField): The recurrence field.
+
+        Returns:
+            None
+
+        Raises:
+            ValidationError: If the rule is invalid or has no due date.
+
+        """
+        try:
+            field.data = normalize_rule(field.data, self.due_date.data)
+        except ValueError as error:
+            raise ValidationError(str(error)) from error
@@ -0,0 +1,321 @@
+import atexit
+import copy
+import itertools
+import json
+import logging
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+
+from flask import g, has_request_context, request
+
+# Incoming X-Request-ID values are only trusted if they look like an id.
+REQUEST_ID = re.compile(r"^[\w.:-]{1,128}$")
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+# The handler and listener installed on the root logger by `init_logging`.
+_installed = None
+
+
+def parse_sampling(value):
+    """Parse the ``LOG_SAMPLING`` setting.
+
+    Args:
+        value (str): Comma-separated ``logger=rate`` pairs, such as
+            ``"app.services=0.1"``.
+
+    Returns:
+        dict: The share of records kept, by logger name.
+
+    Raises:
+        ValueError: If a pair is malformed or a rate is not between 0 and 1.
+
+    """
+    rates = {}
+    for pair in filter(None, (item.strip() for item in value.split(","))):
+        name, _, rate = pair.partition("=")
+        rate = float(rate)
+        if not name or not 0 <= rate <= 1:
+            raise ValueError(f"Invalid LOG_SAMPLING entry: {pair!r}.")
+        rates[name.strip()] = rate
+    return rates
+
+
+class RequestIdFilter(logging.Filter):
+    """Tag records with the id of the request being served, if any."""
+
+    def filter(self, record):
+        """Set the ``request_id`` attribute of a record.
+
+        Args:
+            record (LogRecord): The record.
+
+        Returns:
+            bool: Always True.
+
+        """
+        if has_request_context():
+            record.request_id = g.get("request_id")
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a share of the INFO and lower records of chosen loggers.
+
+    Records are kept at regular intervals rather than at random, so a rate
+    of 0.1 keeps exactly one record in ten. Rates apply to child loggers as
+    well; warnings and errors are always kept.
+    """
+
+    def __init__(self, rates):
+        """Initialize the filter.
+
+        Args:
+            rates (dict): The share of records kept, by logger name.
+
+        Returns:
+            None
+
+        """
+        super().__init__()
+        self.rates = rates
+        self._resolved = {}
+        self._counters = {}
+
+    def _rate(self, name):
+        """Return the rate applying to a logger, looked up once per name.
+
+        Args:
+            name (str): The logger name.
+
+        Returns:
+            float: The share of records kept.
+
+        """
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split(".")
+            for end in range(len(parts), 0, -1):
+                prefix = ".".join(parts[:end])
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+            self._counters[name] = itertools.count(1)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        """Decide whether a record is kept.
+
+        Args:
+            record (LogRecord): The record.
+
+        Returns:
+            bool: True if the record is kept.
+
+        """
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1:
+            return True
+        record.sample_rate = rate
+        count = next(self._counters[record.name])
+        return int(count * rate) != int((count - 1) * rate)
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON objects."""
+
+    def format(self, record):
+        """Render a record.
+
+        Args:
+            record (LogRecord): The record.
+
+        Returns:
+            str: The JSON object.
+
+        """
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if getattr(record, "sample_rate", None) is not None:
+            entry["sample_rate"] = record.sample_rate
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StderrHandler(logging.StreamHandler):
+    """Stream handler writing to whatever ``sys.stderr`` is when called."""
+
+    def __init__(self):
+        """Initialize the handler.
+
+        Returns:
+            None
+
+        """
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self):
+        """Return the current standard error stream.
+
+        Returns:
+            TextIO: ``sys.stderr``.
+
+        """
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """Queue handler leaving the formatting to the listener thread.
+
+    Only the message arguments are merged in the calling thread, as they may
+    not be safe to read from another one; the output format, JSON encoding
+    and writes happen in the listener.
+    """
+
+    def prepare(self, record):
+        """Make a record safe to hand over to the listener thread.
+
+        Args:
+            record (LogRecord): The record.
+
+        Returns:
+            LogRecord: A copy with the message merged and the traceback
+                rendered.
+
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _assign_request_id():
+    """Pick the id of the current request, reusing the client's if valid.
+
+    Returns:
+        None
+
+    """
+    request_id = request.headers.get("X-Request-ID", "")
+    g.request_id = request_id if REQUEST_ID.match(request_id) else uuid.uuid4().hex
+
+
+def _send_request_id(response):
+    """Return the id of the current request to the client.
+
+    Args:
+        response (Response): The response.
+
+    Returns:
+        Response: The response with an ``X-Request-ID`` header.
+
+    """
+    if "request_id" in g:
+        response.headers["X-Request-ID"] = g.request_id
+    return response
+
+
+def shutdown_logging():
+    """Remove the handler installed by `init_logging`, flushing its queue.
+
+    Returns:
+        None
+
+    """
+    global _installed
+    if _installed is None:
+        return
+    handler, listener = _installed
+    _installed = None
+    logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+
+
+def _install(handler, listener):
+    """Put a handler on the root logger in place of the previous one.
+
+    Args:
+        handler (Handler): The handler.
+        listener (QueueListener): Its listener, or None.
+
+    Returns:
+        None
+
+    """
+    global _installed
+    if _installed is None:
+        atexit.register(shutdown_logging)
+    shutdown_logging()
+    logging.getLogger().addHandler(handler)
+    if listener is not None:
+        listener.start()
+    _installed = handler, listener
+
+
+def init_logging(app):
+    """Configure logging for an application.
+
+    Records are tagged with the request id, sampled as configured by
+    ``LOG_SAMPLING`` and, unless ``LOG_QUEUE_ENABLED`` is off, handed over
+    to a background thread that formats them as ``LOG_FORMAT`` text or JSON
+    lines and writes them to standard error. Logging configuration is
+    process-wide, so the last application created wins.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If ``LOG_SAMPLING`` is malformed.
+
+    """
+    level = getattr(logging, app.config["LOG_LEVEL"], logging.INFO)
+    output = StderrHandler()
+    if app.config["LOG_FORMAT"] == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(
+            logging.Formatter(TEXT_FORMAT, defaults={"request_id": "-"})
+        )
+    if app.config["LOG_QUEUE_ENABLED"]:
+        queue = SimpleQueue()
+        handler = BackgroundQueueHandler(queue)
+        listener = QueueListener(queue, output)
+    else:
+        handler, listener = output, None
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(SamplingFilter(parse_sampling(app.config["LOG_SAMPLING"])))
+    _install(handler, listener)
+    logging.getLogger().setLevel(level)
+    app.logger.setLevel(level)
+    app.before_request(_assign_request_id)
+    app.after_request(_send_request_id)
+    app.logger.info("Logging has been configured!")
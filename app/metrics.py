@@ -0,0 +1,356 @@
+import bisect
+import threading
+import time
+
+from flask import current_app, g, request
+from sqlalchemy import event
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+WRITE_BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _format_labels(labels):
+    """Render a label set in the Prometheus text format.
+
+    Args:
+        labels (dict): The label names and values.
+
+    Returns:
+        str: The rendered labels, or an empty string.
+
+    """
+    if not labels:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+    return "{" + rendered + "}"
+
+
+class Histogram:
+    """Histogram of observed values with optional labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The help text.
+            labelnames (tuple): The label names.
+            buckets (tuple): The sorted bucket upper bounds.
+
+        Returns:
+            None
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Record an observation.
+
+        Args:
+            value (float): The observed value.
+            **labels: The label values.
+
+        Returns:
+            None
+
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        """Return the current samples, with cumulative bucket counts.
+
+        Returns:
+            list: ``(name, labels, value)`` tuples.
+
+        """
+        with self._lock:
+            values = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+        samples = []
+        for key, counts, total in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                samples.append(
+                    (f"{self.name}_bucket", {**labels, "le": bound}, cumulative)
+                )
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class CallbackMetric:
+    """Metric whose single value is read from a callback when rendered."""
+
+    def __init__(self, name, documentation, kind, callback):
+        """Initialize the metric.
+
+        Args:
+            name (str): The metric name.
+            documentation (str): The help text.
+            kind (str): The Prometheus metric type, such as "gauge".
+            callback (function): Returns the current value.
+
+        Returns:
+            None
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.callback = callback
+
+    def samples(self):
+        """Return the current sample.
+
+        Returns:
+            list: A single ``(name, labels, value)`` tuple.
+
+        """
+        return [(self.name, {}, self.callback())]
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        """Initialize an empty registry.
+
+        Returns:
+            None
+
+        """
+        self._metrics = {}
+
+    def register(self, metric):
+        """Add a metric, or return the already registered one of that name.
+
+        Args:
+            metric (object): The metric to register.
+
+        Returns:
+            object: The registered metric.
+
+        """
+        return self._metrics.setdefault(metric.name, metric)
+
+    def get(self, name):
+        """Return a registered metric.
+
+        Args:
+            name (str): The metric name.
+
+        Returns:
+            object: The metric, or None.
+
+        """
+        return self._metrics.get(name)
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The rendered metrics.
+
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _record_request_start():
+    g.metrics_request_start = time.perf_counter()
+
+
+def _observe_request(status):
+    start = g.pop("metrics_request_start", None)
+    if start is not None:
+        current_app.extensions["metrics"].get("http_request_duration_seconds").observe(
+            time.perf_counter() - start,
+            endpoint=request.endpoint or "none",
+            method=request.method,
+            status=status,
+        )
+
+
+def _record_request(response):
+    _observe_request(response.status_code)
+    return response
+
+
+def _record_failed_request(error):
+    # Requests whose unhandled exception skipped the after_request hooks.
+    if error is not None:
+        _observe_request(500)
+
+
+def record_service_call(function, duration, outcome):
+    """Record the duration of a service function call.
+
+    Does nothing if metrics are not enabled for the current application.
+
+    Args:
+        function (str): The service function name.
+        duration (float): The call duration in seconds.
+        outcome (str): "ok", "not_found", "conflict" or "error".
+
+    Returns:
+        None
+
+    """
+    registry = current_app.extensions.get("metrics")
+    if registry is not None:
+        registry.get("service_call_duration_seconds").observe(
+            duration, function=function, outcome=outcome
+        )
+
+
+def record_write_batch(size, duration):
+    """Record a transaction written by the write-behind queue.
+
+    Does nothing if metrics are not enabled for the current application.
+
+    Args:
+        size (int): The number of operations in the transaction.
+        duration (float): The time taken to write them, in seconds.
+
+    Returns:
+        None
+
+    """
+    registry = current_app.extensions.get("metrics")
+    if registry is not None:
+        registry.get("write_batch_size").observe(size)
+        registry.get("write_batch_duration_seconds").observe(duration)
+
+
+def _instrument_engine(engine, histogram):
+    """Time every statement executed on an engine.
+
+    Args:
+        engine (Engine): The engine to instrument.
+        histogram (Histogram): The statement duration histogram.
+
+    Returns:
+        None
+
+    """
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        start = conn.info["metrics_query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        histogram.observe(time.perf_counter() - start, operation=operation)
+
+    def handle_error(context):
+        # Failed statements never reach after_cursor_execute.
+        connection = context.connection
+        if connection is not None and connection.info.get("metrics_query_start"):
+            connection.info["metrics_query_start"].pop()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+
+def init_metrics(app, db):
+    """Set up request, service and SQL instrumentation for an application.
+
+    Args:
+        app (Flask): The Flask application.
+        db (SQLAlchemy): The Flask-SQLAlchemy extension.
+
+    Returns:
+        None
+
+    """
+    registry = MetricsRegistry()
+    registry.register(
+        Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by endpoint.",
+            ("endpoint", "method", "status"),
+        )
+    )
+    registry.register(
+        Histogram(
+            "service_call_duration_seconds",
+            "Service function call duration.",
+            ("function", "outcome"),
+        )
+    )
+    statements = registry.register(
+        Histogram(
+            "db_statement_duration_seconds",
+            "SQL statement execution time by operation.",
+            ("operation",),
+        )
+    )
+    registry.register(
+        Histogram(
+            "write_batch_size",
+            "Operations per write-behind transaction.",
+            buckets=WRITE_BATCH_BUCKETS,
+        )
+    )
+    registry.register(
+        Histogram("write_batch_duration_seconds", "Write-behind transaction duration.")
+    )
+    for attribute, name in (
+        ("hits", "task_cache_hits_total"),
+        ("misses", "task_cache_misses_total"),
+        ("invalidations", "task_cache_invalidations_total"),
+    ):
+        registry.register(
+            CallbackMetric(
+                name,
+                f"Task listing cache {attribute}.",
+                "counter",
+                lambda attribute=attribute: getattr(
+                    app.extensions["task_cache"], attribute
+                ),
+            )
+        )
+    app.extensions["metrics"] = registry
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _instrument_engine(engine, statements)
+    if "replicas" in app.extensions:
+        for engine in app.extensions["replicas"].engines:
+            _instrument_engine(engine, statements)
+    if "shards" in app.extensions:
+        for engine in app.extensions["shards"].engines[1:]:
+            _instrument_engine(engine, statements)
+    if "async_engine" in app.extensions:
+        _instrument_engine(app.extensions["async_engine"].sync_engine, statements)
+    app.before_request(_record_request_start)
+    app.after_request(_record_request)
+    app.teardown_request(_record_failed_request)
@@ -1,25 +1,139 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from flask_migrate import Migrate
+import click
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Boolean, Integer
+from sqlalchemy import DDL, Boolean, Date, Index, Integer, String, event, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-db = SQLAlchemy()
-migrate = Migrate()
+from app.recurrence import RECURRENCE_MAX_LENGTH
+from app.replicas import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+class _MigrateGroup(click.Group):
+    """The ``flask db`` group, setting up Flask-Migrate on first use."""
+
+    def __init__(self, app):
+        """Initialize the group without importing Flask-Migrate.
+
+        Args:
+            app (Flask): The Flask application.
+
+        Returns:
+            None
+
+        """
+        super().__init__("db", help="Perform database migrations.")
+        self.app = app
+
+    def _commands(self):
+        """Set up Flask-Migrate, once, and return its command group.
+
+        Returns:
+            click.Group: The ``db`` group of Flask-Migrate.
+
+        """
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as migrate_cli
+
+        if "migrate" not in self.app.extensions:
+            Migrate(self.app, db)
+        return migrate_cli
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        """Parse the arguments of the command with the Flask-Migrate group.
+
+        Args:
+            info_name (str): The name the group was invoked as.
+            args (list): The remaining command line arguments.
+            parent (click.Context): The context of the ``flask`` command.
+            **extra: Further context settings.
+
+        Returns:
+            click.Context: The context of the Flask-Migrate group.
+
+        """
+        return self._commands().make_context(info_name, args, parent, **extra)
+
+
+def init_migrate(app):
+    """Add the ``flask db`` commands, which set up Flask-Migrate when invoked.
+
+    Flask-Migrate pulls in Alembic, which only the ``flask db`` commands
+    need, so serving workers and the other commands skip it.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    app.cli.add_command(_MigrateGroup(app))
+
+
+# Listing indexes only cover tasks that have not been soft-deleted.
+HOT_TASKS = {
+    "sqlite_where": text("deleted_at IS NULL"),
+    "postgresql_where": text("deleted_at IS NULL"),
+}
+# Recurring tasks, whose following occurrences listings generate.
+RECURRING_TASKS = {
+    "sqlite_where": text("deleted_at IS NULL AND recurrence IS NOT NULL"),
+    "postgresql_where": text("deleted_at IS NULL AND recurrence IS NOT NULL"),
+}
 
 
 class Task(db.Model):
     """Model representing a task."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Open/completed tasks ordered by due date (keyset on due_date, id).
+        Index(
+            "ix_tasks_completed_due_date",
+            "completed",
+            "due_date",
+            "id",
+            **HOT_TASKS,
+        ),
+        # Open/completed tasks ordered by id.
+        Index("ix_tasks_completed_id", "completed", "id", **HOT_TASKS),
+        # All tasks ordered by due date.
+        Index("ix_tasks_due_date", "due_date", "id", **HOT_TASKS),
+        # Title prefix search.
+        Index("ix_tasks_title", "title", **HOT_TASKS),
+        # Open recurring tasks by due date.
+        Index("ix_tasks_recurring", "completed", "due_date", **RECURRING_TASKS),
+        # Compaction candidates.
+        Index("ix_tasks_completed_at", "completed_at", **HOT_TASKS),
+        Index(
+            "ix_tasks_deleted_at",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str]
     description: Mapped[Optional[str]]
     due_date: Mapped[Optional[datetime]]
     completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    completed_at: Mapped[Optional[datetime]]
+    # Set by delete_task; the row is purged by the compaction job.
+    deleted_at: Mapped[Optional[datetime]]
+    # RFC 5545 RRULE starting at the due date; completing the task stores the
+    # next occurrence as a new task. See app.recurrence.
+    recurrence: Mapped[Optional[str]] = mapped_column(String(RECURRENCE_MAX_LENGTH))
+    # Incremented by every update; see the compare-and-swap task services.
+    version: Mapped[int] = mapped_column(
+        Integer, default=1, server_default=text("1"), nullable=False
+    )
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __repr__(self):
         """Return a string representation of the Task object.
@@ -29,3 +143,146 @@ class Task(db.Model):
 
         """
         return f"<Task {self.title}>"
+
+
+class ArchivedTask(db.Model):
+    """Completed task moved out of the tasks table by the compaction job.
+
+    Rows get their own id, as SQLite may reuse the id of a deleted task.
+    """
+
+    __tablename__ = "archived_tasks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    task_id: Mapped[int] = mapped_column(Integer, index=True)
+    title: Mapped[str]
+    description: Mapped[Optional[str]]
+    due_date: Mapped[Optional[datetime]]
+    completed_at: Mapped[Optional[datetime]]
+    archived_at: Mapped[datetime]
+
+
+class DataVersion(db.Model):
+    """Single row counting the committed task modifications.
+
+    Bumped in the same transaction as every task mutation, it gives cheap
+    validators for HTTP caching.
+    """
+
+    __tablename__ = "data_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime]
+
+
+event.listen(
+    DataVersion.__table__,
+    "after_create",
+    DDL(
+        "INSERT INTO data_version (id, version, updated_at) "
+        "VALUES (1, 0, CURRENT_TIMESTAMP)"
+    ),
+)
+
+
+class TaskStats(db.Model):
+    """Single row counting the open and completed tasks.
+
+    Soft-deleted and archived tasks are not counted. Maintained in the same
+    transaction as every task mutation; ``flask tasks reconcile-stats``
+    recomputes it from the tasks table.
+    """
+
+    __tablename__ = "task_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    open_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+event.listen(
+    TaskStats.__table__,
+    "after_create",
+    DDL("INSERT INTO task_stats (id, open_tasks, completed_tasks) VALUES (1, 0, 0)"),
+)
+
+
+class TaskDueDay(db.Model):
+    """Number of open tasks due on each day, maintained like `TaskStats`.
+
+    Overdue tasks are counted by summing the days before today, which only
+    reads one row per day.
+    """
+
+    __tablename__ = "task_due_days"
+
+    due_day: Mapped[date] = mapped_column(Date, primary_key=True)
+    open_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class TaskChange(db.Model):
+    """Append-only log of task modifications, read by the change feed.
+
+    Bulk operations log a single change without a task id, telling clients
+    to reload their task list.
+    """
+
+    __tablename__ = "task_changes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    task_id: Mapped[Optional[int]]
+    kind: Mapped[str] = mapped_column(String(9))
+
+
+# Full-text index over task titles and descriptions, kept in sync with the
+# tasks table by triggers. Only created on SQLite builds with FTS5; search
+# falls back to LIKE matching elsewhere.
+TASKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+
+def fts5_available(ddl, target, bind, **kw):
+    """Check whether the database supports SQLite FTS5 tables.
+
+    Args:
+        ddl (DDL): The DDL element about to be executed.
+        target (Table): The table the DDL is attached to.
+        bind (Connection): The connection in use.
+        **kw: Additional event arguments.
+
+    Returns:
+        bool: True on SQLite builds compiled with FTS5.
+
+    """
+    if bind.dialect.name != "sqlite":
+        return False
+    options = bind.exec_driver_sql("PRAGMA compile_options").scalars().all()
+    return "ENABLE_FTS5" in options
+
+
+for statement in TASKS_FTS_DDL:
+    event.listen(
+        Task.__table__,
+        "after_create",
+        DDL(statement).execute_if(callable_=fts5_available),
+    )
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that creating the application should not load: Flask-Migrate and
+# Alembic are only needed by the ``flask db`` commands, WTForms by the HTML
+# form of the main page.
+DEFERRED_MODULES = ("alembic", "flask_migrate", "flask_wtf", "wtforms")
+
+# Run in a fresh interpreter: imports the app, then creates it, and prints
+# the elapsed times as JSON. The import breakdown goes to stderr.
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app(config_name=sys.argv[1] or None)
+ready = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (ready - imported) * 1000,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def parse_importtime(output):
+    """Parse the report printed by ``python -X importtime``.
+
+    Args:
+        output (str): The interpreter's standard error.
+
+    Returns:
+        list: ``(module, self_us, cumulative_us)`` tuples, in import order.
+
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        entries.append((module.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def package_totals(entries):
+    """Sum the import times of every top-level package.
+
+    Args:
+        entries (list): Entries returned by `parse_importtime`.
+
+    Returns:
+        list: ``(package, milliseconds, modules)`` tuples, slowest first.
+
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for module, self_us, _ in entries:
+        total = totals[module.split(".")[0]]
+        total[0] += self_us
+        total[1] += 1
+    return sorted(
+        ((package, us / 1000, count) for package, (us, count) in totals.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+
+
+def profile_startup(config_name=None, breakdown=True):
+    """Measure a cold start of the application in a fresh interpreter.
+
+    Args:
+        config_name (str): The configuration profile; defaults to the
+            ``APP_CONFIG`` environment variable.
+        breakdown (bool): Whether to collect the import breakdown, which
+            slows the imports down a little.
+
+    Returns:
+        dict: The ``total_ms``, ``import_ms`` and ``create_app_ms`` timings,
+            the ``packages`` import breakdown of `package_totals` and the
+            loaded ``modules``.
+
+    """
+    options = ["-X", "importtime"] if breakdown else []
+    result = subprocess.run(
+        [sys.executable, *options, "-c", STARTUP_SCRIPT, config_name or ""],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["total_ms"] = report["import_ms"] + report["create_app_ms"]
+    report["packages"] = package_totals(parse_importtime(result.stderr))
+    return report
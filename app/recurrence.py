@@ -0,0 +1,142 @@
+from datetime import datetime, time
+from itertools import takewhile
+
+from dateutil.rrule import rrule, rrulestr
+
+RECURRENCE_MAX_LENGTH = 200
+
+
+def _start(due_date):
+    """Convert a due date to the datetime a recurrence rule starts at.
+
+    Args:
+        due_date (date): The due date, as a datetime, date or ISO string.
+
+    Returns:
+        datetime: The due date, at midnight for plain dates.
+
+    Raises:
+        ValueError: If a string is not an ISO date.
+
+    """
+    if isinstance(due_date, str):
+        due_date = datetime.fromisoformat(due_date)
+    if isinstance(due_date, datetime):
+        return due_date
+    return datetime.combine(due_date, time.min)
+
+
+def parse_rule(text, due_date):
+    """Parse the recurrence rule of a task, starting at its due date.
+
+    A recurring task stores a single RFC 5545 ``RRULE`` value, such as
+    ``FREQ=WEEKLY;BYDAY=MO``, without ``DTSTART``: the rule always starts
+    at the due date of the stored instance.
+
+    Args:
+        text (str): The rule, with or without the ``RRULE:`` prefix.
+        due_date (date): The due date, as a datetime, date or ISO string.
+
+    Returns:
+        rrule: The rule.
+
+    Raises:
+        ValueError: If the rule or due date is invalid, or the task has no
+            due date.
+
+    """
+    if due_date is None:
+        raise ValueError("Recurring tasks need a due date.")
+    start = _start(due_date)
+    text = text.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[len("RRULE:") :]
+    if not text or len(text) > RECURRENCE_MAX_LENGTH or ":" in text or "\n" in text:
+        raise ValueError(f"Invalid recurrence rule: {text!r}.")
+    try:
+        rule = rrulestr(text, dtstart=start)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Invalid recurrence rule: {text!r}.") from error
+    if not isinstance(rule, rrule):
+        raise ValueError(f"Invalid recurrence rule: {text!r}.")
+    return rule
+
+
+def _rule_text(rule):
+    """Render a rule as stored, without its start date.
+
+    Args:
+        rule (rrule): The rule.
+
+    Returns:
+        str: The ``RRULE`` value.
+
+    """
+    return str(rule).splitlines()[-1].removeprefix("RRULE:")
+
+
+def normalize_rule(text, due_date):
+    """Validate a recurrence rule and render it as stored.
+
+    Args:
+        text (str): The rule, with or without the ``RRULE:`` prefix.
+        due_date (date): The due date of the task.
+
+    Returns:
+        str: The ``RRULE`` value.
+
+    Raises:
+        ValueError: If the rule is invalid or the task has no due date.
+
+    """
+    return _rule_text(parse_rule(text, due_date))
+
+
+def next_occurrence(text, due_date):
+    """Compute the instance following a task of a recurring series.
+
+    The rule of the next instance starts at its own due date, with a
+    ``COUNT`` lowered by the occurrences already past, so that only the
+    instance due next needs to be stored.
+
+    Args:
+        text (str): The stored rule of the task.
+        due_date (date): The due date of the task.
+
+    Returns:
+        tuple: The due date and the stored rule of the next instance, or
+            None if the series has ended.
+
+    """
+    rule = parse_rule(text, due_date)
+    start = _start(due_date)
+    following = rule.after(start)
+    if following is None:
+        return None
+    changes = {"dtstart": following}
+    parts = dict(part.split("=", 1) for part in _rule_text(rule).split(";"))
+    if "COUNT" in parts:
+        changes["count"] = int(parts["COUNT"]) - (start in rule)
+    return following, _rule_text(rule.replace(**changes))
+
+
+def occurrences(text, due_date, after, until):
+    """Generate, lazily, the occurrences following the stored instance.
+
+    Args:
+        text (str): The stored rule of the task.
+        due_date (date): The due date of the stored instance.
+        after (datetime): Skip occurrences due before this time, if given.
+        until (datetime): Stop after the occurrences due at this time.
+
+    Returns:
+        iterator: The due dates, in ascending order.
+
+    """
+    rule = parse_rule(text, due_date)
+    start = _start(due_date)
+    if after is not None and after > start:
+        following = rule.xafter(after, inc=True)
+    else:
+        following = rule.xafter(start)
+    return takewhile(lambda occurrence: occurrence <= until, following)
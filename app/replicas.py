@@ -0,0 +1,261 @@
+import itertools
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.config import extra_engine_options, sqlite_pragmas_listener
+
+# Cookie holding the time until which a client that wrote reads the primary.
+STICKY_COOKIE = "read_primary_until"
+
+
+class ReplicaSet:
+    """Round-robin choice among the read replica engines of an application."""
+
+    def __init__(self, engines, sticky_seconds):
+        """Initialize the replica set.
+
+        Args:
+            engines (list): The replica engines.
+            sticky_seconds (float): How long reads stay on the primary after
+                a write.
+
+        Returns:
+            None
+
+        """
+        self.engines = engines
+        self.sticky_seconds = sticky_seconds
+        self._counter = itertools.count()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the engines of the configured replicas.
+
+        Args:
+            config (Config): The Flask application configuration.
+
+        Returns:
+            ReplicaSet: The replicas, or None if none are configured.
+
+        """
+        engines = [
+            create_engine(uri, **options)
+            for uri, options in extra_engine_options(config, "SQLALCHEMY_REPLICA_URIS")
+        ]
+        if not engines:
+            return None
+        listener = sqlite_pragmas_listener(config)
+        for engine in engines:
+            if engine.dialect.name == "sqlite":
+                event.listen(engine, "connect", listener)
+        return cls(engines, config["REPLICA_STICKY_SECONDS"])
+
+    def next_engine(self):
+        """Return the engine of the next replica in turn.
+
+        Returns:
+            Engine: The engine.
+
+        """
+        return self.engines[next(self._counter) % len(self.engines)]
+
+    def dispose(self):
+        """Close the pooled connections of every replica.
+
+        Returns:
+            None
+
+        """
+        for engine in self.engines:
+            engine.dispose()
+
+
+def replica_set():
+    """Return the read replicas of the current application.
+
+    Returns:
+        ReplicaSet: The replicas, or None if none are configured.
+
+    """
+    return current_app.extensions.get("replicas")
+
+
+def _read_only(clause):
+    """Check whether a statement can be served by a replica.
+
+    Args:
+        clause (ClauseElement): The statement being executed, or None.
+
+    Returns:
+        bool: True for SELECT statements that take no row locks.
+
+    """
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+def stick_to_primary(session):
+    """Send the reads of a session, and of the current client, to the primary.
+
+    Called for every write of a `RoutingSession`, and by writers that commit
+    through another session, such as the write-behind queue.
+
+    Args:
+        session (Session): The session that wrote.
+
+    Returns:
+        None
+
+    """
+    replicas = replica_set()
+    if replicas is None:
+        return
+    until = time.time() + replicas.sticky_seconds
+    session.info["primary_until"] = until
+    session.info["wrote"] = True
+    if has_request_context():
+        g.read_primary_until = until
+
+
+def _stuck_to_primary(session):
+    """Check whether the reads of a session must see its own writes.
+
+    Args:
+        session (Session): The session.
+
+    Returns:
+        bool: True within a transaction that wrote, or for a while after the
+            session or the client of the current request wrote.
+
+    """
+    if session.info.get("wrote"):
+        return True
+    until = session.info.get("primary_until", 0)
+    if has_request_context():
+        until = max(until, g.get("read_primary_until", 0))
+    return until > time.time()
+
+
+def reads_own_writes(session):
+    """Check whether a session reads from the primary to see its own writes.
+
+    Args:
+        session (Session): The session.
+
+    Returns:
+        bool: True if replicas are configured but the session must not be
+            served data read from them.
+
+    """
+    return replica_set() is not None and _stuck_to_primary(session)
+
+
+class RoutingSession(Session):
+    """Session sending read-only statements to the read replicas.
+
+    Writes, locking reads and statements of unknown kind go to the primary,
+    and every statement to the shard selected by `app.sharding.use_shard`.
+    A transaction reads from a single replica, the next one in turn; once a
+    session or client has written, its reads stay on the primary for
+    ``REPLICA_STICKY_SECONDS`` so that they see their own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """Select the engine running a statement.
+
+        Args:
+            mapper (Mapper): The mapped class being queried, if any.
+            clause (ClauseElement): The statement being executed, if any.
+            bind (Engine): An explicitly requested engine, if any.
+            **kwargs: Further arguments of `Session.get_bind`.
+
+        Returns:
+            Engine: The engine.
+
+        """
+        if bind is None and self.info.get("shard") is not None:
+            return current_app.extensions["shards"].engines[self.info["shard"]]
+        replicas = replica_set() if bind is None else None
+        if replicas is not None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                stick_to_primary(self)
+            elif _read_only(clause) and not _stuck_to_primary(self):
+                engine = self.info.get("replica")
+                if engine is None:
+                    engine = self.info["replica"] = replicas.next_engine()
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _end_transaction(session, transaction):
+    """Let the next transaction of a session pick a replica again.
+
+    Args:
+        session (Session): The session.
+        transaction (SessionTransaction): The transaction that ended.
+
+    Returns:
+        None
+
+    """
+    if transaction.parent is None:
+        session.info.pop("replica", None)
+        session.info.pop("wrote", None)
+
+
+def _load_sticky_cookie():
+    """Keep the reads of a client that recently wrote on the primary.
+
+    Returns:
+        None
+
+    """
+    try:
+        g.sticky_cookie = float(request.cookies.get(STICKY_COOKIE, 0))
+    except ValueError:
+        g.sticky_cookie = 0
+    g.read_primary_until = g.sticky_cookie
+
+
+def _save_sticky_cookie(response):
+    """Remember on the client until when its reads must go to the primary.
+
+    Args:
+        response (Response): The response.
+
+    Returns:
+        Response: The response, with the cookie set after a write.
+
+    """
+    until = g.get("read_primary_until", 0)
+    if until > g.get("sticky_cookie", 0):
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{until:.3f}",
+            max_age=int(replica_set().sticky_seconds) + 1,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+def init_replicas(app):
+    """Route read-only statements to the configured read replicas.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    replicas = ReplicaSet.from_config(app.config)
+    if replicas is None:
+        return
+    app.extensions["replicas"] = replicas
+    app.before_request(_load_sticky_cookie)
+    app.after_request(_save_sticky_cookie)
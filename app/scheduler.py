@@ -0,0 +1,367 @@
+import atexit
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.events import change_log_in_order
+from app.services import change_log_bounds, changes_since, open_task_rows, tasks_due
+
+logger = logging.getLogger(__name__)
+
+REMINDER = "reminder"
+OVERDUE = "overdue"
+
+
+def _utcnow():
+    """Return the current UTC time as a naive datetime, as due dates are stored.
+
+    Returns:
+        datetime: The current time.
+
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _log_reminder(task):
+    """Log that a task is due soon; the default reminder hook.
+
+    Args:
+        task (Row): The task, with `TASK_COLUMNS` attributes.
+
+    Returns:
+        None
+
+    """
+    logger.info("Task %s is due at %s.", task.id, task.due_date.isoformat())
+
+
+def _log_overdue(task):
+    """Log that a task is overdue; the default overdue hook.
+
+    Args:
+        task (Row): The task, with `TASK_COLUMNS` attributes.
+
+    Returns:
+        None
+
+    """
+    logger.info("Task %s is overdue.", task.id)
+
+
+class DueDateScheduler:
+    """Fires reminder and overdue hooks as open tasks come due.
+
+    Only the tasks due within the next ``horizon`` seconds are held in
+    memory, as a min-heap of ``(fire time, task id, kind)`` timers. The
+    window is extended by range queries over the due date index, reading
+    each task once, and tasks created since are picked up from the task
+    change log. Completed and deleted tasks keep their timers, which are
+    dropped when they expire by checking the expired tasks in one query.
+    Bulk changes and a change log pruned past the scheduler's position
+    reload the window.
+
+    A task's reminder fires ``lead`` seconds before its due date and its
+    overdue hook at the due date. Tasks that were already due, or due
+    within the lead, when the window was loaded get no reminder; tasks
+    created that late get theirs at once.
+    """
+
+    def __init__(self, app, lead, horizon, poll_interval, batch_size, clock=_utcnow):
+        """Initialize the scheduler; call `start` or `run` to process timers.
+
+        Args:
+            app (Flask): The application whose tasks are scheduled.
+            lead (float): How long before the due date reminders fire, in
+                seconds; 0 disables reminders.
+            horizon (float): How far ahead tasks are loaded, in seconds; at
+                least twice the lead.
+            poll_interval (float): The longest time between two looks at the
+                change log, in seconds.
+            batch_size (int): The number of rows read per query.
+            clock (function): Returns the current time as a naive UTC
+                datetime.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the horizon is shorter than twice the lead.
+
+        """
+        if horizon <= 0 or horizon < 2 * lead:
+            raise ValueError("The horizon must be at least twice the lead.")
+        self.app = app
+        self.lead = timedelta(seconds=lead)
+        self.horizon = timedelta(seconds=horizon)
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.clock = clock
+        self.hooks = {REMINDER: [], OVERDUE: []}
+        self._timers = []
+        self._scheduled = set()
+        self._cursor = None
+        self._loaded_until = None
+        self._last_change = None
+        self._last_tick = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, app):
+        """Create the scheduler configured for an application.
+
+        Args:
+            app (Flask): The Flask application.
+
+        Returns:
+            DueDateScheduler: The scheduler, with the logging hooks connected.
+
+        Raises:
+            RuntimeError: If tasks are sharded, as only the application
+                database would be scheduled, or the database is not SQLite,
+                whose change log is read as `change_log_in_order` requires.
+
+        """
+        if "shards" in app.extensions:
+            raise RuntimeError("The due date scheduler does not support sharding.")
+        if not change_log_in_order(app):
+            raise RuntimeError("The due date scheduler only supports SQLite.")
+        config = app.config
+        scheduler = cls(
+            app,
+            config["DUE_REMINDER_LEAD"],
+            config["DUE_SCHEDULER_HORIZON"],
+            config["DUE_SCHEDULER_POLL_INTERVAL"],
+            config["DUE_SCHEDULER_BATCH_SIZE"],
+        )
+        scheduler.connect(REMINDER, _log_reminder)
+        scheduler.connect(OVERDUE, _log_overdue)
+        return scheduler
+
+    def connect(self, kind, hook):
+        """Call a function whenever a timer of the given kind fires.
+
+        Hooks run on the scheduler thread, inside an application context.
+
+        Args:
+            kind (str): `REMINDER` or `OVERDUE`.
+            hook (function): Called with the task row.
+
+        Returns:
+            function: The hook, so that this can be used as a decorator.
+
+        """
+        self.hooks[kind].append(hook)
+        return hook
+
+    def wake(self):
+        """Look at the change log now rather than at the next timer.
+
+        Returns:
+            None
+
+        """
+        self._wake.set()
+
+    def _schedule(self, task_id, due_date, reminders_after=None):
+        """Add the timers of a task, unless it already has them.
+
+        Args:
+            task_id (int): The ID of the task.
+            due_date (datetime): The due date of the task.
+            reminders_after (datetime): Skip the reminder if it was due by
+                then, as it already fired or predates the scheduler.
+
+        Returns:
+            None
+
+        """
+        if task_id in self._scheduled:
+            return
+        self._scheduled.add(task_id)
+        remind_at = due_date - self.lead
+        if self.lead and (reminders_after is None or remind_at > reminders_after):
+            heapq.heappush(self._timers, (remind_at, task_id, REMINDER))
+        heapq.heappush(self._timers, (due_date, task_id, OVERDUE))
+
+    def _load(self, until):
+        """Extend the window to the open tasks due on or before a time.
+
+        Args:
+            until (datetime): The new end of the window.
+
+        Returns:
+            None
+
+        """
+        while True:
+            rows = tasks_due(self._cursor, until, self.batch_size)
+            for row in rows:
+                self._schedule(row.id, row.due_date, self._last_tick)
+            if len(rows) < self.batch_size:
+                break
+            self._cursor = (rows[-1].due_date, rows[-1].id)
+        self._cursor = (until, None)
+        self._loaded_until = until
+
+    def _reset(self, now):
+        """Drop every timer and load the window again.
+
+        The window starts at the last tick, whose expired timers have fired,
+        or at the current time on the first tick.
+
+        Args:
+            now (datetime): The current time.
+
+        Returns:
+            None
+
+        """
+        logger.debug("Loading the due date window.")
+        self._timers.clear()
+        self._scheduled.clear()
+        self._last_change = change_log_bounds().last or 0
+        self._last_tick = self._last_tick or now
+        self._cursor = (self._last_tick, None)
+        self._load(now + self.horizon)
+
+    def _apply_changes(self):
+        """Schedule the tasks created since the last change seen.
+
+        Returns:
+            bool: False if the window must be reloaded instead.
+
+        """
+        while True:
+            changes = changes_since(self._last_change, self.batch_size)
+            if changes and changes[0].change_id > self._last_change + 1:
+                first = change_log_bounds().first
+                if first is not None and first > self._last_change + 1:
+                    return False
+            for change in changes:
+                if change.kind == "reset":
+                    return False
+                if (
+                    change.kind == "created"
+                    and change.due_date is not None
+                    and change.completed is False
+                    and change.due_date <= self._loaded_until
+                ):
+                    self._schedule(change.id, change.due_date)
+                self._last_change = change.change_id
+            if len(changes) < self.batch_size:
+                return True
+
+    def _fire(self, now):
+        """Run the hooks of the timers that expired by a time.
+
+        Args:
+            now (datetime): The current time.
+
+        Returns:
+            None
+
+        """
+        expired = []
+        while self._timers and self._timers[0][0] <= now:
+            expired.append(heapq.heappop(self._timers))
+        if not expired:
+            return
+        tasks = {row.id: row for row in open_task_rows([t[1] for t in expired])}
+        for _, task_id, kind in expired:
+            if kind == OVERDUE:
+                self._scheduled.discard(task_id)
+            task = tasks.get(task_id)
+            if task is None:
+                continue
+            for hook in self.hooks[kind]:
+                try:
+                    hook(task)
+                except Exception:
+                    logger.exception("The %s hook of task %s failed.", kind, task_id)
+
+    def tick(self, now=None):
+        """Pick up task changes, extend the window and fire expired timers.
+
+        Must run inside an application context.
+
+        Args:
+            now (datetime): The current time; read from the clock by default.
+
+        Returns:
+            datetime: When the next timer expires, or None if none is loaded.
+
+        """
+        now = now or self.clock()
+        if self._loaded_until is None or not self._apply_changes():
+            self._reset(now)
+        elif self._loaded_until - now < self.horizon / 2:
+            self._load(now + self.horizon)
+        self._last_tick = now
+        self._fire(now)
+        return self._timers[0][0] if self._timers else None
+
+    def run(self):
+        """Process timers in the current thread until `close` is called.
+
+        Returns:
+            None
+
+        """
+        while not self._stop.is_set():
+            next_at = None
+            try:
+                with self.app.app_context():
+                    next_at = self.tick()
+            except Exception:
+                logger.exception("Due date scheduling failed.")
+            timeout = self.poll_interval
+            if next_at is not None:
+                until_next = (next_at - self.clock()).total_seconds()
+                timeout = min(timeout, max(until_next, 0))
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def start(self):
+        """Process timers in a background thread.
+
+        Returns:
+            None
+
+        """
+        self._thread = threading.Thread(
+            target=self.run, name="due-date-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        """Stop processing timers, waiting for running hooks to finish.
+
+        Returns:
+            None
+
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+
+
+def init_scheduler(app):
+    """Fire the due date hooks of an application in the background, if enabled.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    if not app.config["DUE_SCHEDULER_ENABLED"]:
+        return
+    scheduler = DueDateScheduler.from_config(app)
+    app.extensions["due_scheduler"] = scheduler
+    scheduler.start()
+    atexit.register(scheduler.close)
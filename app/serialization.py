@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+TASK_FIELDS = ("id", "title", "description", "due_date", "completed", "recurrence")
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def serialize_task(task):
+    """Convert a task row or object into a JSON-serializable dictionary.
+
+    Upcoming occurrences of recurring tasks, which share the id of their
+    stored instance, are marked with ``"occurrence": true``.
+
+    Args:
+        task (Row): A task row or Task object, or a generated occurrence.
+
+    Returns:
+        dict: The task fields.
+
+    """
+    data = {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "due_date": task.due_date.isoformat() if task.due_date else None,
+        "completed": task.completed,
+        "recurrence": task.recurrence,
+    }
+    if getattr(task, "occurrence", False):
+        data["occurrence"] = True
+    return data
+
+
+def _csv_chunks(rows, chunk_size):
+    """Render task rows as CSV, with a header line.
+
+    Args:
+        rows (iterable): The task rows.
+        chunk_size (int): The number of rows per yielded chunk.
+
+    Returns:
+        generator: CSV text chunks.
+
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(TASK_FIELDS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(serialize_task(row).values())
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows, chunk_size):
+    """Render task rows as newline-delimited JSON.
+
+    Args:
+        rows (iterable): The task rows.
+        chunk_size (int): The number of rows per yielded chunk.
+
+    Returns:
+        generator: NDJSON text chunks.
+
+    """
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(serialize_task(row)) + "\n")
+        if len(lines) == chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def export_chunks(rows, export_format, chunk_size=1000):
+    """Render task rows in an export format, chunk by chunk.
+
+    Args:
+        rows (iterable): The task rows.
+        export_format (str): One of `EXPORT_FORMATS`.
+        chunk_size (int): The number of rows per yielded chunk.
+
+    Returns:
+        generator: Text chunks of the export.
+
+    Raises:
+        ValueError: If the format is not supported.
+
+    """
+    if export_format == "csv":
+        return _csv_chunks(rows, chunk_size)
+    if export_format == "ndjson":
+        return _ndjson_chunks(rows, chunk_size)
+    raise ValueError(f"Unsupported export format: {export_format!r}.")
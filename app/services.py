@@ -1,9 +1,82 @@
+import logging
+import re
+from collections import Counter, namedtuple
+from concurrent.futures import Future
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
 from functools import wraps
+from operator import attrgetter
+from time import perf_counter
+from typing import Optional
 
 from flask import current_app
+from sqlalchemy import (
+    Date,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    table,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.models import Task, db
+from app.metrics import record_service_call
+from app.models import (
+    ArchivedTask,
+    DataVersion,
+    Task,
+    TaskChange,
+    TaskDueDay,
+    TaskStats,
+    db,
+)
+from app.recurrence import next_occurrence, normalize_rule, occurrences
+from app.replicas import reads_own_writes, stick_to_primary
+from app.sharding import merge_sorted, new_task_id, shard_set, use_shard
+
+logger = logging.getLogger(__name__)
+
+TASK_SORT_FIELDS = ("id", "due_date")
+# Columns selected by the lightweight, identity-map free readers.
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.due_date,
+    Task.completed,
+    Task.version,
+    Task.recurrence,
+)
+# Upcoming occurrence of a recurring task, generated by listings rather than
+# stored; it shares the id of the stored instance and is marked by its
+# ``occurrence`` attribute, which stored tasks lack.
+TaskOccurrence = namedtuple(
+    "TaskOccurrence",
+    [
+        "id",
+        "title",
+        "description",
+        "due_date",
+        "completed",
+        "version",
+        "recurrence",
+        "occurrence",
+    ],
+    defaults=(True,),
+)
+# Words of a search query; punctuation is never passed on to FTS5.
+SEARCH_TERM = re.compile(r"\w+")
+# Keeps "IN (...)" lists below SQLite's bound parameter limit.
+BULK_CHUNK_SIZE = 500
+# Combined data version of every shard.
+ShardedDataVersion = namedtuple("ShardedDataVersion", ["version", "updated_at"])
 
 
 class TaskNotFoundError(Exception):
@@ -23,8 +96,64 @@ class TaskNotFoundError(Exception):
         super().__init__(self.message)
 
 
+class TaskConflictError(Exception):
+    """Custom exception raised when a task changed since the caller read it."""
+
+    def __init__(self, task_id, expected_version, version):
+        """Initialize the exception with the expected and current versions.
+
+        Args:
+            task_id (int): The ID of the task.
+            expected_version (int): The version the caller based its change on.
+            version (int): The current version of the task.
+
+        Returns:
+            None
+
+        """
+        self.version = version
+        self.message = (
+            f"Task with ID {task_id} is at version {version}, not {expected_version}."
+        )
+        super().__init__(self.message)
+
+
+class InvalidCursorError(ValueError):
+    """Custom exception raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self, cursor):
+        """Initialize the exception with the offending cursor.
+
+        Args:
+            cursor (str): The cursor that could not be decoded.
+
+        Returns:
+            None
+
+        """
+        self.message = f"Invalid pagination cursor: {cursor!r}."
+        super().__init__(self.message)
+
+
+@dataclass
+class TaskPage:
+    """A single page of tasks returned by a keyset-paginated listing."""
+
+    items: list = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    limit: int = 0
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk operation on tasks identified by id."""
+
+    succeeded: list = field(default_factory=list)
+    not_found: list = field(default_factory=list)
+
+
 def handle_db_errors(func):
-    """Wrap database operations and handle SQLAlchemy errors.
+    """Wrap database operations, handle SQLAlchemy errors and time the calls.
 
     Args:
         func (function): The function to be decorated.
@@ -36,100 +165,2150 @@ def handle_db_errors(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
+        start = perf_counter()
+        outcome = "ok"
         try:
             return func(*args, **kwargs)
         except TaskNotFoundError:
             # Let TaskNotFoundError propagate.
+            outcome = "not_found"
+            raise
+        except TaskConflictError:
+            outcome = "conflict"
             raise
         except SQLAlchemyError:
+            outcome = "error"
             db.session.rollback()
-            current_app.logger.exception(f"Database error occurred in {func.__name__}")
+            logger.exception("Database error occurred in %s", func.__name__)
             raise
+        finally:
+            record_service_call(func.__name__, perf_counter() - start, outcome)
 
     return wrapper
 
 
+def write_queue():
+    """Return the write-behind queue of the current application.
+
+    Returns:
+        WriteBehindQueue: The queue, or None if write-behind is disabled.
+
+    """
+    return current_app.extensions.get("write_queue")
+
+
+def _task_shard(task_id):
+    """Return the shard holding a task.
+
+    Args:
+        task_id (int): The ID of the task.
+
+    Returns:
+        int: The shard number, or None if sharding is disabled.
+
+    Raises:
+        TaskNotFoundError: If no shard holds that id.
+
+    """
+    shards = shard_set()
+    if shards is None:
+        return None
+    number = shards.shard_for_id(task_id)
+    if number is None:
+        raise TaskNotFoundError(task_id)
+    return number
+
+
+def _on_shard(number):
+    """Run the statements of ``db.session`` on a shard, if sharding.
+
+    Args:
+        number (int): The shard number, or None if sharding is disabled.
+
+    Returns:
+        ContextManager: The context to run the statements in.
+
+    """
+    return nullcontext() if number is None else use_shard(number)
+
+
+def _shard_numbers():
+    """List the shards to run maintenance jobs on.
+
+    Returns:
+        list: The shard numbers, or ``[None]`` if sharding is disabled.
+
+    """
+    shards = shard_set()
+    return [None] if shards is None else list(range(len(shards)))
+
+
+def _by_shard(operation, task_ids):
+    """Run a bulk operation on tasks identified by id, on their shards.
+
+    When sharding, the ids are grouped by shard and each group is run and
+    committed on its own shard; ids no shard holds are reported as missing.
+
+    Args:
+        operation (function): Runs and commits the operation on the ids of
+            one shard, returning a `BulkResult`.
+        task_ids (list): The ids of the targeted tasks.
+
+    Returns:
+        BulkResult: The matched and missing ids, in request order.
+
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    shards = shard_set()
+    if shards is None:
+        return operation(task_ids)
+    groups = {}
+    for task_id in task_ids:
+        groups.setdefault(shards.shard_for_id(task_id), []).append(task_id)
+    succeeded = set()
+    for number, shard_ids in groups.items():
+        if number is not None:
+            with _on_shard(number):
+                succeeded.update(operation(shard_ids).succeeded)
+    return BulkResult(
+        succeeded=[task_id for task_id in task_ids if task_id in succeeded],
+        not_found=[task_id for task_id in task_ids if task_id not in succeeded],
+    )
+
+
+def _write(operation, args, wait, shard=None):
+    """Run a task mutation, through the write-behind queue if enabled.
+
+    Args:
+        operation (function): Applies the mutation to ``db.session`` without
+            committing it.
+        args (tuple): The operation arguments.
+        wait (bool): Whether to wait for the mutation to be committed.
+        shard (int): The shard to run the mutation on, if sharding.
+
+    Returns:
+        object: The operation result, or a Future of it if ``wait`` is False.
+
+    """
+    queue = write_queue()
+    if queue is not None:
+        future = queue.submit(operation, *args)
+        # The writer thread commits through its own session.
+        stick_to_primary(db.session)
+        return future.result() if wait else future
+    with _on_shard(shard):
+        try:
+            result = operation(*args)
+        except Exception:
+            # Releases the write lock taken by an UPDATE that matched nothing.
+            db.session.rollback()
+            raise
+        _commit()
+        if shard is not None:
+            # Reload the committed task while its shard is known.
+            db.session.refresh(result)
+    if wait:
+        return result
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def stage_task_creation(session, title, description, due_date, recurrence=None):
+    """Insert a task and log its creation, without committing.
+
+    The synchronous services and, through `AsyncSession.run_sync`, the async
+    ones apply every task mutation with the ``stage_*`` functions, and
+    commit it with `commit_task_changes`.
+
+    Args:
+        session (Session): The session modifying tasks.
+        title (str): The title of the task.
+        description (str): The description of the task.
+        due_date (datetime): The due date of the task.
+        recurrence (str): The stored recurrence rule of the task, if any.
+
+    Returns:
+        Task: The inserted task object.
+
+    """
+    task = Task(
+        id=new_task_id(session),
+        title=title,
+        description=description,
+        due_date=due_date,
+        recurrence=recurrence,
+    )
+    session.add(task)
+    session.flush()
+    _log_change(task.id, "created", session)
+    _update_stats(session, open_tasks=1, due_days=_due_days([due_date], 1))
+    logger.info("Task with id %s created successfully.", task.id)
+    return task
+
+
 @handle_db_errors
-def create_task(title, description, due_date):
+def create_task(
+    title, description, due_date, wait=True, shard_key=None, recurrence=None
+):
     """Create a task object and add it to the database.
 
     Args:
         title (str): The title of the task.
         description (str): The description of the task.
         due_date (str): The due date of the task.
+        wait (bool): Whether to wait for the task to be committed.
+        shard_key (object): When sharding, the owner or project whose shard
+            the task is stored in; tasks go to every shard in turn without.
+        recurrence (str): An RFC 5545 RRULE, such as ``FREQ=WEEKLY``, making
+            the task recur from its due date.
+
+    Returns:
+        Task: The created task object, or a Future of it if ``wait`` is False.
+
+    Raises:
+        ValueError: If the recurrence rule is invalid or has no due date.
+
+    """
+    if recurrence:
+        recurrence = normalize_rule(recurrence, due_date)
+    shards = shard_set()
+    shard = None if shards is None else shards.shard_for_key(shard_key)
+    args = (db.session, title, description, due_date, recurrence or None)
+    return _write(stage_task_creation, args, wait, shard)
+
+
+def task_cache():
+    """Return the task listing cache of the current application.
 
     Returns:
-        Task: The created task object.
+        CacheBackend: The configured cache backend.
 
     """
-    task = Task(title=title, description=description, due_date=due_date)
-    db.session.add(task)
-    db.session.commit()
-    current_app.logger.info(f"Task with id {task.id} created successfully.")
-    return task
+    return current_app.extensions["task_cache"]
 
 
-@handle_db_errors
-def list_tasks():
-    """Retrieve all tasks from the database.
+def _listing_key(name, version, *params):
+    """Build the cache key of a listing page.
+
+    Keys include the data version, read before the page, so that cached
+    pages older than a write committed by another worker are never served.
+
+    Args:
+        name (str): The name of the listing service.
+        version (Row): The data version, or None to read it now.
+        *params: The listing parameters; dictionaries are sorted.
 
     Returns:
-        list: A list of task objects.
+        str: The cache key.
 
     """
-    tasks = db.session.scalars(db.select(Task)).all()
-    current_app.logger.debug("Tasks retrieved successfully.")
-    return tasks
+    if version is None:
+        version = data_version()
+    params = [
+        sorted(param.items()) if isinstance(param, dict) else param for param in params
+    ]
+    return repr((name, version.version, *params))
 
 
-@handle_db_errors
-def complete_task(task_id):
-    """Mark a task as completed.
+def _cached_page(key):
+    """Return a cached listing page, unless it may miss the caller's writes.
+
+    With read replicas, cached pages may have been read from a lagging
+    replica, so sessions that must see their own writes skip the cache.
 
     Args:
-        task_id (int): The ID of the task to be completed.
+        key (str): The cache key.
 
     Returns:
-        Task: The completed task object.
+        TaskPage: The cached page, or None.
 
-    Raises:
-        TaskNotFoundError: If the task with the given ID is not found.
+    """
+    if reads_own_writes(db.session):
+        return None
+    return task_cache().get(key)
+
+
+def _invalidate_cache():
+    """Drop cached listings after tasks have been modified.
+
+    Returns:
+        None
 
     """
-    task = db.session.get(Task, task_id)
-    if not task:
-        current_app.logger.warning(f"Attempt to complete non-existent task: {task_id}")
-        raise TaskNotFoundError(task_id)
-    if task.completed:
-        current_app.logger.warning(
-            f"Attempt to complete already completed task: {task_id}"
+    task_cache().clear()
+
+
+def _after_commit():
+    """Drop cached listings and wake the change feed and scheduler.
+
+    Returns:
+        None
+
+    """
+    _invalidate_cache()
+    current_app.extensions["change_broker"].publish()
+    scheduler = current_app.extensions.get("due_scheduler")
+    if scheduler is not None:
+        scheduler.wake()
+
+
+def _change_entry(task_id, kind):
+    """Build the statement appending a task change to the change log.
+
+    Args:
+        task_id (int): The ID of the changed task, or None for bulk changes.
+        kind (str): ``"created"``, ``"completed"``, ``"deleted"`` or
+            ``"reset"`` for bulk changes.
+
+    Returns:
+        Insert: The statement, to run in the transaction modifying tasks.
+
+    """
+    return insert(TaskChange).values(task_id=task_id, kind=kind)
+
+
+def _log_change(task_id, kind, session=None):
+    """Append a task change to the change log in the current transaction.
+
+    Args:
+        task_id (int): The ID of the changed task, or None for bulk changes.
+        kind (str): The kind of change, see `_change_entry`.
+        session (Session): The session modifying tasks; ``db.session`` by
+            default.
+
+    Returns:
+        None
+
+    """
+    session = db.session if session is None else session
+    session.execute(_change_entry(task_id, kind))
+
+
+def _utcnow():
+    """Return the current UTC time as a naive datetime, as stored.
+
+    Returns:
+        datetime: The current time.
+
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _bump_version():
+    """Build the statement advancing the data version.
+
+    Returns:
+        Update: The statement, to run in the transaction modifying tasks.
+
+    """
+    return (
+        update(DataVersion)
+        .where(DataVersion.id == 1)
+        .values(
+            version=DataVersion.version + 1,
+            updated_at=_utcnow(),
         )
-    else:
-        task.completed = True
-        db.session.commit()
-        current_app.logger.info(f"Task '{task.title}' marked as complete.")
-    return task
+    )
+
+
+def _touch():
+    """Advance the data version in the current transaction.
+
+    Returns:
+        None
+
+    """
+    db.session.execute(_bump_version())
+
+
+def commit_task_changes(session):
+    """Commit task modifications and drop the cached listings.
+
+    Args:
+        session (Session): The session modifying tasks.
+
+    Returns:
+        None
+
+    """
+    session.execute(_bump_version())
+    session.commit()
+    _after_commit()
+
+
+def _commit():
+    """Commit the task modifications of ``db.session``.
+
+    Returns:
+        None
+
+    """
+    commit_task_changes(db.session)
+
+
+def _due_day(due_date):
+    """Return the day a task is due, as counted by the task statistics.
+
+    Args:
+        due_date (datetime): The due date, as a datetime, date or ISO string.
+
+    Returns:
+        date: The due day, or None for tasks without a due date.
+
+    """
+    if isinstance(due_date, str):
+        due_date = datetime.fromisoformat(due_date)
+    if isinstance(due_date, datetime):
+        return due_date.date()
+    return due_date
+
+
+def _due_days(due_dates, change):
+    """Count the open tasks gained or lost per due day.
+
+    Args:
+        due_dates (iterable): The due dates of the tasks.
+        change (int): 1 for opened tasks, -1 for tasks no longer open.
+
+    Returns:
+        Counter: The change of the open task count per due day.
+
+    """
+    days = Counter(_due_day(due_date) for due_date in due_dates)
+    days.pop(None, None)
+    return Counter({day: count * change for day, count in days.items()})
+
+
+def _stats_statements(dialect, open_tasks=0, completed_tasks=0, due_days=None):
+    """Build the statements applying a change of task counts to the stats.
+
+    Args:
+        dialect (str): The name of the database dialect.
+        open_tasks (int): The change of the open task count.
+        completed_tasks (int): The change of the completed task count.
+        due_days (Counter): The change of the open task count per due day,
+            see `_due_days`.
+
+    Returns:
+        list: The statements, to run in the transaction modifying tasks.
+
+    """
+    statements = []
+    if open_tasks or completed_tasks:
+        statements.append(
+            update(TaskStats)
+            .where(TaskStats.id == 1)
+            .values(
+                open_tasks=TaskStats.open_tasks + open_tasks,
+                completed_tasks=TaskStats.completed_tasks + completed_tasks,
+            )
+        )
+    rows = [
+        {"due_day": day, "open_tasks": count}
+        for day, count in sorted((due_days or {}).items())
+        if count
+    ]
+    if rows:
+        dialect_module = postgresql if dialect == "postgresql" else sqlite
+        upsert = dialect_module.insert(TaskDueDay).values(rows)
+        statements.append(
+            upsert.on_conflict_do_update(
+                index_elements=[TaskDueDay.due_day],
+                set_={"open_tasks": TaskDueDay.open_tasks + upsert.excluded.open_tasks},
+            )
+        )
+    return statements
+
+
+def _update_stats(session=None, **changes):
+    """Apply a change of task counts to the stats in the current transaction.
+
+    Args:
+        session (Session): The session modifying tasks; ``db.session`` by
+            default.
+        **changes: The `_stats_statements` count changes.
+
+    Returns:
+        None
+
+    """
+    session = db.session if session is None else session
+    dialect = session.get_bind().dialect.name
+    for statement in _stats_statements(dialect, **changes):
+        session.execute(statement)
+
+
+def _removed_tasks(tasks):
+    """Compute the change of task counts when visible tasks go away.
+
+    Args:
+        tasks (list): Rows or objects with ``completed`` and ``due_date``.
+
+    Returns:
+        dict: Keyword arguments for `_update_stats`.
+
+    """
+    open_dues = [task.due_date for task in tasks if not task.completed]
+    return {
+        "open_tasks": -len(open_dues),
+        "completed_tasks": len(open_dues) - len(tasks),
+        "due_days": _due_days(open_dues, -1),
+    }
 
 
 @handle_db_errors
-def delete_task(task_id):
-    """Delete a task from the database.
+def task_stats(today=None):
+    """Return the task counts shown on dashboards.
+
+    Read from the summary tables, so the cost does not depend on the number
+    of tasks. When sharding, the counts of every shard are added up.
 
     Args:
-        task_id (int): The ID of the task to be deleted.
+        today (date): The day before which open tasks are overdue; defaults
+            to the current day.
 
     Returns:
-        Task: The deleted task object.
+        dict: The ``total``, ``open``, ``completed``, ``overdue`` and
+            ``due_today`` task counts.
 
-    Raises:
-        TaskNotFoundError: If the task with the given ID is not found.
+    """
+    today = today or date.today()
+    shards = shard_set()
+    if shards is None:
+        return _count_tasks(db.session, today)
+    totals = Counter()
+    for counts in shards.map(lambda session: _count_tasks(session, today)):
+        totals.update(counts)
+    return dict(totals)
+
+
+def _count_tasks(session, today):
+    """Read the task counts of `task_stats` from one database.
+
+    Args:
+        session (Session): The session to use.
+        today (date): The day before which open tasks are overdue.
+
+    Returns:
+        dict: The task counts.
 
     """
-    task = db.session.get(Task, task_id)
-    if not task:
-        current_app.logger.warning(f"Attempt to delete a non-existent task: {task_id}")
-        raise TaskNotFoundError(task_id)
-    db.session.delete(task)
+    counts = session.execute(
+        db.select(TaskStats.open_tasks, TaskStats.completed_tasks).where(
+            TaskStats.id == 1
+        )
+    ).one()
+    due = session.execute(
+        db.select(
+            func.coalesce(
+                func.sum(TaskDueDay.open_tasks).filter(TaskDueDay.due_day < today), 0
+            ).label("overdue"),
+            func.coalesce(
+                func.sum(TaskDueDay.open_tasks).filter(TaskDueDay.due_day == today), 0
+            ).label("due_today"),
+        )
+    ).one()
+    return {
+        "total": counts.open_tasks + counts.completed_tasks,
+        "open": counts.open_tasks,
+        "completed": counts.completed_tasks,
+        "overdue": due.overdue,
+        "due_today": due.due_today,
+    }
+
+
+def _reconcile_task_stats():
+    """Recompute the task statistics of the current database and commit.
+
+    Returns:
+        None
+
+    """
+    visible = Task.deleted_at.is_(None)
+    # Writing first takes the write lock before anything is counted.
+    db.session.execute(delete(TaskDueDay))
+    open_tasks, completed_tasks = db.session.execute(
+        db.select(
+            func.count(Task.id).filter(Task.completed.is_(False)),
+            func.count(Task.id).filter(Task.completed.is_(True)),
+        ).where(visible)
+    ).one()
+    db.session.execute(
+        update(TaskStats)
+        .where(TaskStats.id == 1)
+        .values(open_tasks=open_tasks, completed_tasks=completed_tasks)
+    )
+    due_day = func.date(Task.due_date, type_=Date)
+    db.session.execute(
+        insert(TaskDueDay).from_select(
+            ["due_day", "open_tasks"],
+            db.select(due_day, func.count(Task.id))
+            .where(visible, Task.completed.is_(False), Task.due_date.is_not(None))
+            .group_by(due_day),
+        )
+    )
     db.session.commit()
-    current_app.logger.info(f"Task '{task.title}' deleted successfully.")
-    return task
+
+
+@handle_db_errors
+def reconcile_task_stats():
+    """Recompute the task statistics from the tasks table.
+
+    Repairs counters after tasks were written without the services, for
+    example by hand or by an older release, and drops empty due days. When
+    sharding, every shard is reconciled.
+
+    Returns:
+        dict: The counts of `task_stats`.
+
+    """
+    for shard in _shard_numbers():
+        with _on_shard(shard):
+            _reconcile_task_stats()
+    logger.info("Task statistics reconciled.")
+    return task_stats()
+
+
+def _read_data_version(session):
+    """Read the version of the task data of one database.
+
+    Args:
+        session (Session): The session to read with.
+
+    Returns:
+        Row: The ``version`` counter and the UTC ``updated_at`` time.
+
+    """
+    stmt = db.select(DataVersion.version, DataVersion.updated_at).where(
+        DataVersion.id == 1
+    )
+    return session.execute(stmt).one()
+
+
+@handle_db_errors
+def data_version():
+    """Return the version of the task data.
+
+    The version changes with every committed task modification, which makes
+    it a cheap validator for HTTP caching.
+
+    Returns:
+        Row: The ``version`` counter and the UTC ``updated_at`` time; when
+            sharding, the sum of the shard versions and the latest time.
+
+    """
+    shards = shard_set()
+    if shards is None:
+        return _read_data_version(db.session)
+    versions = shards.map(_read_data_version)
+    return ShardedDataVersion(
+        version=sum(row.version for row in versions),
+        updated_at=max(row.updated_at for row in versions),
+    )
+
+
+def cache_stats():
+    """Return the hit and miss counters of the task listing cache.
+
+    Returns:
+        dict: The cache counters.
+
+    """
+    return task_cache().stats()
+
+
+def _page_limit(limit):
+    """Clamp a requested page size to the configured bounds.
+
+    Args:
+        limit (int): The requested page size, or None for the default.
+
+    Returns:
+        int: The page size to use.
+
+    """
+    if limit is None:
+        return current_app.config["TASKS_PER_PAGE"]
+    return max(1, min(limit, current_app.config["TASKS_MAX_PER_PAGE"]))
+
+
+def _encode_cursor(task, sort):
+    """Build the cursor pointing just after the given task.
+
+    Args:
+        task (Task): The last task of the current page.
+        sort (str): The sort field of the listing.
+
+    Returns:
+        str: The opaque cursor string.
+
+    """
+    if sort == "due_date":
+        due = task.due_date.isoformat() if task.due_date else ""
+        return f"{due}|{task.id}"
+    return str(task.id)
+
+
+def _decode_cursor(cursor, sort):
+    """Decode a cursor produced by `_encode_cursor`.
+
+    Args:
+        cursor (str): The cursor string.
+        sort (str): The sort field of the listing.
+
+    Returns:
+        tuple: A ``(due_date, id)`` pair; ``due_date`` is None for id sorting
+            and for tasks without a due date.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+
+    """
+    try:
+        if sort == "due_date":
+            due, _, task_id = cursor.partition("|")
+            return (datetime.fromisoformat(due) if due else None), int(task_id)
+        return None, int(cursor)
+    except ValueError:
+        raise InvalidCursorError(cursor) from None
+
+
+def _day_start(value):
+    """Convert a date to a datetime at midnight, leaving datetimes untouched.
+
+    Args:
+        value (date): The date or datetime to convert.
+
+    Returns:
+        datetime: The corresponding datetime.
+
+    """
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time.min)
+
+
+def _filter_tasks(stmt, completed=None, due_from=None, due_to=None, title_prefix=None):
+    """Apply the listing filters to a select statement.
+
+    Soft-deleted tasks are always left out.
+
+    Args:
+        stmt (Select): The statement to filter.
+        completed (bool): Only keep tasks with this completion state.
+        due_from (date): Only keep tasks due on or after this date.
+        due_to (date): Only keep tasks due on or before this date.
+        title_prefix (str): Only keep tasks whose title starts with this text.
+
+    Returns:
+        Select: The filtered statement.
+
+    """
+    stmt = stmt.where(Task.deleted_at.is_(None))
+    if completed is not None:
+        stmt = stmt.where(Task.completed.is_(completed))
+    if due_from is not None:
+        stmt = stmt.where(Task.due_date >= _day_start(due_from))
+    if due_to is not None:
+        if isinstance(due_to, datetime):
+            stmt = stmt.where(Task.due_date <= due_to)
+        else:
+            stmt = stmt.where(Task.due_date < _day_start(due_to + timedelta(days=1)))
+    if title_prefix:
+        # A range instead of LIKE so that the title index can be used
+        # regardless of the database's LIKE case sensitivity.
+        upper = title_prefix[:-1] + chr(ord(title_prefix[-1]) + 1)
+        stmt = stmt.where(Task.title >= title_prefix, Task.title < upper)
+    return stmt
+
+
+def _fetch(stmt, session=None):
+    """Execute a listing statement.
+
+    Args:
+        stmt (Select): A statement selecting either the Task entity or
+            `TASK_COLUMNS`.
+        session (Session): The session to use; defaults to ``db.session``.
+
+    Returns:
+        list: Task objects for entity statements, plain rows otherwise.
+
+    """
+    session = session or db.session
+    if stmt.column_descriptions[0]["expr"] is Task:
+        return session.scalars(stmt).all()
+    return session.execute(stmt).all()
+
+
+def _fetch_by_id(stmt, cursor_id, limit, session=None):
+    """Fetch up to ``limit`` tasks ordered by id after the cursor id.
+
+    Args:
+        stmt (Select): The filtered statement.
+        cursor_id (int): The id to continue after, or None.
+        limit (int): The maximum number of rows to fetch.
+        session (Session): The session to use; defaults to ``db.session``.
+
+    Returns:
+        list: The fetched tasks.
+
+    """
+    if cursor_id is not None:
+        stmt = stmt.where(Task.id > cursor_id)
+    return _fetch(stmt.order_by(Task.id).limit(limit), session)
+
+
+def _fetch_by_due_date(stmt, cursor, limit, session=None):
+    """Fetch up to ``limit`` tasks ordered by due date after the cursor.
+
+    Tasks without a due date come last. Dated and undated tasks are read by
+    two separate range queries so that each can walk an index instead of
+    sorting on an ``IS NULL`` expression.
+
+    Args:
+        stmt (Select): The filtered statement.
+        cursor (tuple): The decoded ``(due_date, id)`` cursor, or None.
+        limit (int): The maximum number of rows to fetch.
+        session (Session): The session to use; defaults to ``db.session``.
+
+    Returns:
+        list: The fetched tasks.
+
+    """
+    tasks = []
+    cursor_due, cursor_id = cursor if cursor else (None, None)
+    if cursor is None or cursor_due is not None:
+        dated = stmt.where(Task.due_date.is_not(None))
+        if cursor_due is not None:
+            dated = dated.where(
+                Task.due_date >= cursor_due,
+                or_(
+                    Task.due_date > cursor_due,
+                    and_(Task.due_date == cursor_due, Task.id > cursor_id),
+                ),
+            )
+        dated = dated.order_by(Task.due_date, Task.id).limit(limit)
+        tasks = list(_fetch(dated, session))
+        cursor_id = None
+    if len(tasks) < limit:
+        undated = stmt.where(Task.due_date.is_(None))
+        tasks.extend(_fetch_by_id(undated, cursor_id, limit - len(tasks), session))
+    return tasks
+
+
+def _sort_key(sort):
+    """Return the function sorting tasks like a listing.
+
+    Args:
+        sort (str): Either ``"id"`` or ``"due_date"``.
+
+    Returns:
+        function: The sort key of a task; tasks without a due date come last.
+
+    """
+    if sort == "due_date":
+        return lambda task: (
+            task.due_date is None,
+            task.due_date or datetime.min,
+            task.id,
+        )
+    return lambda task: task.id
+
+
+def _occurrence_window(cursor, filters):
+    """Return the due dates a listing shows recurring task occurrences for.
+
+    Args:
+        cursor (tuple): The decoded ``(due_date, id)`` cursor, or None.
+        filters (dict): Keyword arguments for `_filter_tasks`.
+
+    Returns:
+        tuple: The start, if any, and end of the window, or None if the
+            listing shows no occurrences.
+
+    """
+    due_to = filters.get("due_to")
+    if due_to is None or filters.get("completed"):
+        return None
+    if cursor is not None and cursor[0] is None:
+        return None
+    after = cursor[0] if cursor else None
+    if filters.get("due_from") is not None:
+        after = max(after or datetime.min, _day_start(filters["due_from"]))
+    if not isinstance(due_to, datetime):
+        due_to = _day_start(due_to + timedelta(days=1)) - timedelta(microseconds=1)
+    return after, due_to
+
+
+def _task_occurrences(task, window, cursor):
+    """Generate the occurrences of a recurring task within a window.
+
+    Args:
+        task (Row): The stored instance of the recurring task.
+        window (tuple): The window returned by `_occurrence_window`.
+        cursor (tuple): The decoded ``(due_date, id)`` cursor, or None.
+
+    Returns:
+        generator: `TaskOccurrence` tuples, in due date order.
+
+    """
+    cursor_due, cursor_id = cursor if cursor else (None, None)
+    for due_date in occurrences(task.recurrence, task.due_date, *window):
+        if due_date == cursor_due and task.id <= cursor_id:
+            continue
+        yield TaskOccurrence(
+            task.id,
+            task.title,
+            task.description,
+            due_date,
+            False,
+            task.version,
+            task.recurrence,
+        )
+
+
+def _with_occurrences(tasks, stmt, cursor, filters, limit, session=None):
+    """Merge the upcoming occurrences of recurring tasks into a listing.
+
+    Only the instance of a recurring task due next is stored. Listings by
+    due date within a ``due_to`` window show the following occurrences as
+    well, as `TaskOccurrence` tuples generated lazily in due date order, so
+    that only those on the page are ever built.
+
+    Occurrences come after the due date of their stored instance, so the
+    series are read from the recurring task index in due date order, a page
+    at a time, and only while they are due before the last row of a full
+    page: later series cannot recur on it.
+
+    Args:
+        tasks (list): The stored tasks of the page, in due date order.
+        stmt (Select): The unfiltered listing statement.
+        cursor (tuple): The decoded ``(due_date, id)`` cursor, or None.
+        filters (dict): Keyword arguments for `_filter_tasks`.
+        limit (int): The maximum number of rows to return.
+        session (Session): The session to use; defaults to ``db.session``.
+
+    Returns:
+        list: The first ``limit`` tasks and occurrences, in due date order.
+
+    """
+    window = _occurrence_window(cursor, filters)
+    if window is None:
+        return tasks
+    # Stored instances due before the window may recur within it.
+    series_filters = {**filters, "completed": False, "due_from": None}
+    series = (
+        _filter_tasks(stmt, **series_filters)
+        .where(Task.recurrence.is_not(None))
+        .with_hint(Task, "INDEXED BY ix_tasks_recurring", "sqlite")
+    )
+    last = None
+    while True:
+        batch = series
+        if last is not None:
+            batch = batch.where(
+                Task.due_date >= last.due_date,
+                or_(Task.due_date > last.due_date, Task.id > last.id),
+            )
+        if len(tasks) == limit:
+            batch = batch.where(Task.due_date < tasks[-1].due_date)
+        batch = _fetch(batch.order_by(Task.due_date, Task.id).limit(limit), session)
+        upcoming = [_task_occurrences(task, window, cursor) for task in batch]
+        tasks = merge_sorted([tasks, *upcoming], _sort_key("due_date"), limit)
+        if len(batch) < limit:
+            return tasks
+        last = batch[-1]
+
+
+def paginate_tasks(stmt, after, limit, sort, filters, session=None):
+    """Fetch a page of a task listing statement.
+
+    When sharding, every shard is read in parallel and the pages merged.
+    Listings by due date include upcoming occurrences of recurring tasks,
+    see `_with_occurrences`.
+
+    Args:
+        stmt (Select): The unfiltered listing statement.
+        after (str): The cursor returned with the previous page, if any.
+        limit (int): The requested page size.
+        sort (str): Either ``"id"`` or ``"due_date"``.
+        filters (dict): Keyword arguments for `_filter_tasks`.
+        session (Session): The session to use; defaults to ``db.session``.
+
+    Returns:
+        TaskPage: The requested page.
+
+    Raises:
+        ValueError: If the sort field is not supported.
+        InvalidCursorError: If the cursor cannot be decoded.
+
+    """
+    if sort not in TASK_SORT_FIELDS:
+        raise ValueError(f"Unsupported sort field: {sort!r}.")
+    limit = _page_limit(limit)
+    cursor = _decode_cursor(after, sort) if after else None
+    base_stmt, stmt = stmt, _filter_tasks(stmt, **filters)
+
+    def fetch(session):
+        # Fetch one extra row to find out whether another page follows.
+        if sort == "due_date":
+            tasks = _fetch_by_due_date(stmt, cursor, limit + 1, session)
+            return _with_occurrences(
+                tasks, base_stmt, cursor, filters, limit + 1, session
+            )
+        cursor_id = cursor[1] if cursor else None
+        return _fetch_by_id(stmt, cursor_id, limit + 1, session)
+
+    shards = shard_set() if session is None else None
+    if shards is None:
+        tasks = fetch(session)
+    else:
+        tasks = merge_sorted(shards.map(fetch), _sort_key(sort), limit + 1)
+    next_cursor = _encode_cursor(tasks[limit - 1], sort) if len(tasks) > limit else None
+    return TaskPage(items=list(tasks[:limit]), next_cursor=next_cursor, limit=limit)
+
+
+@handle_db_errors
+def list_tasks(
+    after=None,
+    limit=None,
+    completed=None,
+    due_from=None,
+    due_to=None,
+    title_prefix=None,
+    sort="id",
+):
+    """Retrieve a page of tasks using keyset pagination.
+
+    Args:
+        after (str): The cursor returned with the previous page, if any.
+        limit (int): The page size; clamped to ``TASKS_MAX_PER_PAGE``.
+        completed (bool): Only list tasks with this completion state.
+        due_from (date): Only list tasks due on or after this date.
+        due_to (date): Only list tasks due on or before this date.
+        title_prefix (str): Only list tasks whose title starts with this text.
+        sort (str): Either ``"id"`` or ``"due_date"``.
+
+    Returns:
+        TaskPage: The requested page of task objects.
+
+    Raises:
+        ValueError: If the sort field is not supported.
+        InvalidCursorError: If the cursor cannot be decoded.
+
+    """
+    filters = {
+        "completed": completed,
+        "due_from": due_from,
+        "due_to": due_to,
+        "title_prefix": title_prefix,
+    }
+    page = paginate_tasks(db.select(Task), after, limit, sort, filters)
+    logger.debug("Tasks retrieved successfully.")
+    return page
+
+
+@handle_db_errors
+def list_task_rows(after=None, limit=None, sort="id", version=None, **filters):
+    """Retrieve a page of tasks as plain column rows.
+
+    Unlike `list_tasks`, no ORM objects are built or tracked by the session,
+    which makes this the cheaper choice for read-only serialization. Pages are
+    cached by data version and listing parameters, so that a write committed
+    by any worker makes every worker read the page again.
+
+    Args:
+        after (str): The cursor returned with the previous page, if any.
+        limit (int): The page size; clamped to ``TASKS_MAX_PER_PAGE``.
+        sort (str): Either ``"id"`` or ``"due_date"``.
+        version (Row): The data version read by the caller, which the page
+            must be at least as recent as; read here by default.
+        **filters: The `list_tasks` filters.
+
+    Returns:
+        TaskPage: The requested page of rows with `TASK_COLUMNS` attributes.
+
+    Raises:
+        ValueError: If the sort field is not supported.
+        InvalidCursorError: If the cursor cannot be decoded.
+
+    """
+    page = read_task_rows(after, limit, sort, filters, version)
+    logger.debug("Task rows retrieved successfully.")
+    return page
+
+
+def read_task_rows(after, limit, sort, filters, version=None, session=None):
+    """Read a page of task rows through the listing cache.
+
+    Shared by the synchronous and async `list_task_rows`.
+
+    Args:
+        after (str): The cursor returned with the previous page, if any.
+        limit (int): The page size; clamped to ``TASKS_MAX_PER_PAGE``.
+        sort (str): Either ``"id"`` or ``"due_date"``.
+        filters (dict): The `list_tasks` filters.
+        version (Row): The data version the page must be at least as recent
+            as; read with ``session`` by default.
+        session (Session): The session to read with; by default
+            ``db.session``, or every shard when sharding.
+
+    Returns:
+        TaskPage: The requested page of rows with `TASK_COLUMNS` attributes.
+
+    Raises:
+        ValueError: If the sort field is not supported.
+        InvalidCursorError: If the cursor cannot be decoded.
+
+    """
+    if version is None and session is not None:
+        version = _read_data_version(session)
+    key = _listing_key(
+        "list_task_rows", version, after, _page_limit(limit), sort, filters
+    )
+    page = _cached_page(key)
+    if page is None:
+        page = paginate_tasks(
+            db.select(*TASK_COLUMNS), after, limit, sort, filters, session
+        )
+        task_cache().set(key, page)
+    return page
+
+
+def _fts_enabled():
+    """Check whether the full-text index of the tasks table exists.
+
+    Returns:
+        bool: True if ``tasks_fts`` can be queried.
+
+    """
+    if db.session.get_bind().dialect.name != "sqlite":
+        return False
+    exists = db.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    )
+    return db.session.scalar(exists) is not None
+
+
+def _search_statement(terms):
+    """Build the ranked search statement for a list of query terms.
+
+    Every term must match. The last term also matches as a prefix, so that
+    results appear while a word is still being typed.
+
+    Args:
+        terms (list): The words of the search query.
+
+    Returns:
+        Select: The unpaginated search statement selecting `TASK_COLUMNS` and
+            the ``rank`` the results are ordered by, then by id.
+
+    """
+    stmt = db.select(*TASK_COLUMNS)
+    if _fts_enabled():
+        fts = table("tasks_fts", column("rowid"))
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        rank = func.bm25(literal_column("tasks_fts")).label("rank")
+        return (
+            stmt.add_columns(rank)
+            .join(fts, fts.c.rowid == Task.id)
+            .where(literal_column("tasks_fts").op("MATCH")(match))
+            .order_by(rank, Task.id)
+        )
+    # Portable fallback: unranked substring matching, newest tasks first.
+    for term in terms:
+        stmt = stmt.where(
+            or_(
+                Task.title.icontains(term, autoescape=True),
+                Task.description.icontains(term, autoescape=True),
+            )
+        )
+    return stmt.add_columns((-Task.id).label("rank")).order_by(Task.id.desc())
+
+
+def _search_rows(stmt, offset, limit):
+    """Read a slice of the ranked search results.
+
+    When sharding, every shard returns its results up to the end of the
+    slice, which are merged by rank.
+
+    Args:
+        stmt (Select): The statement built by `_search_statement`.
+        offset (int): The number of results skipped.
+        limit (int): The maximum number of results returned.
+
+    Returns:
+        list: The rows of the slice.
+
+    """
+    shards = shard_set()
+    if shards is None:
+        return db.session.execute(stmt.offset(offset).limit(limit)).all()
+    stmt = stmt.limit(offset + limit)
+    results = shards.map(lambda session: session.execute(stmt).all())
+    rows = merge_sorted(results, key=attrgetter("rank", "id"), limit=offset + limit)
+    return rows[offset:]
+
+
+@handle_db_errors
+def search_tasks(query, after=None, limit=None, version=None, **filters):
+    """Search task titles and descriptions.
+
+    Uses the SQLite FTS5 index ranked by BM25 where available and falls back
+    to substring matching otherwise. Ranked results cannot be keyset
+    paginated, so the cursor is the offset of the next page. Pages are cached
+    like `list_task_rows`. When sharding, the results of every shard are
+    merged by their rank on their own shard.
+
+    Args:
+        query (str): The search text; every word must match.
+        after (str): The cursor returned with the previous page, if any.
+        limit (int): The page size; clamped to ``TASKS_MAX_PER_PAGE``.
+        version (Row): The data version read by the caller, as for
+            `list_task_rows`.
+        **filters: The `list_tasks` filters.
+
+    Returns:
+        TaskPage: The requested page of rows with `TASK_COLUMNS` attributes.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded.
+
+    """
+    limit = _page_limit(limit)
+    terms = SEARCH_TERM.findall(query or "")
+    if not terms:
+        return TaskPage(limit=limit)
+    try:
+        offset = int(after) if after else 0
+    except ValueError:
+        raise InvalidCursorError(after) from None
+    if offset < 0:
+        raise InvalidCursorError(after)
+    key = _listing_key("search_tasks", version, terms, offset, limit, filters)
+    page = _cached_page(key)
+    if page is None:
+        stmt = _filter_tasks(_search_statement(terms), **filters)
+        rows = _search_rows(stmt, offset, limit + 1)
+        next_cursor = str(offset + limit) if len(rows) > limit else None
+        page = TaskPage(items=rows[:limit], next_cursor=next_cursor, limit=limit)
+        task_cache().set(key, page)
+    logger.debug("Tasks searched successfully.")
+    return page
+
+
+def iter_task_rows(batch_size=None, **filters):
+    """Stream every task matching the filters as plain column rows.
+
+    Rows are fetched ``batch_size`` at a time from a server-side cursor, so
+    memory use does not grow with the number of exported tasks. When
+    sharding, every shard is streamed at once and the rows are merged.
+
+    Args:
+        batch_size (int): The number of rows fetched per round trip; defaults
+            to ``EXPORT_BATCH_SIZE``.
+        **filters: The `list_tasks` filters.
+
+    Returns:
+        generator: Rows with `TASK_COLUMNS` attributes, ordered by id.
+
+    """
+    batch_size = batch_size or current_app.config["EXPORT_BATCH_SIZE"]
+    stmt = (
+        _filter_tasks(db.select(*TASK_COLUMNS), **filters)
+        .order_by(Task.id)
+        .execution_options(yield_per=batch_size)
+    )
+    shards = shard_set()
+    try:
+        if shards is None:
+            yield from db.session.execute(stmt)
+        else:
+            yield from shards.stream(stmt, key=attrgetter("id"))
+    except SQLAlchemyError:
+        db.session.rollback()
+        logger.exception("Database error occurred in iter_task_rows")
+        raise
+
+
+@handle_db_errors
+def get_task_row(task_id):
+    """Retrieve a single task as a plain column row.
+
+    Args:
+        task_id (int): The ID of the task.
+
+    Returns:
+        Row: The task row with `TASK_COLUMNS` attributes.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+
+    """
+    with _on_shard(_task_shard(task_id)):
+        row = db.session.execute(
+            db.select(*TASK_COLUMNS).where(
+                Task.id == task_id, Task.deleted_at.is_(None)
+            )
+        ).first()
+    if row is None:
+        raise TaskNotFoundError(task_id)
+    return row
+
+
+@handle_db_errors
+def tasks_due(after, until, limit):
+    """Return the open tasks following a position in due date order.
+
+    The query walks the ``(completed, due_date, id)`` index from the given
+    position, so its cost depends on the rows returned rather than on the
+    number of tasks.
+
+    Args:
+        after (tuple): The ``(due_date, id)`` of the last task already read;
+            an id of None skips every task due at that date.
+        until (datetime): Only return tasks due on or before this time.
+        limit (int): The maximum number of rows.
+
+    Returns:
+        list: Rows with `TASK_COLUMNS` attributes, ordered by due date and id.
+
+    """
+    after_due, after_id = after
+    stmt = _filter_tasks(db.select(*TASK_COLUMNS), completed=False, due_to=until)
+    if after_id is None:
+        stmt = stmt.where(Task.due_date > after_due)
+    else:
+        stmt = stmt.where(
+            Task.due_date >= after_due,
+            or_(
+                Task.due_date > after_due,
+                and_(Task.due_date == after_due, Task.id > after_id),
+            ),
+        )
+    stmt = stmt.order_by(Task.due_date, Task.id).limit(limit)
+    return db.session.execute(stmt).all()
+
+
+@handle_db_errors
+def open_task_rows(task_ids):
+    """Return the tasks among the given ids that are still open.
+
+    Args:
+        task_ids (list): The ids of the tasks.
+
+    Returns:
+        list: Rows with `TASK_COLUMNS` attributes of the tasks that are
+            neither completed nor deleted, in no particular order.
+
+    """
+    stmt = _filter_tasks(db.select(*TASK_COLUMNS), completed=False)
+    rows = []
+    for chunk in _chunks(list(dict.fromkeys(task_ids))):
+        rows.extend(db.session.execute(stmt.where(Task.id.in_(chunk))).all())
+    return rows
+
+
+def _compare_and_swap(task_id, expected_version, **values):
+    """Build the UPDATE applying a change to a task that is still current.
+
+    The statement only matches the task while it is not deleted and, if
+    given, still at the expected version, and bumps the version in the same
+    statement. Concurrent writers therefore never overwrite each other's
+    change: the database applies the first one and the others match nothing.
+
+    Args:
+        task_id (int): The ID of the task.
+        expected_version (int): The version the change is based on, or None
+            to accept any version.
+        **values: The new column values.
+
+    Returns:
+        Update: The statement, returning the updated Task.
+
+    """
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.deleted_at.is_(None))
+        .values(version=Task.version + 1, **values)
+        .returning(Task)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(Task.version == expected_version)
+    return stmt
+
+
+def _complete_statement(task_id, expected_version=None):
+    """Build the compare-and-swap UPDATE completing an open task.
+
+    Args:
+        task_id (int): The ID of the task.
+        expected_version (int): See `_compare_and_swap`.
+
+    Returns:
+        Update: The statement, returning the completed Task.
+
+    """
+    return _compare_and_swap(
+        task_id, expected_version, completed=True, completed_at=_utcnow()
+    ).where(Task.completed.is_(False))
+
+
+def _delete_statement(task_id, expected_version=None):
+    """Build the compare-and-swap UPDATE soft-deleting a task.
+
+    Args:
+        task_id (int): The ID of the task.
+        expected_version (int): See `_compare_and_swap`.
+
+    Returns:
+        Update: The statement, returning the deleted Task.
+
+    """
+    return _compare_and_swap(task_id, expected_version, deleted_at=_utcnow())
+
+
+def _check_unchanged(task, task_id, expected_version, action):
+    """Find out why a compare-and-swap UPDATE did not match a task.
+
+    Args:
+        task (Task): The task as currently stored, or None.
+        task_id (int): The ID of the task.
+        expected_version (int): The version the change was based on, or None.
+        action (str): The attempted change, for the log messages.
+
+    Returns:
+        None
+
+    Raises:
+        TaskNotFoundError: If the task does not exist or has been deleted.
+        TaskConflictError: If the task is not at the expected version.
+
+    """
+    if not task or task.deleted_at is not None:
+        logger.warning("Attempt to %s non-existent task: %s", action, task_id)
+        raise TaskNotFoundError(task_id)
+    if expected_version is not None and task.version != expected_version:
+        logger.warning(
+            "Attempt to %s task %s at version %s, found version %s.",
+            action,
+            task_id,
+            expected_version,
+            task.version,
+        )
+        raise TaskConflictError(task_id, expected_version, task.version)
+
+
+def _next_instance(task):
+    """Describe the instance following a recurring task being completed.
+
+    Args:
+        task (Task): The completed task, or a row with its columns.
+
+    Returns:
+        dict: The ``title``, ``description``, ``due_date`` and
+            ``recurrence`` of the next instance, or None if the task does
+            not recur or its series has ended.
+
+    """
+    if task.recurrence is None or task.due_date is None:
+        return None
+    following = next_occurrence(task.recurrence, task.due_date)
+    if following is None:
+        return None
+    due_date, recurrence = following
+    return {
+        "title": task.title,
+        "description": task.description,
+        "due_date": due_date,
+        "recurrence": recurrence,
+    }
+
+
+def stage_task_completion(session, task_id, expected_version=None):
+    """Complete a task and log it, without committing.
+
+    See `stage_task_creation`; the next instance of a recurring task is
+    inserted as well.
+
+    Args:
+        session (Session): The session modifying tasks.
+        task_id (int): The ID of the task to be completed.
+        expected_version (int): See `complete_task`.
+
+    Returns:
+        Task: The completed task object.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+        TaskConflictError: If the task is not at the expected version.
+
+    """
+    task = session.scalars(_complete_statement(task_id, expected_version)).first()
+    if task is None:
+        task = session.get(Task, task_id, populate_existing=True)
+        _check_unchanged(task, task_id, expected_version, "complete")
+        logger.warning("Attempt to complete already completed task: %s", task_id)
+        return task
+    _log_change(task.id, "completed", session)
+    _update_stats(
+        session,
+        open_tasks=-1,
+        completed_tasks=1,
+        due_days=_due_days([task.due_date], -1),
+    )
+    logger.info("Task '%s' marked as complete.", task.title)
+    following = _next_instance(task)
+    if following is not None:
+        stage_task_creation(session, **following)
+    return task
+
+
+@handle_db_errors
+def complete_task(task_id, expected_version=None, wait=True):
+    """Mark a task as completed.
+
+    The task is completed by a single conditional UPDATE, so concurrent
+    calls neither race nor fail: one completes the task and the others find
+    it completed already.
+    Completing an instance of a recurring task stores the next one, in the
+    same transaction.
+
+    Args:
+        task_id (int): The ID of the task to be completed.
+        expected_version (int): Only complete the task if it is still at this
+            version; by default any version is accepted.
+        wait (bool): Whether to wait for the change to be committed.
+
+    Returns:
+        Task: The completed task object, or a Future of it if ``wait`` is
+            False.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+        TaskConflictError: If the task is not at the expected version.
+
+    """
+    return _write(
+        stage_task_completion,
+        (db.session, task_id, expected_version),
+        wait,
+        _task_shard(task_id),
+    )
+
+
+def stage_task_deletion(session, task_id, expected_version=None):
+    """Soft-delete a task and log it, without committing.
+
+    See `stage_task_creation`.
+
+    Args:
+        session (Session): The session modifying tasks.
+        task_id (int): The ID of the task to be deleted.
+        expected_version (int): See `delete_task`.
+
+    Returns:
+        Task: The deleted task object.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+        TaskConflictError: If the task is not at the expected version.
+
+    """
+    task = session.scalars(_delete_statement(task_id, expected_version)).first()
+    if task is None:
+        task = session.get(Task, task_id, populate_existing=True)
+        _check_unchanged(task, task_id, expected_version, "delete")
+        # Deleted between the UPDATE and the read above.
+        raise TaskNotFoundError(task_id)
+    _log_change(task.id, "deleted", session)
+    _update_stats(session, **_removed_tasks([task]))
+    logger.info("Task '%s' deleted successfully.", task.title)
+    return task
+
+
+@handle_db_errors
+def delete_task(task_id, expected_version=None, wait=True):
+    """Soft-delete a task; the compaction job purges it later.
+
+    Like `complete_task`, the task is deleted by a single conditional
+    UPDATE: of concurrent calls, one deletes it and the others get a
+    TaskNotFoundError.
+
+    Args:
+        task_id (int): The ID of the task to be deleted.
+        expected_version (int): Only delete the task if it is still at this
+            version; by default any version is accepted.
+        wait (bool): Whether to wait for the deletion to be committed.
+
+    Returns:
+        Task: The deleted task object, or a Future of it if ``wait`` is False.
+
+    Raises:
+        TaskNotFoundError: If the task with the given ID is not found.
+        TaskConflictError: If the task is not at the expected version.
+
+    """
+    return _write(
+        stage_task_deletion,
+        (db.session, task_id, expected_version),
+        wait,
+        _task_shard(task_id),
+    )
+
+
+def _chunks(items, size=BULK_CHUNK_SIZE):
+    """Split a list into consecutive chunks.
+
+    Args:
+        items (list): The list to split.
+        size (int): The maximum chunk size.
+
+    Returns:
+        generator: Lists of at most ``size`` items.
+
+    """
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _bulk_by_ids(stmt, task_ids):
+    """Run a set-based UPDATE over task ids and report missing ids.
+
+    Soft-deleted tasks are reported as missing.
+
+    Args:
+        stmt (Update): An UPDATE statement on tasks.
+        task_ids (list): The ids of the targeted tasks.
+
+    Returns:
+        tuple: The `BulkResult` with the matched and missing ids, in request
+            order, and the updated rows with ``id``, ``title``,
+            ``description``, ``completed``, ``due_date`` and ``recurrence``
+            attributes.
+
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    rows = []
+    for chunk in _chunks(task_ids):
+        rows.extend(
+            db.session.execute(
+                stmt.where(Task.id.in_(chunk), Task.deleted_at.is_(None))
+                .returning(
+                    Task.id,
+                    Task.title,
+                    Task.description,
+                    Task.completed,
+                    Task.due_date,
+                    Task.recurrence,
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+        )
+    found = {row.id for row in rows}
+    result = BulkResult(
+        succeeded=[task_id for task_id in task_ids if task_id in found],
+        not_found=[task_id for task_id in task_ids if task_id not in found],
+    )
+    return result, rows
+
+
+def _new_task_row(task):
+    """Build the column values of a task inserted in bulk.
+
+    Args:
+        task (dict): The ``title``, ``description``, ``due_date`` and
+            optional ``recurrence`` of the task.
+
+    Returns:
+        dict: The column values.
+
+    Raises:
+        ValueError: If the recurrence rule is invalid or has no due date.
+
+    """
+    recurrence = task.get("recurrence")
+    if recurrence:
+        recurrence = normalize_rule(recurrence, task.get("due_date"))
+    return {
+        "title": task["title"],
+        "description": task.get("description"),
+        "due_date": task.get("due_date"),
+        "recurrence": recurrence or None,
+        "completed": False,
+    }
+
+
+def _with_shard_ids(rows):
+    """Give tasks inserted in bulk ids from the range of their shard.
+
+    The ids follow the highest one of the shard, read in the inserting
+    transaction; a concurrent insert makes one of the transactions fail
+    rather than reuse an id.
+
+    Args:
+        rows (list): The column values of the tasks, see `_new_task_row`.
+
+    Returns:
+        list: The rows, with an ``id`` when sharding.
+
+    """
+    next_id = new_task_id()
+    if next_id is None:
+        return rows
+    first = db.session.scalar(db.select(next_id))
+    return [dict(row, id=first + offset) for offset, row in enumerate(rows)]
+
+
+def _insert_tasks(rows):
+    """Insert tasks with a single multi-row INSERT in the current transaction.
+
+    Args:
+        rows (list): The column values of the tasks, see `_new_task_row`.
+
+    Returns:
+        list: The ids of the inserted tasks, in input order.
+
+    """
+    rows = _with_shard_ids(rows)
+    task_ids = db.session.scalars(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+    ).all()
+    _update_stats(
+        open_tasks=len(rows),
+        due_days=_due_days((row["due_date"] for row in rows), 1),
+    )
+    return task_ids
+
+
+@handle_db_errors
+def create_tasks(tasks, shard_key=None):
+    """Create many tasks with a single multi-row INSERT in one transaction.
+
+    Args:
+        tasks (list): Dictionaries with ``title``, ``description``,
+            ``due_date`` and optional ``recurrence`` keys.
+        shard_key (object): When sharding, the owner or project whose shard
+            the tasks are stored in, as for `create_task`; the tasks of one
+            call always share a shard.
+
+    Returns:
+        list: The ids of the created tasks, in input order.
+
+    Raises:
+        ValueError: If a recurrence rule is invalid or has no due date.
+
+    """
+    rows = [_new_task_row(task) for task in tasks]
+    if not rows:
+        return []
+    shards = shard_set()
+    with _on_shard(None if shards is None else shards.shard_for_key(shard_key)):
+        task_ids = _insert_tasks(rows)
+        _log_change(None, "reset")
+        _commit()
+    logger.info("%d tasks created successfully.", len(task_ids))
+    return list(task_ids)
+
+
+def _insert_batch(rows, shards=None, shard_key=None):
+    """Insert and commit one batch of imported tasks.
+
+    Args:
+        rows (list): The task rows.
+        shards (ShardSet): The shards, or None if sharding is disabled.
+        shard_key (object): The shard key of the tasks, if any.
+
+    Returns:
+        None
+
+    """
+    with _on_shard(None if shards is None else shards.shard_for_key(shard_key)):
+        rows = _with_shard_ids(rows)
+        db.session.execute(insert(Task.__table__), rows)
+        _update_stats(
+            open_tasks=len(rows),
+            due_days=_due_days((row["due_date"] for row in rows), 1),
+        )
+        _log_change(None, "reset")
+        _touch()
+        db.session.commit()
+
+
+@handle_db_errors
+def import_tasks(tasks, batch_size=None, shard_key=None):
+    """Insert tasks from an iterable in executemany batches.
+
+    Each batch is committed on its own, so a failure only rolls back the
+    batch being inserted. Batches go through a Core insert, which skips the
+    ORM bulk insert bookkeeping.
+
+    Args:
+        tasks (iterable): Dictionaries with ``title``, ``description``,
+            ``due_date`` and optional ``recurrence`` keys; consumed lazily.
+        batch_size (int): The number of rows per batch; defaults to
+            ``IMPORT_BATCH_SIZE``.
+        shard_key (object): When sharding, the owner or project whose shard
+            the tasks are stored in; batches go to every shard in turn
+            without.
+
+    Returns:
+        int: The number of imported tasks.
+
+    """
+    batch_size = batch_size or current_app.config["IMPORT_BATCH_SIZE"]
+    shards = shard_set()
+    count = 0
+    batch = []
+    try:
+        for task in tasks:
+            batch.append(_new_task_row(task))
+            if len(batch) == batch_size:
+                _insert_batch(batch, shards, shard_key)
+                count += len(batch)
+                batch = []
+        if batch:
+            _insert_batch(batch, shards, shard_key)
+            count += len(batch)
+    finally:
+        if count:
+            _after_commit()
+    logger.info("%d tasks imported successfully.", count)
+    return count
+
+
+@handle_db_errors
+def complete_tasks(task_ids):
+    """Mark many tasks as completed with set-based UPDATE statements.
+
+    Tasks that are already completed are reported as succeeded, like
+    `complete_task` does for a single task, and recurring tasks are followed
+    by their next instance.
+
+    Args:
+        task_ids (list): The ids of the tasks to be completed.
+
+    Returns:
+        BulkResult: The completed ids and the ids that were not found.
+
+    """
+    result = _by_shard(_complete_tasks, task_ids)
+    logger.info("%d tasks marked as complete.", len(result.succeeded))
+    if result.not_found:
+        logger.warning("Attempt to complete non-existent tasks: %s", result.not_found)
+    return result
+
+
+def _complete_tasks(task_ids):
+    """Complete and commit the tasks of `complete_tasks` on one database.
+
+    Args:
+        task_ids (list): The distinct ids of the tasks to be completed.
+
+    Returns:
+        BulkResult: The completed ids and the ids that were not found.
+
+    """
+    stmt = (
+        update(Task)
+        .where(Task.completed.is_(False))
+        .values(completed=True, completed_at=_utcnow(), version=Task.version + 1)
+    )
+    result, rows = _bulk_by_ids(stmt, task_ids)
+    _update_stats(
+        open_tasks=-len(rows),
+        completed_tasks=len(rows),
+        due_days=_due_days((row.due_date for row in rows), -1),
+    )
+    following = [_next_instance(row) for row in rows]
+    following = [_new_task_row(task) for task in following if task is not None]
+    if following:
+        _insert_tasks(following)
+    # Tasks completed before are not updated but count as succeeded.
+    completed_before = set()
+    for chunk in _chunks(result.not_found):
+        completed_before.update(
+            db.session.scalars(
+                db.select(Task.id).where(Task.id.in_(chunk), Task.deleted_at.is_(None))
+            )
+        )
+    if completed_before:
+        missing = set(result.not_found) - completed_before
+        result = BulkResult(
+            succeeded=[task_id for task_id in task_ids if task_id not in missing],
+            not_found=[task_id for task_id in result.not_found if task_id in missing],
+        )
+    _log_change(None, "reset")
+    _commit()
+    return result
+
+
+@handle_db_errors
+def delete_tasks(task_ids=None, **filters):
+    """Soft-delete many tasks, either by id or by listing filters.
+
+    Args:
+        task_ids (list): The ids of the tasks to be deleted.
+        **filters: The `list_tasks` filters selecting the tasks to be deleted
+            when no ids are given.
+
+    Returns:
+        BulkResult: The deleted ids and the ids that were not found.
+
+    Raises:
+        ValueError: If neither ids nor filters are given.
+
+    """
+    if task_ids is not None:
+        result = _by_shard(_delete_tasks, task_ids)
+    elif any(value is not None for value in filters.values()):
+        succeeded = []
+        for shard in _shard_numbers():
+            with _on_shard(shard):
+                succeeded.extend(_delete_tasks(**filters).succeeded)
+        result = BulkResult(succeeded=succeeded)
+    else:
+        raise ValueError("Refusing to delete tasks without ids or filters.")
+    logger.info("%d tasks deleted successfully.", len(result.succeeded))
+    if result.not_found:
+        logger.warning("Attempt to delete non-existent tasks: %s", result.not_found)
+    return result
+
+
+def _delete_tasks(task_ids=None, **filters):
+    """Soft-delete and commit the tasks of `delete_tasks` on one database.
+
+    Args:
+        task_ids (list): The distinct ids of the tasks to be deleted.
+        **filters: The filters selecting the tasks when no ids are given.
+
+    Returns:
+        BulkResult: The deleted ids and the ids that were not found.
+
+    """
+    stmt = update(Task).values(deleted_at=_utcnow(), version=Task.version + 1)
+    if task_ids is not None:
+        result, rows = _bulk_by_ids(stmt, task_ids)
+    else:
+        stmt = _filter_tasks(stmt, **filters).returning(
+            Task.id, Task.completed, Task.due_date
+        )
+        rows = db.session.execute(
+            stmt.execution_options(synchronize_session=False)
+        ).all()
+        result = BulkResult(succeeded=[row.id for row in rows])
+    _update_stats(**_removed_tasks(rows))
+    _log_change(None, "reset")
+    _commit()
+    return result
+
+
+def _age_cutoff(days, setting):
+    """Return the time before which rows are old enough for compaction.
+
+    Args:
+        days (float): The minimum age in days, or None for the setting.
+        setting (str): The configuration key of the default age.
+
+    Returns:
+        datetime: The cutoff, in naive UTC.
+
+    """
+    if days is None:
+        days = current_app.config[setting]
+    return _utcnow() - timedelta(days=days)
+
+
+@handle_db_errors
+def archive_completed_tasks(older_than_days=None, batch_size=None):
+    """Move tasks completed before a cutoff to the archive table.
+
+    Each batch is copied with INSERT ... SELECT and deleted in its own
+    transaction, so the tasks table only keeps the hot set read by listings.
+
+    Args:
+        older_than_days (float): The minimum age of the completion; defaults
+            to ``TASK_ARCHIVE_AFTER_DAYS``.
+        batch_size (int): The number of tasks per transaction; defaults to
+            ``COMPACTION_BATCH_SIZE``.
+
+    Returns:
+        int: The number of archived tasks.
+
+    """
+    batch_size = batch_size or current_app.config["COMPACTION_BATCH_SIZE"]
+    cutoff = _age_cutoff(older_than_days, "TASK_ARCHIVE_AFTER_DAYS")
+    candidates = (
+        db.select(Task.id)
+        .where(Task.completed_at < cutoff, Task.deleted_at.is_(None))
+        .order_by(Task.completed_at)
+        .limit(batch_size)
+    )
+    archived_columns = (
+        Task.id,
+        Task.title,
+        Task.description,
+        Task.due_date,
+        Task.completed_at,
+        literal(_utcnow()),
+    )
+    count = 0
+    try:
+        while task_ids := db.session.scalars(candidates).all():
+            db.session.execute(
+                insert(ArchivedTask).from_select(
+                    [
+                        "task_id",
+                        "title",
+                        "description",
+                        "due_date",
+                        "completed_at",
+                        "archived_at",
+                    ],
+                    db.select(*archived_columns).where(Task.id.in_(task_ids)),
+                )
+            )
+            db.session.execute(delete(Task).where(Task.id.in_(task_ids)))
+            _update_stats(completed_tasks=-len(task_ids))
+            _log_change(None, "reset")
+            _touch()
+            db.session.commit()
+            count += len(task_ids)
+            if len(task_ids) < batch_size:
+                break
+    finally:
+        if count:
+            _after_commit()
+    logger.info("%d completed tasks archived.", count)
+    return count
+
+
+@handle_db_errors
+def purge_deleted_tasks(older_than_days=None, batch_size=None):
+    """Permanently delete the tasks soft-deleted before a cutoff.
+
+    Soft-deleted tasks are invisible already, so purging them does not
+    change the data version.
+
+    Args:
+        older_than_days (float): The minimum age of the deletion; defaults to
+            ``TASK_PURGE_AFTER_DAYS``.
+        batch_size (int): The number of tasks per transaction; defaults to
+            ``COMPACTION_BATCH_SIZE``.
+
+    Returns:
+        int: The number of purged tasks.
+
+    """
+    batch_size = batch_size or current_app.config["COMPACTION_BATCH_SIZE"]
+    cutoff = _age_cutoff(older_than_days, "TASK_PURGE_AFTER_DAYS")
+    candidates = db.select(Task.id).where(Task.deleted_at < cutoff).limit(batch_size)
+    count = 0
+    while task_ids := db.session.scalars(candidates).all():
+        db.session.execute(delete(Task).where(Task.id.in_(task_ids)))
+        db.session.commit()
+        count += len(task_ids)
+        if len(task_ids) < batch_size:
+            break
+    logger.info("%d deleted tasks purged.", count)
+    return count
+
+
+def compact_tasks(archive_after_days=None, purge_after_days=None, batch_size=None):
+    """Purge soft-deleted tasks and archive old completed tasks.
+
+    Args:
+        archive_after_days (float): See `archive_completed_tasks`.
+        purge_after_days (float): See `purge_deleted_tasks`.
+        batch_size (int): The number of tasks per transaction.
+
+    Returns:
+        dict: The number of ``purged`` and ``archived`` tasks, over every
+            shard when sharding.
+
+    """
+    result = {"purged": 0, "archived": 0}
+    for shard in _shard_numbers():
+        with _on_shard(shard):
+            result["purged"] += purge_deleted_tasks(purge_after_days, batch_size)
+            result["archived"] += archive_completed_tasks(
+                archive_after_days, batch_size
+            )
+    return result
+
+
+@handle_db_errors
+def changes_since(after_id, limit=None):
+    """Return the logged task changes following an event id.
+
+    Each change comes with the current state of its task, whose columns are
+    None once the task has been deleted.
+
+    Args:
+        after_id (int): The id of the last change already seen.
+        limit (int): The maximum number of changes; unlimited by default.
+
+    Returns:
+        list: Rows of the ``change_id``, the ``kind`` and the task columns,
+            with the task id as ``id``, oldest first.
+
+    """
+    stmt = (
+        db.select(
+            TaskChange.id.label("change_id"),
+            TaskChange.kind,
+            TaskChange.task_id.label("id"),
+            Task.title,
+            Task.description,
+            Task.due_date,
+            Task.completed,
+            Task.recurrence,
+        )
+        .outerjoin(Task, and_(Task.id == TaskChange.task_id, Task.deleted_at.is_(None)))
+        .where(TaskChange.id > after_id)
+        .order_by(TaskChange.id)
+        .limit(limit)
+    )
+    return db.session.execute(stmt).all()
+
+
+@handle_db_errors
+def change_log_bounds():
+    """Return the ids of the oldest and newest logged task changes.
+
+    Returns:
+        Row: The ``first`` and ``last`` change ids, None if the log is empty.
+
+    """
+    return db.session.execute(
+        db.select(
+            func.min(TaskChange.id).label("first"),
+            func.max(TaskChange.id).label("last"),
+        )
+    ).one()
+
+
+@handle_db_errors
+def prune_changes(keep=None):
+    """Delete the oldest task changes, keeping the most recent ones.
+
+    Clients resuming from a pruned event id are told to reload instead.
+
+    Args:
+        keep (int): The number of changes to keep; defaults to
+            ``CHANGE_LOG_RETENTION``.
+
+    Returns:
+        int: The number of deleted changes.
+
+    """
+    keep = max(keep or current_app.config["CHANGE_LOG_RETENTION"], 1)
+    last = change_log_bounds().last
+    if last is None:
+        return 0
+    deleted = db.session.execute(
+        delete(TaskChange).where(TaskChange.id <= last - keep)
+    ).rowcount
+    db.session.commit()
+    return deleted
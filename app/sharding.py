@@ -0,0 +1,226 @@
+import heapq
+import itertools
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+
+from flask import current_app
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+from app.config import extra_engine_options, sqlite_pragmas_listener
+from app.models import Task, db
+
+# Shard n holds the task ids from (n << SHARD_ID_BITS) + 1 up to, but not
+# including, (n + 1) << SHARD_ID_BITS, so a task id tells its shard.
+SHARD_ID_BITS = 40
+
+
+class ShardSet:
+    """The databases tasks are partitioned across.
+
+    Shard 0 is the application database; the others hold the same schema.
+    """
+
+    def __init__(self, engines):
+        """Initialize the shard set.
+
+        Args:
+            engines (list): The engine of every shard, by shard number.
+
+        Returns:
+            None
+
+        """
+        self.engines = engines
+        self._counter = itertools.count()
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(engines), thread_name_prefix="shard"
+        )
+
+    def __len__(self):
+        """Return the number of shards.
+
+        Returns:
+            int: The number of shards.
+
+        """
+        return len(self.engines)
+
+    def shard_for_key(self, shard_key=None):
+        """Pick the shard of a new task.
+
+        Args:
+            shard_key (object): The owner or project the task belongs to, if
+                any; tasks sharing a key share a shard.
+
+        Returns:
+            int: The shard number, the next one in turn without a key.
+
+        """
+        if shard_key is None:
+            return next(self._counter) % len(self.engines)
+        return zlib.crc32(str(shard_key).encode()) % len(self.engines)
+
+    def shard_for_id(self, task_id):
+        """Return the shard holding a task.
+
+        Args:
+            task_id (int): The ID of the task.
+
+        Returns:
+            int: The shard number, or None if no shard holds that id.
+
+        """
+        number = task_id >> SHARD_ID_BITS
+        return number if 0 <= number < len(self.engines) else None
+
+    def map(self, function):
+        """Call a function with a session on every shard, in parallel.
+
+        Args:
+            function (function): Called with a `Session` bound to a shard.
+
+        Returns:
+            list: The results, by shard number.
+
+        """
+
+        def call(engine):
+            with Session(engine) as session:
+                return function(session)
+
+        return list(self._executor.map(call, self.engines))
+
+    def stream(self, stmt, key):
+        """Stream the sorted rows of a statement from every shard, merged.
+
+        Every shard keeps its own cursor open, so the rows are read as the
+        merged stream is consumed.
+
+        Args:
+            stmt (Select): The statement, ordered by ``key``.
+            key (function): The sort key of the rows.
+
+        Yields:
+            Row: The rows of every shard, sorted.
+
+        """
+        with ExitStack() as stack:
+            sessions = [stack.enter_context(Session(engine)) for engine in self.engines]
+            yield from heapq.merge(
+                *(session.execute(stmt) for session in sessions), key=key
+            )
+
+    def dispose(self):
+        """Stop the fan-out threads and close the connections of the shards.
+
+        Shard 0 is the application engine, which Flask-SQLAlchemy disposes.
+
+        Returns:
+            None
+
+        """
+        self._executor.shutdown()
+        for engine in self.engines[1:]:
+            engine.dispose()
+
+
+def shard_set():
+    """Return the shards of the current application.
+
+    Returns:
+        ShardSet: The shards, or None if sharding is disabled.
+
+    """
+    return current_app.extensions.get("shards")
+
+
+@contextmanager
+def use_shard(number):
+    """Run the statements of ``db.session`` on one shard.
+
+    Args:
+        number (int): The shard number.
+
+    Yields:
+        None
+
+    """
+    info = db.session.info
+    previous = info.get("shard")
+    info["shard"] = number
+    try:
+        yield
+    finally:
+        info["shard"] = previous
+
+
+def new_task_id(session=None):
+    """Build the id of a task inserted in the shard a session is on.
+
+    Args:
+        session (Session): The session inserting the task; ``db.session``
+            by default.
+
+    Returns:
+        ScalarSelect: The next free id of the shard's range, computed by the
+            INSERT itself, or None when sharding is disabled.
+
+    """
+    session = db.session if session is None else session
+    number = session.info.get("shard")
+    if number is None:
+        return None
+    low = number << SHARD_ID_BITS
+    high = (number + 1) << SHARD_ID_BITS
+    return (
+        select(func.coalesce(func.max(Task.id), low) + 1)
+        .where(Task.id > low, Task.id < high)
+        .scalar_subquery()
+    )
+
+
+def merge_sorted(results, key, limit):
+    """Merge the sorted results of every shard.
+
+    Args:
+        results (list): The sorted results of each shard.
+        key (function): The sort key.
+        limit (int): The maximum number of items returned.
+
+    Returns:
+        list: Up to ``limit`` items, sorted.
+
+    """
+    return list(itertools.islice(heapq.merge(*results, key=key), limit))
+
+
+def init_sharding(app):
+    """Partition tasks across the configured shard databases.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    Raises:
+        RuntimeError: If write-behind or the async API is enabled as well.
+
+    """
+    options = extra_engine_options(app.config, "SQLALCHEMY_SHARD_URIS")
+    if not options:
+        return
+    if app.config["WRITE_BEHIND_ENABLED"]:
+        raise RuntimeError("Sharding does not support write-behind.")
+    if app.config["ASYNC_API_ENABLED"]:
+        # The async sessions are bound to the application database only.
+        raise RuntimeError("Sharding does not support the async API.")
+    listener = sqlite_pragmas_listener(app.config)
+    engines = [create_engine(uri, **engine_options) for uri, engine_options in options]
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", listener)
+    with app.app_context():
+        app.extensions["shards"] = ShardSet([db.engine, *engines])
@@ -0,0 +1,29 @@
+from jinja2 import FileSystemBytecodeCache
+
+
+def init_templates(app):
+    """Set up the Jinja bytecode cache and preload the application templates.
+
+    Compiled templates are stored in ``TEMPLATE_BYTECODE_CACHE_DIR``, or in a
+    per-user temporary directory if unset, so that new worker processes load
+    them instead of compiling the template sources again. Preloading moves
+    that work from the first request of a worker to application start-up.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    if app.config["TEMPLATE_BYTECODE_CACHE"]:
+        # Must be set before the Jinja environment is first used.
+        app.jinja_options = {
+            **app.jinja_options,
+            "bytecode_cache": FileSystemBytecodeCache(
+                app.config["TEMPLATE_BYTECODE_CACHE_DIR"]
+            ),
+        }
+    if app.config["TEMPLATE_PRELOAD"]:
+        for name in app.jinja_loader.list_templates():
+            app.jinja_env.get_template(name)
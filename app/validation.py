@@ -0,0 +1,141 @@
+from datetime import date, datetime
+
+from app.recurrence import normalize_rule
+
+TITLE_MAX_LENGTH = 100
+DESCRIPTION_MAX_LENGTH = 300
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class TaskValidationError(ValueError):
+    """Custom exception raised when task data fails validation."""
+
+    def __init__(self, errors):
+        """Initialize the exception with the validation errors.
+
+        Args:
+            errors (dict): Error messages keyed by field name.
+
+        Returns:
+            None
+
+        """
+        self.errors = errors
+        self.message = f"Invalid task data: {errors}."
+        super().__init__(self.message)
+
+
+def _clean_text(value, max_length, errors, field):
+    """Validate a required text field.
+
+    Args:
+        value (str): The raw value.
+        max_length (int): The maximum allowed length.
+        errors (dict): The error messages collected so far.
+        field (str): The field name.
+
+    Returns:
+        str: The value if it is valid, otherwise None.
+
+    """
+    if not isinstance(value, str) or not value.strip():
+        errors[field] = ["This field is required."]
+    elif len(value) > max_length:
+        errors[field] = [f"Field cannot be longer than {max_length} characters."]
+    else:
+        return value
+    return None
+
+
+def _clean_date(value, errors, field):
+    """Validate an optional date field.
+
+    Besides ``YYYY-MM-DD`` dates, naive ISO datetimes such as
+    ``2030-01-02T09:30:00`` are accepted, as written by the task exports.
+
+    Args:
+        value (str): The raw value, a date, or None.
+        errors (dict): The error messages collected so far.
+        field (str): The field name.
+
+    Returns:
+        date: The parsed date or datetime, or None if empty or invalid.
+
+    """
+    if value in (None, ""):
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(value, DATE_FORMAT).date()
+    except (TypeError, ValueError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        parsed = None
+    if parsed is None or parsed.tzinfo is not None:
+        errors[field] = ["Not a valid date value."]
+        return None
+    return parsed
+
+
+def _clean_recurrence(value, due_date, errors, field):
+    """Validate an optional recurrence rule.
+
+    Args:
+        value (str): The raw RRULE value, or None.
+        due_date (date): The cleaned due date the rule starts at.
+        errors (dict): The error messages collected so far.
+        field (str): The field name.
+
+    Returns:
+        str: The normalized rule, or None if empty or invalid.
+
+    """
+    if value in (None, ""):
+        return None
+    if not isinstance(value, str):
+        errors[field] = ["Not a valid recurrence rule."]
+    elif due_date is None:
+        errors[field] = ["Recurring tasks need a due date."]
+    else:
+        try:
+            return normalize_rule(value, due_date)
+        except ValueError:
+            errors[field] = ["Not a valid recurrence rule."]
+    return None
+
+
+def clean_task_data(data):
+    """Validate raw task data with the same rules as `app.forms.TaskForm`.
+
+    This is a lightweight alternative to instantiating the form for every row
+    of bulk and API input.
+
+    Args:
+        data (dict): The raw ``title``, ``description``, ``due_date`` and
+            optional ``recurrence`` values.
+
+    Returns:
+        dict: The cleaned ``title``, ``description``, ``due_date`` and
+            ``recurrence`` values.
+
+    Raises:
+        TaskValidationError: If any field is invalid.
+
+    """
+    errors = {}
+    cleaned = {
+        "title": _clean_text(data.get("title"), TITLE_MAX_LENGTH, errors, "title"),
+        "description": _clean_text(
+            data.get("description"), DESCRIPTION_MAX_LENGTH, errors, "description"
+        ),
+        "due_date": _clean_date(data.get("due_date"), errors, "due_date"),
+    }
+    cleaned["recurrence"] = _clean_recurrence(
+        data.get("recurrence"), cleaned["due_date"], errors, "recurrence"
+    )
+    if errors:
+        raise TaskValidationError(errors)
+    return cleaned
@@ -0,0 +1,195 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from flask import current_app
+
+from app.metrics import record_write_batch
+from app.models import db
+from app.services import _after_commit, _touch
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Background writer grouping queued mutations into shared transactions.
+
+    Operations are functions working on ``db.session`` without committing.
+    The writer thread runs up to ``max_batch`` of them, collected for at most
+    ``interval`` seconds after the first one, and commits them together, so
+    that a burst of writes pays for a single commit. If an operation fails,
+    the batch is rolled back and its operations are replayed one transaction
+    each, so that only the failing operation reports an error.
+    """
+
+    def __init__(self, app, interval, max_batch, before_commit=None, after_commit=None):
+        """Initialize the queue; the writer thread starts on first use.
+
+        Args:
+            app (Flask): The application whose database is written to.
+            interval (float): How long to collect operations, in seconds.
+            max_batch (int): The maximum number of operations per transaction.
+            before_commit (function): Called without arguments before every
+                commit, in the transaction being committed.
+            after_commit (function): Called without arguments after every
+                commit, in an application context.
+
+        Returns:
+            None
+
+        """
+        self.app = app
+        self.interval = interval
+        self.max_batch = max_batch
+        self.before_commit = before_commit
+        self.after_commit = after_commit
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, operation, *args):
+        """Queue an operation.
+
+        Args:
+            operation (function): Called with ``args`` in the writer thread.
+            *args: The operation arguments.
+
+        Returns:
+            Future: Resolved with the operation result once committed.
+
+        Raises:
+            RuntimeError: If the queue has been closed.
+
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The write queue is closed.")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="write-behind", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((future, operation, args))
+        return future
+
+    def close(self):
+        """Write every queued operation and stop the writer thread.
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _collect(self, first):
+        """Collect a batch of queued operations.
+
+        Args:
+            first (tuple): The operation that started the batch.
+
+        Returns:
+            tuple: The batch and whether the queue was closed meanwhile.
+
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopped = self._collect(item)
+            batch = [
+                entry for entry in batch if entry[0].set_running_or_notify_cancel()
+            ]
+            if batch:
+                with self.app.app_context():
+                    self._write(batch)
+
+    def _write(self, batch):
+        """Run a batch of operations in one transaction.
+
+        Args:
+            batch (list): ``(future, operation, args)`` tuples.
+
+        Returns:
+            None
+
+        """
+        start = time.perf_counter()
+        try:
+            results = [operation(*args) for _, operation, args in batch]
+            self._commit()
+        except Exception as exc:
+            db.session.rollback()
+            if len(batch) == 1:
+                batch[0][0].set_exception(exc)
+                return
+            current_app.logger.warning(
+                "Write batch failed, replaying its operations one by one."
+            )
+            for entry in batch:
+                self._write([entry])
+            return
+        finally:
+            record_write_batch(len(batch), time.perf_counter() - start)
+        for (future, _, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _commit(self):
+        # Detach the loaded objects first, so that callers in other threads
+        # can read them without going back to the database.
+        db.session.flush()
+        db.session.expunge_all()
+        if self.before_commit is not None:
+            self.before_commit()
+        db.session.commit()
+        if self.after_commit is not None:
+            self.after_commit()
+
+
+def init_write_queue(app):
+    """Create the write-behind queue of an application, if enabled.
+
+    The queue is flushed when the interpreter exits.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    if not app.config["WRITE_BEHIND_ENABLED"]:
+        return
+    write_queue = WriteBehindQueue(
+        app,
+        interval=app.config["WRITE_BEHIND_INTERVAL_MS"] / 1000,
+        max_batch=app.config["WRITE_BEHIND_MAX_BATCH"],
+        before_commit=_touch,
+        after_commit=_after_commit,
+    )
+    app.extensions["write_queue"] = write_queue
+    atexit.register(write_queue.close)
@@ -0,0 +1,11 @@
+"""ASGI entry point.
+
+Serve the application with any ASGI server, for example::
+
+    ASYNC_API_ENABLED=1 uvicorn asgi:app --workers 4
+"""
+
+from app import create_app
+from app.asgi import create_asgi_app
+
+app = create_asgi_app(create_app())
@@ -0,0 +1,100 @@
+"""Time task reads before and after archiving old completed tasks.
+
+Seeds a database where most tasks were completed long ago, times a first
+listing page, a search and a full export, runs the compaction job and times
+them again on the hot set. First pages cost the same either way thanks to
+keyset pagination; searches and exports scale with the table size.
+
+Usage::
+
+    python -m benchmarks.compaction --rows 1000000 --completed-ratio 0.8
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from app import create_app
+from app.models import Task, db
+from app.services import compact_tasks, iter_task_rows, list_tasks, search_tasks
+from benchmarks.seed import seed_tasks
+from benchmarks.templates import median_ms
+
+SCENARIOS = {
+    "open tasks by due date": lambda: list_tasks(completed=False, sort="due_date"),
+    "search": lambda: search_tasks("benchmark task"),
+    "export": lambda: sum(1 for _ in iter_task_rows()),
+}
+
+
+def time_scenarios(repeat):
+    """Time every scenario.
+
+    Args:
+        repeat (int): How many times each scenario is run.
+
+    Returns:
+        dict: The median durations in milliseconds, by scenario name.
+
+    """
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        results[name] = median_ms(scenario, repeat)
+        db.session.expunge_all()
+    return results
+
+
+def main():
+    """Seed a database, then time the reads around a compaction run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--completed-ratio", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                "TASK_CACHE_BACKEND": "null",
+                "LOG_LEVEL": "WARNING",
+            },
+            config_name="testing",
+        )
+        with app.app_context():
+            db.create_all()
+            seed_tasks(args.rows, completed_ratio=args.completed_ratio)
+            before = time_scenarios(args.repeat)
+            start = time.perf_counter()
+            compacted = compact_tasks()
+            compaction_s = round(time.perf_counter() - start, 3)
+            after = time_scenarios(args.repeat)
+            hot_rows = db.session.scalar(db.select(db.func.count(Task.id)))
+            db.engine.dispose()
+
+    for name in SCENARIOS:
+        print(f"{name:<24} {before[name]:10.3f} ms -> {after[name]:10.3f} ms")
+    print(
+        f"archived {compacted['archived']} tasks in {compaction_s:.3f} s, "
+        f"{hot_rows} tasks left"
+    )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(
+                {
+                    "rows": args.rows,
+                    "hot_rows": hot_rows,
+                    "compaction_s": compaction_s,
+                    "before_ms": before,
+                    "after_ms": after,
+                },
+                fh,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
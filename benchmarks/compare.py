@@ -0,0 +1,71 @@
+"""Compare two benchmark reports and fail on latency regressions.
+
+Usage::
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_medians(path):
+    """Load the median latencies of a report produced by `benchmarks.run`.
+
+    Args:
+        path (str): The report path.
+
+    Returns:
+        dict: Median latencies in milliseconds by ``(size, kind, name)``.
+
+    """
+    with open(path) as fh:
+        report = json.load(fh)
+    return {
+        (result["size"], result["kind"], result["name"]): result["median_ms"]
+        for result in report["results"]
+    }
+
+
+def compare(baseline, current, threshold):
+    """Find the benchmarks whose median latency grew beyond the threshold.
+
+    Args:
+        baseline (dict): The baseline medians.
+        current (dict): The current medians.
+        threshold (float): The tolerated relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list: ``(key, baseline, current, ratio)`` tuples of the regressions.
+
+    """
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys(), key=str):
+        ratio = current[key] / baseline[key] if baseline[key] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append((key, baseline[key], current[key], ratio))
+    return regressions
+
+
+def main():
+    """Print the regressions and exit with status 1 if there are any."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    regressions = compare(
+        load_medians(args.baseline), load_medians(args.current), args.threshold
+    )
+    for (size, kind, name), before, after, ratio in regressions:
+        print(f"{size:>9} {kind:<8} {name:<32} {before:.3f} -> {after:.3f} ms", end="")
+        print(f" ({ratio:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
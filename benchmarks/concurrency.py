@@ -0,0 +1,201 @@
+"""Compare sync and async task listings served through the ASGI entry point.
+
+Every SQL statement is delayed by ``--latency`` milliseconds inside the
+database driver, the way a remote database round trip would be. Requests
+for the sync and async listing routes are sent, ``--concurrency`` at a time,
+to the application wrapped as `asgi.py` wraps it, which runs requests on
+``--threads`` threads, and, for comparison, to asgiref's `WsgiToAsgi`, which
+runs every request on a single thread.
+
+Usage::
+
+    python -m benchmarks.concurrency --calls 200 --threads 8 --latency 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import event
+from sqlalchemy.util import await_
+
+from app import create_app
+from app.asgi import ThreadPoolWsgiToAsgi
+from app.models import db
+from benchmarks.seed import seed_tasks
+
+ROUTES = {"sync": "/api/v1/tasks", "async": "/api/v1/async/tasks"}
+
+
+def slow_down(engine, latency, is_async=False):
+    """Delay every statement executed on new connections of an engine.
+
+    The delay happens in the thread running the SQLite statement, which is
+    the request thread for sync engines and the driver thread for aiosqlite.
+
+    Args:
+        engine (Engine): The synchronous engine, or the ``sync_engine`` of an
+            async engine.
+        latency (float): The delay per statement, in seconds.
+        is_async (bool): Whether the engine uses the aiosqlite driver.
+
+    Returns:
+        None
+
+    """
+
+    def delay(statement):
+        time.sleep(latency)
+
+    def on_connect(dbapi_connection, connection_record):
+        if is_async:
+            await_(dbapi_connection.driver_connection.set_trace_callback(delay))
+        else:
+            dbapi_connection.set_trace_callback(delay)
+
+    event.listen(engine, "connect", on_connect)
+
+
+async def asgi_get(asgi_app, path, query):
+    """Send a GET request to an ASGI application.
+
+    Args:
+        asgi_app (function): The ASGI application.
+        path (str): The request path.
+        query (bytes): The query string.
+
+    Returns:
+        int: The response status.
+
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query,
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await asgi_app(scope, receive, send)
+    return statuses[0]
+
+
+async def bench_asgi(asgi_app, path, calls, concurrency):
+    """Send listing requests concurrently to an ASGI application.
+
+    Args:
+        asgi_app (function): The ASGI application.
+        path (str): The listing route.
+        calls (int): The number of requests.
+        concurrency (int): The maximum number of requests in flight.
+
+    Returns:
+        float: The elapsed time in seconds.
+
+    """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with limit:
+            assert await asgi_get(asgi_app, path, b"limit=20") == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    return time.perf_counter() - start
+
+
+async def run(app, calls, threads, concurrency):
+    """Time both listing routes through both ASGI adapters.
+
+    Every run shares one event loop, like an ASGI server, which the pooled
+    async connections are bound to.
+
+    Args:
+        app (Flask): The application bound to the seeded database.
+        calls (int): The number of requests per run.
+        threads (int): The number of threads of the thread pool adapter.
+        concurrency (int): The maximum number of requests in flight.
+
+    Returns:
+        dict: The elapsed seconds and throughput, by run.
+
+    """
+    adapters = {
+        f"thread pool x{threads}": ThreadPoolWsgiToAsgi(app, threads),
+        "WsgiToAsgi": WsgiToAsgi(app),
+    }
+    results = {}
+    for adapter, asgi_app in adapters.items():
+        for route, path in ROUTES.items():
+            name = f"{route} via {adapter}"
+            elapsed = await bench_asgi(asgi_app, path, calls, concurrency)
+            results[name] = {
+                "seconds": round(elapsed, 3),
+                "calls_per_sec": round(calls / elapsed, 1),
+            }
+            print(f"{name:<32} {elapsed:8.3f} s {calls / elapsed:8.1f} calls/s")
+    await app.extensions["async_engine"].dispose()
+    return results
+
+
+def main():
+    """Seed a database, then time the sync and async listings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8, help="ASGI threads.")
+    parser.add_argument(
+        "--concurrency", type=int, default=64, help="Requests in flight."
+    )
+    parser.add_argument("--latency", type=float, default=20, help="Milliseconds.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                "ASYNC_API_ENABLED": True,
+                "TASK_CACHE_BACKEND": "null",
+                "SQLALCHEMY_POOL_SIZE": args.threads,
+                "ASYNC_POOL_SIZE": args.concurrency,
+                "LOG_LEVEL": "WARNING",
+            },
+            config_name="testing",
+        )
+        with app.app_context():
+            db.create_all()
+            seed_tasks(args.rows)
+            slow_down(db.engine, args.latency / 1000)
+            db.engine.dispose()
+        slow_down(app.extensions["async_engine"].sync_engine, args.latency / 1000, True)
+
+        results = asyncio.run(run(app, args.calls, args.threads, args.concurrency))
+        with app.app_context():
+            db.engine.dispose()
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"latency_ms": args.latency, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
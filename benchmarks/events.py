@@ -0,0 +1,228 @@
+"""Compare polling the task list with the change feed for many clients.
+
+Polling clients each list the first page of tasks every ``--interval``
+seconds; change feed clients wait on the change broker, like the ``/events``
+stream does. Both run while tasks are created at a steady rate, and report
+how many SELECT statements reached the database and how long clients took
+to see each new task.
+
+Usage::
+
+    python -m benchmarks.events --clients 1000 --writes 50 --interval 1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db
+from app.services import create_task, list_task_rows
+
+
+def count_selects(engine):
+    """Count the SELECT statements executed on an engine.
+
+    Args:
+        engine (Engine): The engine to watch.
+
+    Returns:
+        list: A list whose length is the number of SELECT statements so far.
+
+    """
+    selects = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(1)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    return selects
+
+
+def write_tasks(app, writes, rate, created):
+    """Create tasks at a steady rate, recording when each was submitted.
+
+    Args:
+        app (Flask): The application.
+        writes (int): The number of tasks to create.
+        rate (float): The number of tasks per second.
+        created (dict): Filled with the submission time of every task id.
+
+    Returns:
+        None
+
+    """
+    with app.app_context():
+        for i in range(writes):
+            start = time.perf_counter()
+            created[create_task(f"Task {i}", "Benchmark", None).id] = start
+            time.sleep(1 / rate)
+
+
+def bench_polling(app, clients, writes, rate, interval):
+    """Run clients polling the first page of tasks.
+
+    Args:
+        app (Flask): The application.
+        clients (int): The number of clients.
+        writes (int): The number of tasks created meanwhile.
+        rate (float): The number of tasks created per second.
+        interval (float): The polling interval, in seconds.
+
+    Returns:
+        tuple: The submission times of the tasks, the time each client first saw
+            each task, and the number of SELECT statements.
+
+    """
+    created, seen, done = {}, [], threading.Event()
+    lock = threading.Lock()
+
+    def client(offset):
+        known = set()
+        time.sleep(offset)
+        while not done.is_set():
+            with app.app_context():
+                ids = {row.id for row in list_task_rows(limit=20).items}
+            now = time.perf_counter()
+            with lock:
+                seen.extend((task_id, now) for task_id in ids - known)
+            known |= ids
+            time.sleep(interval)
+
+    with app.app_context():
+        selects = count_selects(db.engine)
+    threads = [
+        threading.Thread(target=client, args=(interval * i / clients,), daemon=True)
+        for i in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    write_tasks(app, writes, rate, created)
+    time.sleep(interval * 2)
+    done.set()
+    for thread in threads:
+        thread.join()
+    return created, seen, len(selects)
+
+
+def bench_feed(app, clients, writes, rate, interval):
+    """Run clients waiting on the change broker.
+
+    Args:
+        app (Flask): The application.
+        clients (int): The number of clients.
+        writes (int): The number of tasks created meanwhile.
+        rate (float): The number of tasks created per second.
+        interval (float): The heartbeat interval, in seconds.
+
+    Returns:
+        tuple: The submission times of the tasks, the time each client received
+            each task, and the number of SELECT statements.
+
+    """
+    broker = app.extensions["change_broker"]
+    created, seen, done = {}, [], threading.Event()
+    lock = threading.Lock()
+    after_id = broker.start()
+
+    def client(after_id):
+        while not done.is_set():
+            events = broker.events_after(after_id, interval)
+            now = time.perf_counter()
+            with lock:
+                seen.extend(
+                    (json.loads(text.split("data: ")[1])["id"], now)
+                    for _, text in events
+                )
+            if events:
+                after_id = events[-1][0]
+
+    with app.app_context():
+        selects = count_selects(db.engine)
+    threads = [
+        threading.Thread(target=client, args=(after_id,), daemon=True)
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    write_tasks(app, writes, rate, created)
+    time.sleep(interval * 2)
+    done.set()
+    for thread in threads:
+        thread.join()
+    broker.close()
+    return created, seen, len(selects)
+
+
+def summarize(created, seen, selects):
+    """Summarize the delivery delays and database load of a run.
+
+    Args:
+        created (dict): The submission time of every task id.
+        seen (list): ``(task id, time)`` tuples, one per client and task.
+        selects (int): The number of SELECT statements.
+
+    Returns:
+        dict: The SELECT count and the median and 95th percentile delays.
+
+    """
+    delays = sorted(
+        (when - created[task_id]) * 1000 for task_id, when in seen if task_id in created
+    )
+    return {
+        "selects": selects,
+        "deliveries": len(delays),
+        "p50_ms": round(statistics.median(delays), 1),
+        "p95_ms": round(delays[int(len(delays) * 0.95)], 1),
+    }
+
+
+def main():
+    """Time polling and change feed clients on a fresh database."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=10, help="Writes per second.")
+    parser.add_argument("--interval", type=float, default=1, help="Seconds.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    results = {}
+    for name, bench in (("polling", bench_polling), ("change feed", bench_feed)):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app(
+                {
+                    "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                    "SQLALCHEMY_POOL_SIZE": 32,
+                    "TASK_CACHE_BACKEND": "null",
+                    "EVENTS_POLL_INTERVAL": args.interval,
+                    "LOG_LEVEL": "WARNING",
+                },
+                config_name="testing",
+            )
+            with app.app_context():
+                db.create_all()
+            result = summarize(
+                *bench(app, args.clients, args.writes, args.rate, args.interval)
+            )
+            with app.app_context():
+                db.engine.dispose()
+        results[name] = result
+        print(
+            f"{name:<12} {result['selects']:8} selects {result['p50_ms']:8.1f} ms p50 "
+            f"{result['p95_ms']:8.1f} ms p95"
+        )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
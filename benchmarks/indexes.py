@@ -0,0 +1,139 @@
+"""Compare task listing query plans and timings without and with indexes.
+
+Usage::
+
+    python -m benchmarks.indexes --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date
+
+from sqlalchemy import event
+
+from app import create_app
+from app.models import Task, db
+from app.services import list_tasks
+from benchmarks.seed import seed_tasks
+
+SCENARIOS = {
+    "open tasks by due date": {"completed": False, "sort": "due_date"},
+    "completed tasks": {"completed": True},
+    "due date range": {
+        "due_from": date(2030, 6, 1),
+        "due_to": date(2030, 6, 30),
+        "sort": "due_date",
+    },
+    "title prefix": {"title_prefix": "Task 12345"},
+}
+
+
+@contextmanager
+def capture_statements(engine):
+    """Record the SQL statements executed on an engine.
+
+    Args:
+        engine (Engine): The engine to listen on.
+
+    Yields:
+        list: The recorded ``(statement, parameters)`` pairs.
+
+    """
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def query_plan(statement, parameters):
+    """Return the SQLite query plan of a statement.
+
+    Args:
+        statement (str): The SQL statement.
+        parameters (tuple): The statement parameters.
+
+    Returns:
+        list: The plan detail lines.
+
+    """
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in rows]
+
+
+def run_scenarios(repeat):
+    """Time every scenario and collect its query plans.
+
+    Args:
+        repeat (int): How many times each listing is executed.
+
+    Returns:
+        dict: Timings in milliseconds and plans, by scenario name.
+
+    """
+    results = {}
+    for name, filters in SCENARIOS.items():
+        with capture_statements(db.engine) as statements:
+            list_tasks(**filters)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list_tasks(**filters)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.session.expunge_all()
+        results[name] = {
+            "median_ms": round(statistics.median(timings), 3),
+            "plans": [query_plan(*statement) for statement in statements],
+        }
+    return results
+
+
+def main():
+    """Seed a database, then benchmark the listings before and after indexing."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'bench.db')}"}
+        )
+        with app.app_context():
+            db.create_all()
+            for index in Task.__table__.indexes:
+                index.drop(db.engine)
+            seed_tasks(args.rows)
+
+            report = {"rows": args.rows, "before": run_scenarios(args.repeat)}
+            for index in Task.__table__.indexes:
+                index.create(db.engine)
+            with db.engine.connect() as conn:
+                conn.exec_driver_sql("ANALYZE")
+            report["after"] = run_scenarios(args.repeat)
+
+    for name in SCENARIOS:
+        before, after = report["before"][name], report["after"][name]
+        print(f"{name}: {before['median_ms']} ms -> {after['median_ms']} ms")
+        for label, result in (("before", before), ("after", after)):
+            for plan in result["plans"]:
+                print(f"  {label}: {'; '.join(plan)}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
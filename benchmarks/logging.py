@@ -0,0 +1,126 @@
+"""Benchmark the per-request cost of logging.
+
+Times task creation requests, which log one INFO record each, and the
+records themselves as seen by the calling thread, with logging off, with
+records written synchronously, and handed over to the background listener
+as text, JSON and sampled JSON lines. Standard error is redirected to a
+file, flushed after every record as it would be on a console or pipe, and
+then to a file opened with ``O_DSYNC``, standing in for a sink that blocks
+the writer, such as a slow disk or a full pipe.
+
+Usage::
+
+    python -m benchmarks.logging --repeat 2000
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app import create_app
+from app.log import shutdown_logging
+from app.models import db
+
+SETUPS = {
+    "off": {"LOG_LEVEL": "WARNING"},
+    "sync_text": {"LOG_QUEUE_ENABLED": False},
+    "queued_text": {},
+    "queued_json": {"LOG_FORMAT": "json"},
+    "queued_json_sampled": {"LOG_FORMAT": "json", "LOG_SAMPLING": "app=0.1"},
+}
+
+
+def bench_setup(overrides, repeat):
+    """Time task creation requests and bare log calls for one setup.
+
+    Args:
+        overrides (dict): Configuration values of the setup.
+        repeat (int): The number of requests and of log calls.
+
+    Returns:
+        dict: The median ``request_us`` and ``record_us``, in microseconds.
+
+    """
+    app = create_app(
+        {"METRICS_ENABLED": False, "TASK_CACHE_BACKEND": "null", **overrides},
+        config_name="testing",
+    )
+    logger = logging.getLogger("app.services")
+    client = app.test_client()
+    timings = {"request_us": [], "record_us": []}
+    with app.app_context():
+        db.create_all()
+        for i in range(repeat):
+            start = time.perf_counter()
+            client.post("/api/v1/tasks", json={"title": f"Task {i}"})
+            middle = time.perf_counter()
+            logger.info("Task with id %s created successfully.", i)
+            end = time.perf_counter()
+            timings["request_us"].append(middle - start)
+            timings["record_us"].append(end - middle)
+        shutdown_logging()
+        db.drop_all()
+    return {
+        name: round(statistics.median(values) * 1_000_000, 2)
+        for name, values in timings.items()
+    }
+
+
+def bench_sink(path, flags, repeat):
+    """Run every logging setup with standard error sent to a file.
+
+    Args:
+        path (str): The file standing in for standard error.
+        flags (int): Extra `os.open` flags of the file.
+        repeat (int): The number of requests and of log calls per setup.
+
+    Returns:
+        dict: The results of `bench_setup`, by setup name.
+
+    """
+    stderr = sys.stderr
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags)
+    with open(fd, "w") as output:
+        sys.stderr = output
+        try:
+            return {
+                name: bench_setup(overrides, repeat)
+                for name, overrides in SETUPS.items()
+            }
+        finally:
+            sys.stderr = stderr
+
+
+def main():
+    """Run every logging setup against a buffered and a synchronous file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stderr.log")
+        results = {
+            "file": bench_sink(path, 0, args.repeat),
+            "dsync_file": bench_sink(path, os.O_DSYNC, args.repeat),
+        }
+
+    print(f"{'sink':<12} {'setup':<22} {'request':>12} {'record':>12}")
+    for sink, setups in results.items():
+        for name, result in setups.items():
+            print(
+                f"{sink:<12} {name:<22} {result['request_us']:9.2f} us"
+                f" {result['record_us']:9.2f} us"
+            )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"repeat": args.repeat, **results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
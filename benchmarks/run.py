@@ -0,0 +1,299 @@
+"""Benchmark the task services and routes on seeded databases.
+
+Usage::
+
+    python -m benchmarks.run --sizes 1000,100000,1000000 --output report.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.models import Task, db
+from app.services import (
+    complete_task,
+    create_task,
+    delete_task,
+    list_task_rows,
+    list_tasks,
+)
+from benchmarks.seed import seed_tasks
+
+
+def summarize(timings, wall_time=None):
+    """Summarize a list of durations.
+
+    Args:
+        timings (list): The measured durations in seconds.
+        wall_time (float): The elapsed time of the whole run, for concurrent
+            runs; defaults to the sum of the durations.
+
+    Returns:
+        dict: Latency percentiles in milliseconds and the throughput.
+
+    """
+    ordered = sorted(timings)
+    wall_time = wall_time if wall_time is not None else sum(ordered)
+    return {
+        "iterations": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "median_ms": round(statistics.median(ordered) * 1000, 4),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+        "ops_per_sec": round(len(ordered) / wall_time, 2) if wall_time else None,
+    }
+
+
+def measure(func, iterations, teardown=None):
+    """Time repeated calls of a function.
+
+    Args:
+        func (function): Called with the iteration number.
+        iterations (int): The number of calls.
+        teardown (function): Called untimed after every call.
+
+    Returns:
+        dict: The summary of the timings.
+
+    """
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        timings.append(time.perf_counter() - start)
+        if teardown:
+            teardown()
+    return summarize(timings)
+
+
+def bench_services(app, size, iterations):
+    """Benchmark the service functions.
+
+    Args:
+        app (Flask): The application bound to the seeded database.
+        size (int): The number of seeded tasks.
+        iterations (int): The number of calls per service.
+
+    Returns:
+        dict: The summaries by benchmark name.
+
+    """
+    results = {}
+    with app.app_context():
+        reset = db.session.expunge_all
+        results["list_tasks"] = measure(lambda i: list_tasks(), iterations, reset)
+        results["list_tasks_due_date"] = measure(
+            lambda i: list_tasks(completed=False, sort="due_date"), iterations, reset
+        )
+        results["list_task_rows"] = measure(
+            lambda i: list_task_rows(), iterations, reset
+        )
+        created = []
+        results["create_task"] = measure(
+            lambda i: created.append(create_task(f"New {i}", "Benchmark", None).id),
+            iterations,
+            reset,
+        )
+        results["complete_task"] = measure(
+            lambda i: complete_task(created[i]), iterations, reset
+        )
+        results["delete_task"] = measure(
+            lambda i: delete_task(created[i]), iterations, reset
+        )
+    return results
+
+
+def bench_routes(app, size, iterations):
+    """Benchmark the routes through the Flask test client.
+
+    Args:
+        app (Flask): The application bound to the seeded database.
+        size (int): The number of seeded tasks.
+        iterations (int): The number of requests per route.
+
+    Returns:
+        dict: The summaries by benchmark name.
+
+    """
+    client = app.test_client()
+    form = {"title": "Route", "description": "Benchmark", "submit": True}
+    with app.app_context():
+        first_new_id = db.session.scalar(db.select(db.func.max(Task.id))) + 1
+    return {
+        "GET /": measure(lambda i: client.get("/"), iterations),
+        "GET /api/v1/tasks": measure(lambda i: client.get("/api/v1/tasks"), iterations),
+        "POST /": measure(lambda i: client.post("/", data=form), iterations),
+        "POST /complete_task": measure(
+            lambda i: client.post(f"/complete_task/{first_new_id + i}"), iterations
+        ),
+        "POST /delete_task": measure(
+            lambda i: client.post(f"/delete_task/{first_new_id + i}"), iterations
+        ),
+    }
+
+
+def bench_load(app, requests, concurrency):
+    """Benchmark concurrent requests against a local threaded WSGI server.
+
+    Args:
+        app (Flask): The application bound to the seeded database.
+        requests (int): The number of requests per scenario.
+        concurrency (int): The number of concurrent clients.
+
+    Returns:
+        dict: The summaries by scenario name.
+
+    """
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    scenarios = {
+        "GET /": lambda: urllib.request.Request(f"{base_url}/"),
+        "GET /api/v1/tasks": lambda: urllib.request.Request(f"{base_url}/api/v1/tasks"),
+        "POST /api/v1/tasks": lambda: urllib.request.Request(
+            f"{base_url}/api/v1/tasks",
+            data=b'{"title": "Load", "description": "Benchmark"}',
+            headers={"Content-Type": "application/json"},
+        ),
+    }
+
+    def timed_request(make_request):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(make_request()) as response:
+                response.read()
+            ok = True
+        except OSError:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for name, make_request in scenarios.items():
+                start = time.perf_counter()
+                outcomes = list(pool.map(timed_request, [make_request] * requests))
+                wall_time = time.perf_counter() - start
+                summary = summarize([duration for duration, _ in outcomes], wall_time)
+                summary["errors"] = sum(1 for _, ok in outcomes if not ok)
+                summary["concurrency"] = concurrency
+                results[f"{name} x{concurrency}"] = summary
+    finally:
+        server.shutdown()
+        thread.join()
+    return results
+
+
+def environment():
+    """Describe the environment the benchmarks ran in.
+
+    Returns:
+        dict: The interpreter, library versions, git revision and date.
+
+    """
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "flask": version("flask"),
+        "sqlalchemy": version("sqlalchemy"),
+        "revision": revision,
+        "date": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def run(sizes, iterations, requests, concurrency, cache):
+    """Run every benchmark for every dataset size.
+
+    Args:
+        sizes (list): The numbers of tasks to seed.
+        iterations (int): The number of calls per service and route.
+        requests (int): The number of requests per load scenario.
+        concurrency (int): The number of concurrent load clients.
+        cache (str): The task listing cache backend.
+
+    Returns:
+        dict: The machine-readable report.
+
+    """
+    report = {"environment": environment(), "results": []}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app(
+                {
+                    "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                    "TASK_CACHE_BACKEND": cache,
+                    "LOG_LEVEL": "WARNING",
+                },
+                config_name="testing",
+            )
+            with app.app_context():
+                db.create_all()
+                seed_tasks(size)
+            groups = {
+                "service": bench_services(app, size, iterations),
+                "route": bench_routes(app, size, iterations),
+                "load": bench_load(app, requests, concurrency),
+            }
+            with app.app_context():
+                db.engine.dispose()
+        for kind, results in groups.items():
+            for name, summary in results.items():
+                report["results"].append(
+                    {"size": size, "kind": kind, "name": name, **summary}
+                )
+                print(
+                    f"{size:>9} {kind:<8} {name:<32} "
+                    f"median {summary['median_ms']:>9.3f} ms  "
+                    f"p95 {summary['p95_ms']:>9.3f} ms  "
+                    f"{summary['ops_per_sec']:>10} ops/s"
+                )
+    return report
+
+
+def main():
+    """Parse the command line, run the benchmarks and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--cache", default="null", help="Task cache backend.")
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args()
+
+    report = run(
+        [int(size) for size in args.sizes.split(",")],
+        args.iterations,
+        args.requests,
+        args.concurrency,
+        args.cache,
+    )
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
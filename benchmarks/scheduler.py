@@ -0,0 +1,119 @@
+"""Time the due date scheduler against rescanning every open task.
+
+Seeds a database with tasks due over two years, then times the scheduler
+loading its window of upcoming due dates, an idle tick, a tick picking up
+newly created tasks and a tick moving the window ahead, against loading
+every open dated task into a heap, as a scheduler without the due date
+index and the change log would on every change.
+
+Usage::
+
+    python -m benchmarks.scheduler --rows 1000000
+"""
+
+import argparse
+import heapq
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+from app import create_app
+from app.models import Task, db
+from app.scheduler import DueDateScheduler
+from app.services import create_task
+from benchmarks.seed import START_DATE, seed_tasks
+
+
+def timed_ms(func):
+    """Return the duration of one call.
+
+    Args:
+        func (function): The function to time.
+
+    Returns:
+        float: The duration in milliseconds.
+
+    """
+    start = time.perf_counter()
+    func()
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def full_scan():
+    """Load every open dated task into a heap of due dates.
+
+    Returns:
+        None
+
+    """
+    stmt = db.select(Task.due_date, Task.id).where(
+        Task.deleted_at.is_(None),
+        Task.completed.is_(False),
+        Task.due_date.is_not(None),
+    )
+    heapq.heapify(list(db.session.execute(stmt)))
+
+
+def run(app, created):
+    """Time the scheduler steps and the full scan.
+
+    Args:
+        app (Flask): The application, inside its context.
+        created (int): The number of tasks created before the third tick.
+
+    Returns:
+        dict: The durations in milliseconds, by step, and the timer count.
+
+    """
+    scheduler = DueDateScheduler(
+        app, lead=3600, horizon=6 * 3600, poll_interval=1, batch_size=1000
+    )
+    now = START_DATE + timedelta(days=30)
+    results = {"load window": timed_ms(lambda: scheduler.tick(now))}
+    results["idle tick"] = timed_ms(lambda: scheduler.tick(now))
+    for i in range(created):
+        create_task(f"New {i}", None, now + timedelta(minutes=i))
+    results[f"tick after {created} creates"] = timed_ms(lambda: scheduler.tick(now))
+    results["tick four hours later"] = timed_ms(
+        lambda: scheduler.tick(now + timedelta(hours=4))
+    )
+    results["full scan"] = timed_ms(full_scan)
+    results["timers"] = len(scheduler._timers)
+    return results
+
+
+def main():
+    """Seed a database, then time the scheduler against a full scan."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--created", type=int, default=100)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                "TASK_CACHE_BACKEND": "null",
+                "LOG_LEVEL": "WARNING",
+            },
+            config_name="testing",
+        )
+        with app.app_context():
+            db.create_all()
+            seed_tasks(args.rows)
+            results = run(app, args.created)
+            db.engine.dispose()
+
+    for name, value in results.items():
+        unit = "" if name == "timers" else " ms"
+        print(f"{name:<28} {value:>12}{unit}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"rows": args.rows, **results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
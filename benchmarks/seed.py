@@ -0,0 +1,68 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.models import Task, db
+from app.services import reconcile_task_stats
+
+START_DATE = datetime(2030, 1, 1)
+# Completed tasks are completed one minute apart from this date.
+COMPLETED_DATE = datetime(2024, 1, 1)
+
+
+def generate_tasks(count, completed_ratio=0.1, undated_ratio=0.05, seed=0):
+    """Generate reproducible task rows for seeding a benchmark database.
+
+    Args:
+        count (int): The number of rows to generate.
+        completed_ratio (float): The share of completed tasks.
+        undated_ratio (float): The share of tasks without a due date.
+        seed (int): The random seed.
+
+    Returns:
+        generator: Dictionaries of task column values.
+
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        due_date = None
+        if rng.random() >= undated_ratio:
+            due_date = START_DATE + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        completed = rng.random() < completed_ratio
+        yield {
+            "title": f"Task {i}",
+            "description": f"Benchmark task number {i}",
+            "due_date": due_date,
+            "completed": completed,
+            "completed_at": COMPLETED_DATE + timedelta(minutes=i)
+            if completed
+            else None,
+        }
+
+
+def seed_tasks(count, batch_size=10_000, **kwargs):
+    """Insert generated tasks into the current application's database.
+
+    The task statistics are recomputed afterwards, as the rows bypass the
+    services.
+
+    Args:
+        count (int): The number of tasks to insert.
+        batch_size (int): The number of rows per executemany batch.
+        **kwargs: Extra arguments passed to `generate_tasks`.
+
+    Returns:
+        None
+
+    """
+    batch = []
+    for row in generate_tasks(count, **kwargs):
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.session.execute(insert(Task), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Task), batch)
+    db.session.commit()
+    reconcile_task_stats()
@@ -0,0 +1,49 @@
+"""Measure the cold start time of the application.
+
+Every run imports and creates the application in a fresh interpreter, the
+way a new worker or a CLI invocation does. Use ``flask profile-startup`` for
+a breakdown by package.
+
+Usage::
+
+    python -m benchmarks.startup --runs 10
+"""
+
+import argparse
+import json
+import statistics
+
+from app.profiling import DEFERRED_MODULES, profile_startup
+
+TIMINGS = ("total_ms", "import_ms", "create_app_ms")
+
+
+def main():
+    """Time repeated cold starts and report the median timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--config-name", default=None)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    reports = [
+        profile_startup(args.config_name, breakdown=False) for _ in range(args.runs)
+    ]
+    results = {
+        name: round(statistics.median(report[name] for report in reports), 1)
+        for name in TIMINGS
+    }
+    results["deferred_modules_loaded"] = [
+        module for module in DEFERRED_MODULES if module in reports[0]["modules"]
+    ]
+
+    for name in TIMINGS:
+        print(f"{name:<16} {results[name]:10.1f} ms")
+    print(f"deferred modules loaded: {results['deferred_modules_loaded'] or 'none'}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"runs": args.runs, **results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
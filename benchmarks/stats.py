@@ -0,0 +1,117 @@
+"""Time the dashboard task counts computed three ways as the table grows.
+
+``list_tasks`` walks every page of the listing and counts in Python, the
+way dashboards had to before the stats endpoint; ``aggregate`` runs COUNT
+queries over the tasks table; ``task_stats`` reads the summary tables kept
+up to date by the task services.
+
+Usage::
+
+    python -m benchmarks.stats --rows 10000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from datetime import date, datetime
+
+from app import create_app
+from app.models import Task, db
+from app.services import list_tasks, task_stats
+from benchmarks.seed import START_DATE, seed_tasks
+from benchmarks.templates import median_ms
+
+# Half of the seeded due dates are in the past.
+TODAY = date(START_DATE.year + 1, 1, 1)
+
+
+def count_listed():
+    """Count the tasks by walking every page of the listing.
+
+    Returns:
+        dict: The open, completed and overdue counts.
+
+    """
+    counts = {"open": 0, "completed": 0, "overdue": 0}
+    after = None
+    while True:
+        page = list_tasks(after=after, limit=1000)
+        for task in page.items:
+            counts["completed" if task.completed else "open"] += 1
+            if not task.completed and task.due_date and task.due_date.date() < TODAY:
+                counts["overdue"] += 1
+        db.session.expunge_all()
+        if page.next_cursor is None:
+            return counts
+        after = page.next_cursor
+
+
+def count_aggregate():
+    """Count the tasks with aggregate queries over the tasks table.
+
+    Returns:
+        Row: The open, completed and overdue counts.
+
+    """
+    visible = Task.deleted_at.is_(None)
+    return db.session.execute(
+        db.select(
+            db.func.count(Task.id).filter(Task.completed.is_(False)),
+            db.func.count(Task.id).filter(Task.completed.is_(True)),
+            db.func.count(Task.id).filter(
+                Task.completed.is_(False),
+                Task.due_date < datetime.combine(TODAY, datetime.min.time()),
+            ),
+        ).where(visible)
+    ).one()
+
+
+SCENARIOS = {
+    "list_tasks": count_listed,
+    "aggregate": count_aggregate,
+    "task_stats": lambda: task_stats(TODAY),
+}
+
+
+def main():
+    """Seed databases of growing sizes and time every way of counting."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    results = {}
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app(
+                {
+                    "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                    "LOG_LEVEL": "WARNING",
+                },
+                config_name="testing",
+            )
+            with app.app_context():
+                db.create_all()
+                seed_tasks(rows)
+                assert count_listed() == {
+                    key: task_stats(TODAY)[key]
+                    for key in ("open", "completed", "overdue")
+                }
+                results[rows] = {
+                    name: median_ms(scenario, args.repeat)
+                    for name, scenario in SCENARIOS.items()
+                }
+                db.engine.dispose()
+        print(
+            f"{rows:>10} rows "
+            + " ".join(f"{name} {ms:10.3f} ms" for name, ms in results[rows].items())
+        )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark index page rendering and template loading.
+
+Renders the index page listing every task of a seeded database with and
+without the task list fragment cache, then times how long a new worker
+takes to load the templates with and without the bytecode cache.
+
+Usage::
+
+    python -m benchmarks.templates --rows 10000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from app import create_app
+from app.models import db
+from benchmarks.seed import seed_tasks
+
+
+def median_ms(func, repeat):
+    """Return the median duration of repeated calls.
+
+    Args:
+        func (function): The function to time.
+        repeat (int): The number of calls.
+
+    Returns:
+        float: The median duration in milliseconds.
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 3)
+
+
+def bench_render(database_uri, rows, repeat, fragment_cache):
+    """Time GET requests of the index page listing every task.
+
+    Args:
+        database_uri (str): The seeded database.
+        rows (int): The number of seeded tasks, used as the page size.
+        repeat (int): The number of requests.
+        fragment_cache (bool): Whether the fragment cache is enabled.
+
+    Returns:
+        float: The median request duration in milliseconds.
+
+    """
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": database_uri,
+            "TASKS_MAX_PER_PAGE": rows,
+            "TEMPLATE_FRAGMENT_CACHE": fragment_cache,
+            "TASK_CACHE_BACKEND": "memory" if fragment_cache else "null",
+            "METRICS_ENABLED": False,
+            "LOG_LEVEL": "WARNING",
+        },
+        config_name="testing",
+    )
+    client = app.test_client()
+    client.get(f"/?limit={rows}")
+    return median_ms(lambda: client.get(f"/?limit={rows}"), repeat)
+
+
+def bench_template_load(bytecode_cache_dir, repeat):
+    """Time loading every template in a new application.
+
+    Args:
+        bytecode_cache_dir (str): The warm bytecode cache directory, or None
+            to compile the template sources.
+        repeat (int): The number of new applications.
+
+    Returns:
+        float: The median load duration in milliseconds.
+
+    """
+
+    def load():
+        app = create_app(
+            {
+                "TEMPLATE_BYTECODE_CACHE": bytecode_cache_dir is not None,
+                "TEMPLATE_BYTECODE_CACHE_DIR": bytecode_cache_dir,
+                "TEMPLATE_PRELOAD": False,
+                "LOG_LEVEL": "WARNING",
+            },
+            config_name="testing",
+        )
+        start = time.perf_counter()
+        for name in app.jinja_loader.list_templates():
+            app.jinja_env.get_template(name)
+        return time.perf_counter() - start
+
+    if bytecode_cache_dir is not None:
+        load()
+    return round(statistics.median(load() for _ in range(repeat)) * 1000, 3)
+
+
+def main():
+    """Seed a database, then run the rendering and loading benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_uri = f"sqlite:///{os.path.join(tmp, 'b.db')}"
+        app = create_app(
+            {"SQLALCHEMY_DATABASE_URI": database_uri, "LOG_LEVEL": "WARNING"},
+            config_name="testing",
+        )
+        with app.app_context():
+            db.create_all()
+            seed_tasks(args.rows)
+            db.engine.dispose()
+
+        bytecode_dir = os.path.join(tmp, "bytecode")
+        os.mkdir(bytecode_dir)
+        results = {
+            "render_full_ms": bench_render(database_uri, args.rows, args.repeat, False),
+            "render_fragment_cached_ms": bench_render(
+                database_uri, args.rows, args.repeat, True
+            ),
+            "template_load_compile_ms": bench_template_load(None, args.repeat),
+            "template_load_bytecode_ms": bench_template_load(bytecode_dir, args.repeat),
+        }
+
+    for name, value in results.items():
+        print(f"{name:<28} {value:10.3f} ms")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"rows": args.rows, **results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare direct and write-behind task creation under concurrent writers.
+
+Usage::
+
+    python -m benchmarks.writes --writes 2000 --threads 16 --synchronous FULL
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from app import create_app
+from app.models import db
+from app.services import create_task, write_queue
+
+
+def bench_writes(write_behind, writes, threads, synchronous):
+    """Create tasks concurrently on a fresh database.
+
+    Args:
+        write_behind (bool): Whether to enable the write-behind queue.
+        writes (int): The number of tasks to create.
+        threads (int): The number of concurrent writers.
+        synchronous (str): The SQLite ``synchronous`` pragma.
+
+    Returns:
+        dict: The elapsed time, the throughput and the number of commits.
+
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(
+            {
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp, 'b.db')}",
+                "SQLITE_SYNCHRONOUS": synchronous,
+                "SQLALCHEMY_POOL_SIZE": threads,
+                "WRITE_BEHIND_ENABLED": write_behind,
+                "TASK_CACHE_BACKEND": "null",
+                "LOG_LEVEL": "WARNING",
+            },
+            config_name="testing",
+        )
+        commits = []
+        with app.app_context():
+            db.create_all()
+            event.listen(db.engine, "commit", lambda conn: commits.append(1))
+
+        def create(i):
+            with app.app_context():
+                create_task(f"Task {i}", "Benchmark", None)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(create, range(writes)))
+        elapsed = time.perf_counter() - start
+        with app.app_context():
+            if write_behind:
+                write_queue().close()
+            db.engine.dispose()
+    return {
+        "seconds": round(elapsed, 3),
+        "writes_per_sec": round(writes / elapsed, 1),
+        "commits": len(commits),
+    }
+
+
+def main():
+    """Time concurrent task creation with and without write-behind."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--synchronous", default="FULL", help="SQLite pragma.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    results = {}
+    for name, write_behind in (("direct", False), ("write-behind", True)):
+        result = bench_writes(write_behind, args.writes, args.threads, args.synchronous)
+        results[name] = result
+        print(
+            f"{name:<14} {result['seconds']:8.3f} s "
+            f"{result['writes_per_sec']:10.1f} writes/s {result['commits']:6} commits"
+        )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Add task full-text search
+
+Revision ID: 0cb367dbc180
+Revises: 751fbda07cca
+Create Date: 2026-10-18 02:05:44.081233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0cb367dbc180'
+down_revision = '751fbda07cca'
+branch_labels = None
+depends_on = None
+
+
+FTS_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    # Index the rows that existed before the migration.
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+)
+
+
+def _fts5_available(bind):
+    if bind.dialect.name != "sqlite":
+        return False
+    options = bind.exec_driver_sql("PRAGMA compile_options").scalars().all()
+    return "ENABLE_FTS5" in options
+
+
+def upgrade():
+    # Other databases use the LIKE based search fallback.
+    if not _fts5_available(op.get_bind()):
+        return
+    for statement in FTS_STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_insert")
+    op.execute("DROP TABLE IF EXISTS tasks_fts")
@@ -0,0 +1,349 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+
+def test_list_tasks(client, create_task_fixture):
+    """Test the JSON task listing.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="First", due_date=datetime(2030, 1, 1))
+
+    response = client.get("/api/v1/tasks")
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "tasks": [
+            {
+                "id": 1,
+                "title": "First",
+                "description": "Default Description",
+                "due_date": "2030-01-01T00:00:00",
+                "completed": False,
+                "recurrence": None,
+            }
+        ],
+        "next_cursor": None,
+        "limit": 50,
+    }
+
+
+def test_list_tasks_pagination(client, create_task_fixture):
+    """Test that the JSON listing follows cursors and filters.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    for i in range(3):
+        create_task_fixture(title=f"Task {i}", due_date=None)
+
+    first = client.get("/api/v1/tasks?limit=2").get_json()
+    second = client.get(f"/api/v1/tasks?limit=2&after={first['next_cursor']}")
+
+    assert [task["title"] for task in first["tasks"]] == ["Task 0", "Task 1"]
+    assert [task["title"] for task in second.get_json()["tasks"]] == ["Task 2"]
+    assert client.get("/api/v1/tasks?completed=true").get_json()["tasks"] == []
+    assert client.get("/api/v1/tasks?after=garbage").status_code == 400
+
+
+def test_list_tasks_search(client, create_task_fixture):
+    """Test that the q parameter searches titles and descriptions.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="Buy milk", due_date=None)
+    create_task_fixture(title="Pay rent", description="Before Friday", due_date=None)
+
+    response = client.get("/api/v1/tasks?q=friday")
+
+    assert [task["title"] for task in response.get_json()["tasks"]] == ["Pay rent"]
+    assert client.get("/api/v1/tasks?q=friday&after=x").status_code == 400
+
+
+def test_list_tasks_etag(client, create_task_fixture):
+    """Test that listings honour If-None-Match until the tasks change.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(due_date=None)
+    etag = client.get("/api/v1/tasks").headers["ETag"]
+
+    response = client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    create_task_fixture(due_date=None)
+    response = client.get("/api/v1/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_get_task(client, create_task_fixture):
+    """Test fetching a single task and a missing one.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    task_id = create_task_fixture(title="Single", due_date=None).id
+
+    response = client.get(f"/api/v1/tasks/{task_id}")
+    assert response.status_code == 200
+    assert response.get_json()["title"] == "Single"
+
+    response = client.get("/api/v1/tasks/1234")
+    assert response.status_code == 404
+    assert response.get_json() == {"error": "Task with ID 1234 not found."}
+
+
+def test_create_task(client):
+    """Test creating a task through the API.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    response = client.post(
+        "/api/v1/tasks",
+        json={"title": "New", "description": "Desc", "due_date": "2030-01-01"},
+    )
+    assert response.status_code == 201
+    assert response.headers["Location"] == "/api/v1/tasks/1"
+    assert response.get_json()["due_date"] == "2030-01-01T00:00:00"
+
+
+def test_recurring_task(client):
+    """Test that completing a recurring task creates its next instance.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    response = client.post(
+        "/api/v1/tasks",
+        json={
+            "title": "Water plants",
+            "description": "Desc",
+            "due_date": "2030-01-01",
+            "recurrence": "RRULE:FREQ=WEEKLY;COUNT=2",
+        },
+    )
+    assert response.get_json()["recurrence"] == "FREQ=WEEKLY;COUNT=2"
+
+    listed = client.get("/api/v1/tasks?sort=due_date&due_to=2030-01-31").get_json()
+    assert [(task["id"], task.get("occurrence")) for task in listed["tasks"]] == [
+        (1, None),
+        (1, True),
+    ]
+
+    client.post("/api/v1/tasks/1/complete")
+
+    task = client.get("/api/v1/tasks/2").get_json()
+    assert task["due_date"] == "2030-01-08T00:00:00"
+    assert task["recurrence"] == "FREQ=WEEKLY;COUNT=1"
+
+
+@pytest.mark.parametrize(
+    "task_data",
+    [
+        {"title": "", "description": "Desc"},
+        {"title": "New", "description": "Desc", "due_date": "tomorrow"},
+    ],
+)
+def test_create_task_invalid(client, task_data):
+    """Test that invalid tasks are rejected.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        task_data (dict): The task data.
+
+    Returns:
+        None
+
+    """
+    response = client.post("/api/v1/tasks", json=task_data)
+    assert response.status_code == 400
+    assert "errors" in response.get_json()
+
+
+def test_complete_and_delete_task(client, create_task_fixture):
+    """Test completing and deleting a task through the API.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    task_id = create_task_fixture(due_date=None).id
+
+    response = client.post(f"/api/v1/tasks/{task_id}/complete")
+    assert response.status_code == 200
+    assert response.get_json()["completed"] is True
+
+    assert client.delete(f"/api/v1/tasks/{task_id}").status_code == 204
+    assert client.delete(f"/api/v1/tasks/{task_id}").status_code == 404
+
+
+def test_conditional_update(client, create_task_fixture):
+    """Test updating a task only if it is still at the If-Match version.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    task_id = create_task_fixture(due_date=None).id
+    etag = client.get(f"/api/v1/tasks/{task_id}").headers["ETag"]
+    assert etag == '"1"'
+
+    response = client.post(
+        f"/api/v1/tasks/{task_id}/complete", headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+
+    response = client.delete(f"/api/v1/tasks/{task_id}", headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert response.get_json()["version"] == 2
+
+    response = client.delete(f"/api/v1/tasks/{task_id}", headers={"If-Match": "abc"})
+    assert response.status_code == 400
+
+    response = client.delete(f"/api/v1/tasks/{task_id}", headers={"If-Match": '"2"'})
+    assert response.status_code == 204
+
+
+def test_task_stats(client, create_task_fixture):
+    """Test the task statistics endpoint.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(due_date=None)
+    task_id = create_task_fixture(due_date=None).id
+    client.post(f"/api/v1/tasks/{task_id}/complete")
+
+    response = client.get("/api/v1/stats")
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "total": 2,
+        "open": 1,
+        "completed": 1,
+        "overdue": 0,
+        "due_today": 0,
+    }
+    etag = response.headers["ETag"]
+    assert (
+        client.get("/api/v1/stats", headers={"If-None-Match": etag}).status_code == 304
+    )
+
+
+def test_database_error(client):
+    """Test that database errors are reported as JSON.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    with patch("app.models.db.session.commit") as mock_commit:
+        mock_commit.side_effect = SQLAlchemyError("Simulated DB error")
+        response = client.post(
+            "/api/v1/tasks", json={"title": "New", "description": "Desc"}
+        )
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "The database error has happened."}
+
+
+@pytest.mark.parametrize(
+    "query, content_type, expected",
+    [
+        (
+            "",
+            "text/csv",
+            "id,title,description,due_date,completed,recurrence\r\n1,Open,",
+        ),
+        ("?format=ndjson", "application/x-ndjson", '{"id": 1, "title": "Open"'),
+    ],
+)
+def test_export_tasks(client, create_task_fixture, query, content_type, expected):
+    """Test the streamed task export.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+        query (str): The query string.
+        content_type (str): The expected content type.
+        expected (str): The expected start of the body.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="Open", due_date=None)
+
+    response = client.get(f"/api/v1/tasks/export{query}")
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.content_type.startswith(content_type)
+    assert response.get_data(as_text=True).startswith(expected)
+
+
+def test_export_tasks_unknown_format(client):
+    """Test that unknown export formats are rejected.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    assert client.get("/api/v1/tasks/export?format=xml").status_code == 400
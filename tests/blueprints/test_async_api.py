@@ -0,0 +1,47 @@
+def test_async_api_crud(async_app):
+    """Test the async JSON API routes.
+
+    Args:
+        async_app (Flask): The application with the async API enabled.
+
+    Returns:
+        None
+
+    """
+    client = async_app.test_client()
+
+    created = client.post(
+        "/api/v1/async/tasks", json={"title": "Async", "description": "Desc"}
+    )
+    assert created.status_code == 201
+    task_url = created.headers["Location"]
+    assert task_url == "/api/v1/async/tasks/1"
+
+    assert client.get("/api/v1/async/tasks").get_json()["tasks"][0]["title"] == "Async"
+    assert client.get("/api/v1/tasks/1").get_json()["title"] == "Async"
+
+    completed = client.post("/api/v1/async/tasks/1/complete")
+    assert completed.get_json()["completed"] is True
+    assert completed.headers["ETag"] == '"2"'
+    assert client.get("/api/v1/stats").get_json()["completed"] == 1
+
+    stale = client.delete(task_url, headers={"If-Match": '"1"'})
+    assert stale.status_code == 412
+    assert client.delete(task_url, headers={"If-Match": '"2"'}).status_code == 204
+    assert client.get("/api/v1/stats").get_json()["total"] == 0
+    assert client.get(task_url).status_code == 404
+    assert client.get("/api/v1/async/tasks?after=garbage").status_code == 400
+    assert client.post("/api/v1/async/tasks", json={}).status_code == 400
+
+
+def test_async_api_disabled(client):
+    """Test that the async API is not registered by default.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    assert client.get("/api/v1/async/tasks").status_code == 404
@@ -0,0 +1,97 @@
+from app.services import create_task
+
+
+def read_stream(response, count):
+    """Read the first chunks of a streamed response, then close it.
+
+    Args:
+        response (TestResponse): The streamed response.
+        count (int): The number of chunks to read.
+
+    Returns:
+        list: The decoded chunks.
+
+    """
+    chunks = response.response
+    try:
+        return [next(chunks).decode() for _ in range(count)]
+    finally:
+        response.close()
+
+
+def test_events_resume_from_last_event_id(events_app):
+    """Test that reconnecting clients receive the changes they missed.
+
+    Args:
+        events_app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    first = create_task("First", "Description", None)
+    second = create_task("Second", "Description", None)
+    client = events_app.test_client()
+
+    response = client.get("/events", headers={"Last-Event-ID": "1"}, buffered=False)
+    chunks = read_stream(response, 1)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Content-Encoding" not in response.headers
+    assert chunks[0].startswith("id: 2\nevent: created\ndata: ")
+    assert f'"id": {second.id}' in chunks[0]
+    assert f'"id": {first.id},' not in chunks[0]
+
+
+def test_events_keep_alive(events_app):
+    """Test that new clients only get keep-alive comments until a change.
+
+    Args:
+        events_app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    create_task("Old", "Description", None)
+    client = events_app.test_client()
+
+    response = client.get("/events?last_event_id=", buffered=False)
+
+    assert read_stream(response, 2) == [": keep-alive\n\n", ": keep-alive\n\n"]
+
+
+def test_events_invalid_last_event_id(events_app):
+    """Test that a malformed Last-Event-ID is rejected.
+
+    Args:
+        events_app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    client = events_app.test_client()
+
+    response = client.get("/events", headers={"Last-Event-ID": "abc"})
+
+    assert response.status_code == 400
+
+
+def test_events_require_sqlite(events_app):
+    """Test that the feed refuses databases committing ids out of order.
+
+    Args:
+        events_app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    events_app.config["SQLALCHEMY_DATABASE_URI"] = "postgresql://localhost/tasks"
+
+    response = events_app.test_client().get("/events")
+
+    assert response.status_code == 501
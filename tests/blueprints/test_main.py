@@ -1,8 +1,12 @@
+from datetime import datetime
 from unittest.mock import patch
 
 import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
+from app import create_app, db
+from app.services import create_task
+
 
 def test_index_get(client):
     """Test the main page rendering.
@@ -20,6 +24,140 @@ def test_index_get(client):
     assert b'<h1 class="text-center mb-4">Task Manager</h1>' in response.get_data()
 
 
+def test_index_search(client, create_task_fixture):
+    """Test that the main page searches tasks with the q parameter.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="Buy milk", due_date=None)
+    create_task_fixture(title="Pay rent", due_date=None)
+
+    response_text = client.get("/?q=milk").get_data(as_text=True)
+
+    assert "Buy milk" in response_text
+    assert "Pay rent" not in response_text
+    assert 'value="milk"' in response_text
+
+
+def test_index_conditional_get(client, create_task_fixture):
+    """Test that unchanged index pages are answered with 304 Not Modified.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    first = client.get("/")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Last-Modified"]
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    with patch("app.blueprints.main.main.listing_page") as mock_listing:
+        cached = client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+    mock_listing.assert_not_called()
+
+    create_task_fixture(title="New task", due_date=None)
+    changed = client.get("/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "New task" in changed.get_data(as_text=True)
+
+
+def test_index_task_list_fragment_cache(client, create_task_fixture):
+    """Test that the task list fragment is cached until the data changes.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="Cached task", due_date=None)
+    client.get("/")
+
+    with patch("app.blueprints.main.main.listing_page") as mock_listing:
+        cached = client.get("/")
+        filtered = client.get("/?completed=true")
+    assert "Cached task" in cached.get_data(as_text=True)
+    mock_listing.assert_called_once()
+    assert filtered.status_code == 200
+
+    create_task_fixture(title="Fresh task", due_date=None)
+    assert "Fresh task" in client.get("/").get_data(as_text=True)
+
+
+def test_index_sees_writes_of_other_workers(tmp_path):
+    """Test that a worker renders the tasks written by another worker.
+
+    Each application has its own in-memory cache, as worker processes do, so
+    the reader still holds the page and fragment cached before the write.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        None
+
+    """
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "WTF_CSRF_ENABLED": False,
+    }
+    reader, writer = (create_app(config, config_name="testing") for _ in range(2))
+    with reader.app_context():
+        db.create_all()
+    client = reader.test_client()
+    etag = client.get("/").headers["ETag"]
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+
+    with writer.app_context():
+        create_task("Written elsewhere", None, None)
+        db.engine.dispose()
+
+    changed = client.get("/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert "Written elsewhere" in changed.get_data(as_text=True)
+    etag = changed.headers["ETag"]
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
+
+    with reader.app_context():
+        db.drop_all()
+        db.engine.dispose()
+
+
+def test_index_etag_depends_on_csrf_session(app):
+    """Test that pages embedding different CSRF tokens get different ETags.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    app.config["WTF_CSRF_ENABLED"] = True
+    first, second = app.test_client(), app.test_client()
+
+    etag = first.get("/").headers["ETag"]
+
+    assert first.get("/", headers={"If-None-Match": etag}).status_code == 304
+    assert second.get("/", headers={"If-None-Match": etag}).status_code == 200
+
+
 @pytest.mark.parametrize(
     "task_data",
     [
@@ -311,3 +449,148 @@ def test_delete_task_route_db_error(client, create_task_via_route, task_data):
 
         response = client.post("/delete_task/1", follow_redirects=True)
         assert b"The database error has happened." in response.data
+
+
+def test_index_paginates(app, client, create_task_fixture):
+    """Test that the index page links to the next page of tasks.
+
+    Args:
+        app (Flask): The Flask application fixture.
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    app.config["TASKS_PER_PAGE"] = 2
+    for i in range(3):
+        create_task_fixture(title=f"Task {i}", due_date=None)
+
+    response = client.get("/")
+    response_text = response.get_data(as_text=True)
+    assert "Task 1" in response_text
+    assert "Task 2" not in response_text
+    assert "Next page" in response_text
+
+    response = client.get("/?after=2")
+    response_text = response.get_data(as_text=True)
+    assert "Task 1" not in response_text
+    assert "Task 2" in response_text
+    assert "Next page" not in response_text
+    assert "First page" in response_text
+
+
+def test_index_invalid_cursor(client):
+    """Test that a malformed cursor is reported instead of failing.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    response = client.get("/?after=garbage")
+    assert response.status_code == 200
+    assert b"Invalid page link." in response.data
+
+
+def test_create_tasks_route(client):
+    """Test the bulk task creation endpoint.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    response = client.post(
+        "/create_tasks",
+        json={
+            "tasks": [
+                {"title": "Bulk 1", "description": "Desc 1", "due_date": "2030-01-01"},
+                {"title": "Bulk 2", "description": "Desc 2"},
+            ]
+        },
+    )
+    assert response.status_code == 201
+    assert response.get_json() == {"created": [1, 2]}
+
+
+def test_create_tasks_route_invalid(client):
+    """Test that the bulk creation endpoint rejects invalid tasks.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    response = client.post(
+        "/create_tasks",
+        json={"tasks": [{"title": "Ok", "description": "Desc"}, {"title": ""}]},
+    )
+    assert response.status_code == 400
+    assert set(response.get_json()["errors"]["1"]) == {"title", "description"}
+    assert b"Ok" not in client.get("/").data
+
+
+def test_complete_tasks_route(client, create_task_fixture):
+    """Test the bulk task completion endpoint.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    task_id = create_task_fixture(due_date=None).id
+
+    response = client.post("/complete_tasks", json={"ids": [task_id, 1234]})
+    assert response.status_code == 200
+    assert response.get_json() == {"completed": [task_id], "not_found": [1234]}
+
+
+@pytest.mark.parametrize(
+    "body", [{"ids": "1"}, {"ids": [1, "2"]}, {"filter": {"due_to": "tomorrow"}}, {}]
+)
+def test_delete_tasks_route_bad_request(client, body):
+    """Test that the bulk deletion endpoint rejects malformed bodies.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        body (dict): The request body.
+
+    Returns:
+        None
+
+    """
+    response = client.post("/delete_tasks", json=body)
+    assert response.status_code == 400
+
+
+def test_delete_tasks_route_by_filter(client, create_task_fixture):
+    """Test the bulk task deletion endpoint with a filter.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    early_id = create_task_fixture(title="Early", due_date=datetime(2030, 1, 1)).id
+    create_task_fixture(title="Late", due_date=datetime(2031, 1, 1))
+
+    response = client.post("/delete_tasks", json={"filter": {"due_to": "2030-12-31"}})
+    assert response.status_code == 200
+    assert response.get_json() == {"deleted": [early_id], "not_found": []}
+    response_text = client.get("/").get_data(as_text=True)
+    assert "Early" not in response_text
+    assert "Late" in response_text
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+
+
+def test_metrics_endpoint(client, create_task_via_route):
+    """Test that requests, service calls and SQL statements are reported.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_via_route (function): The function to create a task via route.
+
+    Returns:
+        None
+
+    """
+    create_task_via_route()
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    assert (
+        'http_request_duration_seconds_count{endpoint="main_bp.index",'
+        'method="POST",status="200"} 1'
+    ) in body
+    assert (
+        'service_call_duration_seconds_count{function="create_task",outcome="ok"} 1'
+    ) in body
+    # The data version and task stats rows inserted by create_all, then the
+    # task, its change log entry and its due day count.
+    assert 'db_statement_duration_seconds_count{operation="INSERT"} 5' in body
+    assert 'db_statement_duration_seconds_count{operation="UPDATE"} 2' in body
+    assert "task_cache_invalidations_total 1" in body
+
+
+def test_metrics_disabled():
+    """Test that the endpoint is not exposed when metrics are disabled.
+
+    Returns:
+        None
+
+    """
+    disabled = create_app({"METRICS_ENABLED": False}, config_name="testing")
+    assert disabled.test_client().get("/metrics").status_code == 404
+
+
+def test_failed_requests_are_reported(app):
+    """Test that requests ending in an unhandled exception count as 500s.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+
+    @app.route("/fail")
+    def fail():
+        raise RuntimeError("Failed.")
+
+    client = app.test_client()
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    assert client.get("/fail").status_code == 500
+    app.config["PROPAGATE_EXCEPTIONS"] = True
+    with pytest.raises(RuntimeError):
+        client.get("/fail")
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert (
+        'http_request_duration_seconds_count{endpoint="fail",'
+        'method="GET",status="500"} 2'
+    ) in body
+
+
+def test_failed_statements_are_not_left_timing(app):
+    """Test that a failed statement leaves no start time on its connection.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    with db.engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing_table"))
+        assert connection.info["metrics_query_start"] == []
@@ -16,12 +16,15 @@ def app():
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
         "WTF_CSRF_ENABLED": False,
+        "SECRET_KEY": "test-secret-key",
     }
-    app = create_app(config_object=config)
+    app = create_app(config_object=config, config_name="testing")
+    session = db.session
 
     with app.app_context():
         db.create_all()  # Create all tables
         yield app
+        db.session = session  # Undo tests replacing the session with a mock
         db.drop_all()  # Drop all tables
 
 
@@ -97,3 +100,58 @@ def create_task_via_route(client):
         )
 
     return _create_task_via_route
+
+
+@pytest.fixture()
+def async_app(tmp_path):
+    """Create a Flask application with the async API on a file database.
+
+    The sync and async engines only share file databases, not in-memory ones.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "ASYNC_API_ENABLED": True,
+    }
+    app = create_app(config_object=config, config_name="testing")
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture()
+def events_app(tmp_path):
+    """Create a Flask application serving the change feed on a file database.
+
+    The change broker polls the database from its own thread, which cannot
+    share the connection of an in-memory database.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "EVENTS_HEARTBEAT": 0.05,
+        "WTF_CSRF_ENABLED": False,
+    }
+    app = create_app(config_object=config, config_name="testing")
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions["change_broker"].close()
+        db.drop_all()
+        db.engine.dispose()
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from app.asgi import ThreadPoolWsgiToAsgi, create_asgi_app
+from app.services import create_task
+
+
+async def asgi_get(asgi_app, path):
+    """Send a GET request to an ASGI application.
+
+    Args:
+        asgi_app (function): The ASGI application.
+        path (str): The request path.
+
+    Returns:
+        tuple: The response status and body.
+
+    """
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return messages[0]["status"], body
+
+
+def test_requests_run_concurrently():
+    """Test that a slow request does not hold up the others.
+
+    Both requests wait for each other, which only completes when they run
+    on separate threads at the same time.
+
+    Returns:
+        None
+
+    """
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wsgi_app(environ, start_response):
+        barrier.wait()
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [threading.current_thread().name.encode()]
+
+    async def both():
+        asgi_app = ThreadPoolWsgiToAsgi(wsgi_app, threads=2)
+        return await asyncio.gather(*(asgi_get(asgi_app, "/") for _ in range(2)))
+
+    responses = asyncio.run(both())
+
+    assert [status for status, _ in responses] == [200, 200]
+    assert len({body for _, body in responses}) == 2
+
+
+def test_async_views_are_served(async_app):
+    """Test that sync and async views are served through the ASGI adapter.
+
+    Args:
+        async_app (Flask): The application with the async API enabled.
+
+    Returns:
+        None
+
+    """
+    create_task("Served", None, None)
+    asgi_app = create_asgi_app(async_app)
+
+    async def listings():
+        return await asyncio.gather(
+            asgi_get(asgi_app, "/api/v1/tasks"),
+            asgi_get(asgi_app, "/api/v1/async/tasks"),
+        )
+
+    for status, body in asyncio.run(listings()):
+        assert status == 200
+        assert b'"Served"' in body
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app import async_services
+from app.async_services import async_database_uri
+from app.services import InvalidCursorError, TaskNotFoundError, list_tasks
+
+
+@pytest.mark.parametrize(
+    "config, expected",
+    [
+        ({"SQLALCHEMY_DATABASE_URI": "sqlite:///app.db"}, "sqlite+aiosqlite:///app.db"),
+        (
+            {"SQLALCHEMY_DATABASE_URI": "postgresql://u@db/tasks"},
+            "postgresql+asyncpg://u@db/tasks",
+        ),
+        (
+            {
+                "SQLALCHEMY_DATABASE_URI": "sqlite:///app.db",
+                "ASYNC_DATABASE_URI": "sqlite+aiosqlite:///other.db",
+            },
+            "sqlite+aiosqlite:///other.db",
+        ),
+    ],
+)
+def test_async_database_uri(config, expected):
+    """Test that the async URI defaults to the async driver of the database.
+
+    Args:
+        config (dict): The application configuration.
+        expected (str): The expected async URI.
+
+    Returns:
+        None
+
+    """
+    assert async_database_uri(config).render_as_string() == expected
+
+
+def test_async_services(async_app):
+    """Test the async services against the data of the sync engine.
+
+    Args:
+        async_app (Flask): The application with the async API enabled.
+
+    Returns:
+        None
+
+    """
+    task = asyncio.run(async_services.create_task("Async", "Desc", None))
+    asyncio.run(async_services.create_task("Second", None, None))
+
+    page = asyncio.run(async_services.list_tasks(limit=1))
+    assert [t.title for t in page.items] == ["Async"]
+    assert [t.title for t in list_tasks().items] == ["Async", "Second"]
+
+    completed = asyncio.run(async_services.complete_task(task.id))
+    assert completed.completed is True
+    assert asyncio.run(async_services.get_task_row(task.id)).completed is True
+
+    asyncio.run(async_services.delete_task(task.id))
+    with pytest.raises(TaskNotFoundError):
+        asyncio.run(async_services.delete_task(task.id))
+    rows = asyncio.run(async_services.list_task_rows())
+    assert [row.title for row in rows.items] == ["Second"]
+    with pytest.raises(InvalidCursorError):
+        asyncio.run(async_services.list_task_rows(after="garbage"))
+
+
+def test_async_services_concurrent_calls(async_app):
+    """Test that async services can run concurrently in one event loop.
+
+    Args:
+        async_app (Flask): The application with the async API enabled.
+
+    Returns:
+        None
+
+    """
+
+    async def create_many():
+        return await asyncio.gather(
+            *(async_services.create_task(f"Task {i}", None, None) for i in range(5))
+        )
+
+    tasks = asyncio.run(create_many())
+
+    assert sorted(task.id for task in tasks) == [1, 2, 3, 4, 5]
@@ -0,0 +1,185 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from app import create_app, db
+from app.cache import CacheBackend, LRUCache, NullCache, SQLiteCache, init_cache
+from app.services import cache_stats, create_task, list_task_rows
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the LRU cache drops the least recently used entry.
+
+    Returns:
+        None
+
+    """
+    cache = LRUCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_expires_entries():
+    """Test that entries older than the TTL are not returned.
+
+    Returns:
+        None
+
+    """
+    cache = LRUCache(ttl=10, maxsize=2)
+    with patch.object(LRUCache, "clock", return_value=100):
+        cache.set("a", 1)
+    with patch.object(LRUCache, "clock", return_value=111):
+        assert cache.get("a") is None
+
+
+def test_sqlite_cache_is_shared(tmp_path):
+    """Test that SQLite caches on the same file share entries and clears.
+
+    Args:
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        None
+
+    """
+    path = str(tmp_path / "cache.db")
+    first = SQLiteCache(ttl=60, path=path)
+    second = SQLiteCache(ttl=60, path=path)
+
+    first.set("key", {"value": 1})
+    assert second.get("key") == {"value": 1}
+
+    second.clear()
+    assert first.get("key") is None
+
+
+def test_null_cache():
+    """Test that the null cache never returns anything.
+
+    Returns:
+        None
+
+    """
+    cache = NullCache(ttl=60)
+    cache.set("key", 1)
+    assert cache.get("key") is None
+
+
+def test_incomplete_backend_cannot_be_created():
+    """Test that a backend missing a storage method fails when created.
+
+    Returns:
+        None
+
+    """
+
+    class GetOnly(CacheBackend):
+        def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnly(ttl=60)
+
+
+def test_counters_are_exact_under_concurrency():
+    """Test that hits and misses counted from many threads add up.
+
+    Returns:
+        None
+
+    """
+    cache = LRUCache(ttl=60, maxsize=10)
+    cache.set("hit", 1)
+    keys = ["hit", "miss"] * 20000
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(cache.get, keys))
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (20000, 20000)
+
+
+def test_list_task_rows_is_cached_until_write(client):
+    """Test that listings are served from the cache until a task changes.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    create_task("First", "Desc", None)
+    list_task_rows()
+    assert [row.title for row in list_task_rows().items] == ["First"]
+    assert cache_stats()["hits"] == 1
+
+    create_task("Second", "Desc", None)
+    assert [row.title for row in list_task_rows().items] == ["First", "Second"]
+    assert cache_stats()["misses"] == 2
+
+
+def test_listings_see_writes_of_other_workers(tmp_path):
+    """Test that a cached listing is not served after another worker's write.
+
+    Each application has its own in-memory cache, as worker processes do.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        None
+
+    """
+    config = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}"}
+    reader, writer = (create_app(config, config_name="testing") for _ in range(2))
+    with reader.app_context():
+        db.create_all()
+        assert list_task_rows().items == []
+        assert list_task_rows().items == []
+        assert cache_stats()["hits"] == 1
+
+    with writer.app_context():
+        create_task("Written elsewhere", None, None)
+        db.engine.dispose()
+
+    with reader.app_context():
+        assert [row.title for row in list_task_rows().items] == ["Written elsewhere"]
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_cache_backend_config(app, backend, tmp_path):
+    """Test that the configured backend serves the API listing.
+
+    Args:
+        app (Flask): The Flask application fixture.
+        backend (str): The cache backend name.
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        None
+
+    """
+    app.config["TASK_CACHE_BACKEND"] = backend
+    app.config["TASK_CACHE_PATH"] = str(tmp_path / "cache.db")
+    init_cache(app)
+    client = app.test_client()
+
+    client.get("/api/v1/tasks")
+    client.get("/api/v1/tasks")
+
+    stats = client.get("/api/v1/cache").get_json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
@@ -0,0 +1,260 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services import changes_since, complete_task, delete_task, list_task_rows
+
+
+def test_export_csv(runner, create_task_fixture):
+    """Test exporting every task as CSV.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="First", due_date=datetime(2030, 1, 1))
+    create_task_fixture(title="Second, with comma", due_date=None)
+
+    result = runner.invoke(args=["tasks", "export", "--batch-size", "1"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        "id,title,description,due_date,completed,recurrence",
+        "1,First,Default Description,2030-01-01T00:00:00,False,",
+        '2,"Second, with comma",Default Description,,False,',
+    ]
+
+
+def test_export_ndjson_filtered(runner, create_task_fixture, tmp_path):
+    """Test exporting the completed tasks as NDJSON into a file.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        create_task_fixture (function): The fixture to create a task.
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        None
+
+    """
+    done = create_task_fixture(title="Done", due_date=None)
+    create_task_fixture(title="Open", due_date=None)
+    complete_task(done.id)
+    output = tmp_path / "tasks.ndjson"
+
+    result = runner.invoke(
+        args=[
+            "tasks",
+            "export",
+            "--format",
+            "ndjson",
+            "--completed",
+            "--output",
+            str(output),
+        ]
+    )
+
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["title"] for row in rows] == ["Done"]
+
+
+def test_import_csv(runner, tmp_path):
+    """Test importing tasks from a CSV file in several batches.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        None
+
+    """
+    path = tmp_path / "tasks.csv"
+    path.write_text(
+        "title,description,due_date\n"
+        "First,Desc 1,2030-01-01\n"
+        "Second,Desc 2,\n"
+        "Third,Desc 3,2031-01-01\n"
+    )
+
+    result = runner.invoke(args=["tasks", "import", str(path), "--batch-size", "2"])
+
+    assert result.exit_code == 0
+    assert "Imported 3 tasks, rejected 0 rows" in result.output
+    assert [row.title for row in list_task_rows().items] == ["First", "Second", "Third"]
+    assert list_task_rows().items[0].due_date == datetime(2030, 1, 1)
+
+
+def test_import_ndjson_rejects(runner, tmp_path):
+    """Test that invalid NDJSON rows are written to the rejects file.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        None
+
+    """
+    path = tmp_path / "tasks.ndjson"
+    path.write_text(
+        '{"title": "Valid", "description": "Desc"}\n'
+        '{"title": "", "description": "Desc"}\n'
+        "not json\n"
+    )
+    rejects = tmp_path / "rejects.ndjson"
+
+    result = runner.invoke(
+        args=["tasks", "import", str(path), "--rejects", str(rejects)]
+    )
+
+    assert result.exit_code == 0
+    assert "Imported 1 tasks, rejected 2 rows" in result.output
+    records = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [record["line"] for record in records] == [2, 3]
+    assert "title" in records[0]["errors"]
+    assert [row.title for row in list_task_rows().items] == ["Valid"]
+
+
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+def test_export_import_round_trip(runner, create_task_fixture, tmp_path, export_format):
+    """Test that an export imports back into the same tasks.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        create_task_fixture (function): The fixture to create a task.
+        tmp_path (Path): A temporary directory.
+        export_format (str): The file format.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="Dated", due_date=datetime(2030, 1, 2, 9, 30))
+    create_task_fixture(title="Undated", due_date=None)
+    path = tmp_path / f"tasks.{export_format}"
+
+    exported = runner.invoke(
+        args=["tasks", "export", "--format", export_format, "--output", str(path)]
+    )
+    result = runner.invoke(args=["tasks", "import", str(path)])
+
+    assert exported.exit_code == 0
+    assert result.exit_code == 0
+    assert "Imported 2 tasks, rejected 0 rows" in result.output
+    rows = [
+        (row.title, row.description, row.due_date, row.recurrence)
+        for row in list_task_rows().items
+    ]
+    assert rows[2:] == rows[:2]
+    assert rows[0][2] == datetime(2030, 1, 2, 9, 30)
+
+
+def test_import_unknown_extension(runner, tmp_path):
+    """Test that the format must be given when it cannot be inferred.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        None
+
+    """
+    path = tmp_path / "tasks.txt"
+    path.write_text("")
+
+    result = runner.invoke(args=["tasks", "import", str(path)])
+
+    assert result.exit_code != 0
+    assert "--format" in result.output
+
+
+def test_prune_changes(runner, create_task_fixture):
+    """Test that the prune-changes command keeps the newest changes.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    for _ in range(3):
+        create_task_fixture(due_date=None)
+
+    result = runner.invoke(args=["tasks", "prune-changes", "--keep", "1"])
+
+    assert result.exit_code == 0
+    assert "Pruned 2 task changes." in result.output
+    assert [change.kind for change in changes_since(0)] == ["created"]
+
+
+def test_reconcile_stats(runner, create_task_fixture):
+    """Test that the reconcile-stats command reports the recomputed counts.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(due_date=None)
+    create_task_fixture(due_date=datetime(2000, 1, 1))
+
+    result = runner.invoke(args=["tasks", "reconcile-stats"])
+
+    assert result.exit_code == 0
+    assert "2 open and 0 completed tasks, 1 overdue." in result.output
+
+
+def test_compact(runner, create_task_fixture):
+    """Test that the compact command purges and archives tasks.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    completed = create_task_fixture(due_date=None).id
+    deleted = create_task_fixture(due_date=None).id
+    complete_task(completed)
+    delete_task(deleted)
+
+    result = runner.invoke(
+        args=["tasks", "compact", "--archive-after", "0", "--purge-after", "0"]
+    )
+
+    assert result.exit_code == 0
+    assert "Purged 1 deleted tasks and archived 1 completed tasks" in result.output
+    assert list_task_rows().items == []
+
+
+def test_profile_startup(runner):
+    """Test that profile-startup reports the slowest packages.
+
+    Args:
+        runner (FlaskCliRunner): The Flask CLI test runner.
+
+    Returns:
+        None
+
+    """
+    result = runner.invoke(args=["profile-startup", "--limit", "3"])
+
+    assert result.exit_code == 0
+    assert "Cold start:" in result.output
+    assert "sqlalchemy" in result.output
+    assert len(result.output.splitlines()) == 5
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from app import create_app, db
+from app.models import ArchivedTask
+from app.services import complete_task, create_task
+
+
+@pytest.fixture()
+def compaction_app(tmp_path):
+    """Create an application compacting tasks in the background.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "COMPACTION_INTERVAL": 0.05,
+        "TASK_ARCHIVE_AFTER_DAYS": 0,
+    }
+    app = create_app(config_object=config, config_name="testing")
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions["compaction"].close()
+        db.drop_all()
+        db.engine.dispose()
+
+
+def test_scheduler_archives_completed_tasks(compaction_app):
+    """Test that the scheduler runs the compaction job periodically.
+
+    Args:
+        compaction_app (Flask): The application with compaction scheduled.
+
+    Returns:
+        None
+
+    """
+    task_id = create_task("Task", "Description", None).id
+    complete_task(task_id)
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if db.session.scalar(db.select(db.func.count(ArchivedTask.id))):
+            break
+        db.session.rollback()
+        time.sleep(0.05)
+
+    assert db.session.scalar(db.select(ArchivedTask.task_id)) == task_id
+
+
+def test_scheduler_disabled_by_default(app):
+    """Test that no compaction thread runs unless an interval is set.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    assert "compaction" not in app.extensions
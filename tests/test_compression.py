@@ -0,0 +1,84 @@
+import gzip
+
+import pytest
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+@pytest.mark.parametrize(
+    "accept, encoding, decompress",
+    [
+        ("gzip", "gzip", gzip.decompress),
+        pytest.param(
+            "gzip, br",
+            "br",
+            lambda data: brotli.decompress(data),
+            marks=pytest.mark.skipif(brotli is None, reason="brotli not installed"),
+        ),
+    ],
+)
+def test_index_is_compressed(client, accept, encoding, decompress):
+    """Test that rendered pages are compressed with an accepted encoding.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        accept (str): The Accept-Encoding request header.
+        encoding (str): The expected Content-Encoding.
+        decompress (function): Decompresses the body.
+
+    Returns:
+        None
+
+    """
+    response = client.get("/", headers={"Accept-Encoding": accept})
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) == len(response.get_data())
+    assert b"Task Manager" in decompress(response.get_data())
+
+
+def test_small_and_unaccepted_responses_are_not_compressed(client):
+    """Test that small bodies and clients without gzip get plain responses.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    small = client.get("/api/v1/cache", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/")
+
+    assert "Content-Encoding" not in small.headers
+    assert "Content-Encoding" not in plain.headers
+    assert b"Task Manager" in plain.get_data()
+
+
+def test_compressed_api_etag_is_weak(client, create_task_fixture):
+    """Test that compressing a strongly tagged response weakens its ETag.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    for i in range(10):
+        create_task_fixture(title=f"Task {i}", due_date=None)
+
+    response = client.get("/api/v1/tasks", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"].startswith('W/"')
+    etag = response.headers["ETag"]
+    cached = client.get(
+        "/api/v1/tasks", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
@@ -0,0 +1,181 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from app import create_app, db
+from app.models import Task, TaskChange
+from app.services import (
+    TaskConflictError,
+    TaskNotFoundError,
+    complete_task,
+    create_tasks,
+    delete_task,
+    get_task_row,
+    task_stats,
+)
+
+WORKERS = 8
+TASKS = 25
+
+
+@pytest.fixture()
+def file_app(tmp_path):
+    """Create an application on a database file shared by several threads.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "SQLALCHEMY_POOL_SIZE": WORKERS + 1,
+    }
+    app = create_app(config_object=config, config_name="testing")
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+        db.engine.dispose()
+
+
+def run_workers(app, worker):
+    """Run a function in `WORKERS` threads, each in its own app context.
+
+    Args:
+        app (Flask): The application.
+        worker (function): Called with the worker number.
+
+    Returns:
+        list: The unexpected exceptions raised by the workers.
+
+    """
+    errors = []
+
+    def run(number):
+        try:
+            with app.app_context():
+                worker(number)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def logged_changes():
+    """Count the logged changes of every task.
+
+    Returns:
+        Counter: The number of changes per ``(task_id, kind)`` pair.
+
+    """
+    db.session.rollback()
+    rows = db.session.execute(db.select(TaskChange.task_id, TaskChange.kind)).all()
+    return Counter((row.task_id, row.kind) for row in rows)
+
+
+def test_concurrent_completes_and_deletes(file_app):
+    """Test that racing workers apply every change exactly once.
+
+    Args:
+        file_app (Flask): The application on a database file.
+
+    Returns:
+        None
+
+    """
+    task_ids = create_tasks([{"title": f"Task {i}"} for i in range(TASKS)])
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def worker(number):
+        for task_id in task_ids:
+            for action in (complete_task, delete_task):
+                try:
+                    action(task_id)
+                    outcome = "ok"
+                except TaskNotFoundError:
+                    outcome = "not_found"
+                with lock:
+                    outcomes[action.__name__, outcome] += 1
+
+    assert run_workers(file_app, worker) == []
+
+    changes = logged_changes()
+    assert outcomes["delete_task", "ok"] == TASKS
+    for task_id in task_ids:
+        assert changes[task_id, "deleted"] == 1
+        assert changes[task_id, "completed"] <= 1
+    versions = dict(db.session.execute(db.select(Task.id, Task.version)).all())
+    for task_id in task_ids:
+        assert versions[task_id] == 2 + changes[task_id, "completed"]
+    assert task_stats()["total"] == 0
+
+
+def test_conditional_updates_do_not_lose_updates(file_app):
+    """Test that of workers updating the same version, only one succeeds.
+
+    Args:
+        file_app (Flask): The application on a database file.
+
+    Returns:
+        None
+
+    """
+    task_ids = create_tasks([{"title": f"Task {i}"} for i in range(TASKS)])
+    barrier = threading.Barrier(WORKERS, timeout=30)
+    succeeded = Counter()
+    lock = threading.Lock()
+
+    def worker(number):
+        action = complete_task if number % 2 else delete_task
+        for task_id in task_ids:
+            version = get_task_row(task_id).version
+            # Ends the read transaction, like the end of a request would.
+            db.session.rollback()
+            barrier.wait()
+            try:
+                action(task_id, expected_version=version)
+            except (TaskConflictError, TaskNotFoundError):
+                continue
+            with lock:
+                succeeded[task_id] += 1
+
+    assert run_workers(file_app, worker) == []
+
+    changes = logged_changes()
+    for task_id in task_ids:
+        assert succeeded[task_id] == 1
+        assert changes[task_id, "completed"] + changes[task_id, "deleted"] == 1
+
+
+def test_conflicting_version(app, create_task_fixture):
+    """Test that an update based on an outdated version is reported.
+
+    Args:
+        app (Flask): The Flask application.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    task = create_task_fixture(due_date=None)
+    assert task.version == 1
+
+    assert complete_task(task.id, expected_version=1).version == 2
+    with pytest.raises(TaskConflictError) as excinfo:
+        delete_task(task.id, expected_version=1)
+    assert excinfo.value.version == 2
+    assert delete_task(task.id, expected_version=2).version == 3
+    with pytest.raises(TaskNotFoundError):
+        delete_task(task.id, expected_version=3)
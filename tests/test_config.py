@@ -0,0 +1,129 @@
+import pytest
+from sqlalchemy import text
+
+from app import create_app, db
+from app.config import Config, engine_options
+
+
+def _config(uri, **overrides):
+    """Build a configuration mapping for engine_options.
+
+    Args:
+        uri (str): The database URI.
+        **overrides: Configuration values overriding the defaults.
+
+    Returns:
+        dict: The configuration values.
+
+    """
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    config.update(SQLALCHEMY_DATABASE_URI=uri, **overrides)
+    return config
+
+
+@pytest.mark.parametrize(
+    "config_name, debug, testing",
+    [("development", True, False), ("testing", False, True)],
+)
+def test_config_profiles(config_name, debug, testing):
+    """Test that create_app loads the requested configuration profile.
+
+    Args:
+        config_name (str): The configuration profile.
+        debug (bool): The expected DEBUG value.
+        testing (bool): The expected TESTING value.
+
+    Returns:
+        None
+
+    """
+    app = create_app(config_name=config_name)
+    assert app.config["DEBUG"] is debug
+    assert app.config["TESTING"] is testing
+
+
+def test_config_profile_from_env(monkeypatch):
+    """Test that the APP_CONFIG environment variable selects the profile.
+
+    Args:
+        monkeypatch (MonkeyPatch): The pytest monkeypatch fixture.
+
+    Returns:
+        None
+
+    """
+    monkeypatch.setenv("APP_CONFIG", "testing")
+    assert create_app().config["TESTING"]
+
+
+def test_production_requires_secret_key():
+    """Test that the production profile refuses to start without a secret key.
+
+    Returns:
+        None
+
+    """
+    with pytest.raises(RuntimeError):
+        create_app({"SECRET_KEY": None}, config_name="production")
+
+
+def test_production_metrics_are_opt_in():
+    """Test that the production profile does not expose metrics by default.
+
+    Returns:
+        None
+
+    """
+    config = {"SECRET_KEY": "secret", "SQLALCHEMY_DATABASE_URI": "sqlite://"}
+    app = create_app(config, config_name="production")
+    assert app.config["METRICS_ENABLED"] is False
+    assert app.test_client().get("/metrics").status_code == 404
+
+
+def test_engine_options_memory_sqlite():
+    """Test that in-memory SQLite databases get no pool options.
+
+    Returns:
+        None
+
+    """
+    assert engine_options(_config("sqlite:///:memory:")) == {}
+
+
+def test_engine_options_postgresql():
+    """Test the pool and statement timeout options of server databases.
+
+    Returns:
+        None
+
+    """
+    options = engine_options(
+        _config(
+            "postgresql://user@localhost/tasks",
+            SQLALCHEMY_POOL_SIZE=20,
+            DATABASE_STATEMENT_TIMEOUT_MS=1500,
+        )
+    )
+    assert options["pool_size"] == 20
+    assert options["pool_pre_ping"]
+    assert options["connect_args"] == {"options": "-c statement_timeout=1500"}
+
+
+def test_sqlite_pragmas(tmp_path):
+    """Test that the SQLite pragmas are applied to file databases.
+
+    Args:
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        None
+
+    """
+    app = create_app(
+        {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}"},
+        config_name="testing",
+    )
+    with app.app_context(), db.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
@@ -0,0 +1,184 @@
+import json
+import threading
+
+from app.events import ChangeBroker
+from app.models import TaskChange, db
+from app.services import (
+    change_log_bounds,
+    changes_since,
+    complete_task,
+    create_task,
+    create_tasks,
+    delete_task,
+    prune_changes,
+)
+
+
+def parse_event(text):
+    """Parse a rendered Server-Sent Event.
+
+    Args:
+        text (str): The event.
+
+    Returns:
+        tuple: The event id, the event type and the decoded data.
+
+    """
+    fields = dict(line.split(": ", 1) for line in text.strip().splitlines())
+    return int(fields["id"]), fields["event"], json.loads(fields["data"])
+
+
+def test_change_log(app):
+    """Test that task mutations append to the change log.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    removed = create_task("Removed", "Description", None)
+    kept = create_task("Kept", "Description", None)
+    complete_task(kept.id)
+    delete_task(removed.id)
+    create_tasks([{"title": "Bulk"}])
+
+    changes = changes_since(0)
+
+    assert [(c.kind, c.id) for c in changes] == [
+        ("created", removed.id),
+        ("created", kept.id),
+        ("completed", kept.id),
+        ("deleted", removed.id),
+        ("reset", None),
+    ]
+    assert changes[0].title is None
+    assert changes[1].title == "Kept" and changes[1].completed is True
+    assert [c.change_id for c in changes_since(changes[2].change_id)] == [
+        changes[3].change_id,
+        changes[4].change_id,
+    ]
+
+
+def test_complete_completed_task_logs_nothing(app):
+    """Test that completing a completed task does not log a change.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    task = create_task("Task", "Description", None)
+    complete_task(task.id)
+    complete_task(task.id)
+
+    assert [c.kind for c in changes_since(0)] == ["created", "completed"]
+
+
+def test_prune_changes(app):
+    """Test that pruning keeps the most recent changes.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    for i in range(5):
+        create_task(f"Task {i}", "Description", None)
+
+    assert prune_changes(keep=2) == 3
+    assert db.session.query(TaskChange).count() == 2
+    assert change_log_bounds().first == 4
+    assert prune_changes(keep=2) == 0
+
+
+def test_broker_publishes_new_changes(events_app):
+    """Test that subscribers wait for and receive committed changes.
+
+    Args:
+        events_app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    broker = events_app.extensions["change_broker"]
+    last_id = broker.start()
+    received = []
+
+    def subscribe():
+        received.extend(broker.events_after(last_id, timeout=5))
+
+    subscriber = threading.Thread(target=subscribe)
+    subscriber.start()
+    task = create_task("Task", "Description", None)
+    subscriber.join()
+
+    assert [parse_event(text) for _, text in received] == [
+        (
+            last_id + 1,
+            "created",
+            {
+                "id": task.id,
+                "title": "Task",
+                "description": "Description",
+                "due_date": None,
+                "completed": False,
+                "recurrence": None,
+            },
+        )
+    ]
+    assert broker.events_after(last_id, timeout=0) == received
+
+
+def test_broker_replays_changes_older_than_buffer(events_app):
+    """Test that lagging subscribers read the changes from the change log.
+
+    Args:
+        events_app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    broker = ChangeBroker(events_app, poll_interval=60, buffer_size=2)
+    broker.start()
+    tasks = [create_task(f"Task {i}", "Description", None) for i in range(4)]
+    broker._poll()
+
+    events = [parse_event(text) for _, text in broker.events_after(0, timeout=0)]
+    buffered = [parse_event(text) for _, text in broker.events_after(2, timeout=0)]
+    broker.close()
+
+    assert [(event_id, data["id"]) for event_id, _, data in events] == [
+        (i + 1, task.id) for i, task in enumerate(tasks)
+    ]
+    assert [event_id for event_id, _, _ in buffered] == [3, 4]
+
+
+def test_broker_resets_clients_resuming_from_pruned_changes(events_app):
+    """Test that clients resuming from pruned changes are told to reload.
+
+    Args:
+        events_app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    broker = ChangeBroker(events_app, poll_interval=60, buffer_size=1)
+    broker.start()
+    for i in range(3):
+        create_task(f"Task {i}", "Description", None)
+    broker._poll()
+    prune_changes(keep=1)
+
+    events = [parse_event(text) for _, text in broker.events_after(1, timeout=0)]
+    broker.close()
+
+    assert events == [(3, "reset", {})]
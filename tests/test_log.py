@@ -0,0 +1,146 @@
+import json
+import logging
+
+import pytest
+
+from app import create_app
+from app.log import JsonFormatter, SamplingFilter, parse_sampling, shutdown_logging
+
+
+def _record(name="app.services", level=logging.INFO, msg="Task %s", args=(1,)):
+    """Build a log record.
+
+    Args:
+        name (str): The logger name.
+        level (int): The record level.
+        msg (str): The message format.
+        args (tuple): The message arguments.
+
+    Returns:
+        LogRecord: The record.
+
+    """
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture()
+def log_app(request):
+    """Create an application logging synchronously, as configured.
+
+    Args:
+        request (FixtureRequest): Parametrized with configuration overrides.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    config = {"LOG_QUEUE_ENABLED": False, **getattr(request, "param", {})}
+    yield create_app(config_object=config, config_name="testing")
+    shutdown_logging()
+
+
+def test_parse_sampling():
+    """Test parsing the LOG_SAMPLING setting.
+
+    Returns:
+        None
+
+    """
+    assert parse_sampling("") == {}
+    assert parse_sampling("app.services=0.1, app=0.5") == {
+        "app.services": 0.1,
+        "app": 0.5,
+    }
+    for value in ("app.services", "app=2", "=0.5"):
+        with pytest.raises(ValueError):
+            parse_sampling(value)
+
+
+def test_sampling_filter():
+    """Test that sampling keeps one info record in ten but every warning.
+
+    Returns:
+        None
+
+    """
+    sampler = SamplingFilter({"app": 0.1})
+
+    kept = [sampler.filter(_record()) for _ in range(100)]
+    assert kept.count(True) == 10
+    warnings = [sampler.filter(_record(level=logging.WARNING)) for _ in range(10)]
+    assert all(warnings)
+    assert all(sampler.filter(_record(name="sqlalchemy")) for _ in range(10))
+
+
+def test_json_formatter():
+    """Test the JSON rendering of a record.
+
+    Returns:
+        None
+
+    """
+    record = _record()
+    record.request_id = "abc"
+    record.sample_rate = 0.1
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.services"
+    assert entry["message"] == "Task 1"
+    assert entry["request_id"] == "abc"
+    assert entry["sample_rate"] == 0.1
+
+
+@pytest.mark.parametrize("log_app", [{"LOG_FORMAT": "json"}], indirect=True)
+def test_request_id(log_app, capsys):
+    """Test that requests are given an id, echoed back and logged.
+
+    Args:
+        log_app (Flask): The application, logging JSON lines.
+        capsys (CaptureFixture): The pytest output capture fixture.
+
+    Returns:
+        None
+
+    """
+
+    @log_app.route("/log")
+    def log_view():
+        logging.getLogger("app.views").warning("Logged %d", 42)
+        return "ok"
+
+    client = log_app.test_client()
+    capsys.readouterr()
+
+    response = client.get("/log", headers={"X-Request-ID": "client-id.1"})
+    assert response.headers["X-Request-ID"] == "client-id.1"
+    entry = json.loads(capsys.readouterr().err.splitlines()[-1])
+    assert entry["message"] == "Logged 42"
+    assert entry["request_id"] == "client-id.1"
+
+    response = client.get("/log", headers={"X-Request-ID": "not an id"})
+    assert len(response.headers["X-Request-ID"]) == 32
+
+
+@pytest.mark.parametrize("log_app", [{"LOG_QUEUE_ENABLED": True}], indirect=True)
+def test_queued_logging(log_app, capsys):
+    """Test that queued records are written by the listener thread.
+
+    Args:
+        log_app (Flask): The application, logging through a queue.
+        capsys (CaptureFixture): The pytest output capture fixture.
+
+    Returns:
+        None
+
+    """
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("app.services").exception("Failed task %s", 7)
+    shutdown_logging()
+
+    output = capsys.readouterr().err
+    assert "ERROR app.services [-] Failed task 7" in output
+    assert "RuntimeError: boom" in output
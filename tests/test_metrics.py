@@ -0,0 +1,44 @@
+from app.metrics import CallbackMetric, Histogram, MetricsRegistry
+
+
+def test_histogram_render():
+    """Test the Prometheus rendering of a labelled histogram.
+
+    Returns:
+        None
+
+    """
+    registry = MetricsRegistry()
+    histogram = registry.register(
+        Histogram("latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1))
+    )
+    histogram.observe(0.05, endpoint="index")
+    histogram.observe(0.5, endpoint="index")
+    histogram.observe(5, endpoint="index")
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{endpoint="index",le="0.1"} 1',
+        'latency_seconds_bucket{endpoint="index",le="1"} 2',
+        'latency_seconds_bucket{endpoint="index",le="+Inf"} 3',
+        'latency_seconds_sum{endpoint="index"} 5.55',
+        'latency_seconds_count{endpoint="index"} 3',
+    ]
+
+
+def test_callback_metric_render():
+    """Test that callback metrics are read when rendered.
+
+    Returns:
+        None
+
+    """
+    registry = MetricsRegistry()
+    values = iter([1, 2])
+    registry.register(
+        CallbackMetric("hits_total", "Hits.", "counter", lambda: next(values))
+    )
+
+    assert "hits_total 1" in registry.render()
+    assert "hits_total 2" in registry.render()
@@ -0,0 +1,108 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from app import create_app, db
+from app.profiling import (
+    DEFERRED_MODULES,
+    PROJECT_ROOT,
+    package_totals,
+    parse_importtime,
+    profile_startup,
+)
+
+# Cold start budget, in milliseconds, for importing and creating the app.
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "1500"))
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     sqlalchemy.util
+import time:       400 |        500 |   sqlalchemy
+import time:      1000 |       1000 |   flask.app
+import time:       200 |       1700 | flask
+"""
+
+
+def test_parse_importtime():
+    """Test parsing the report of ``python -X importtime``.
+
+    Returns:
+        None
+
+    """
+    entries = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert entries[0] == ("sqlalchemy.util", 100, 100)
+    assert package_totals(entries) == [("flask", 1.2, 2), ("sqlalchemy", 0.5, 2)]
+
+
+def test_cold_start_budget():
+    """Test that a cold start stays within budget without deferred modules.
+
+    Returns:
+        None
+
+    """
+    reports = [profile_startup("testing", breakdown=False) for _ in range(3)]
+
+    assert statistics.median(r["total_ms"] for r in reports) < STARTUP_BUDGET_MS
+    assert not set(DEFERRED_MODULES) & set(reports[0]["modules"])
+
+
+def test_json_api_does_not_load_forms():
+    """Test that serving the JSON API does not import the form modules.
+
+    Returns:
+        None
+
+    """
+    script = (
+        "import sys\n"
+        "from app import create_app, db\n"
+        "app = create_app(config_name='testing')\n"
+        "with app.app_context():\n"
+        "    db.create_all()\n"
+        "assert app.test_client().get('/api/v1/tasks').status_code == 200\n"
+        "print(sorted(sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+    )
+
+    assert "wtforms" not in result.stdout
+
+
+def test_task_commands_do_not_load_migrations(tmp_path):
+    """Test that ``flask tasks`` commands do not import Flask-Migrate.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        None
+
+    """
+    uri = f"sqlite:///{tmp_path / 'tasks.db'}"
+    app = create_app({"SQLALCHEMY_DATABASE_URI": uri}, config_name="testing")
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "flask", "tasks", "export"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "APP_CONFIG": "development", "DATABASE_URL": uri},
+    )
+    modules = {module.strip() for module, _, _ in parse_importtime(result.stderr)}
+
+    assert result.stdout.startswith("id,title")
+    assert "app.cli" in modules
+    assert not {"alembic", "flask_migrate"} & modules
@@ -0,0 +1,194 @@
+from datetime import date, datetime
+
+import pytest
+
+from app import db
+from app.models import Task
+from app.recurrence import next_occurrence, normalize_rule, occurrences
+from app.services import (
+    TaskOccurrence,
+    complete_task,
+    complete_tasks,
+    create_task,
+    list_task_rows,
+    list_tasks,
+    task_stats,
+)
+
+
+def test_normalize_rule():
+    """Test that rules are stored without prefix or start date.
+
+    Returns:
+        None
+
+    """
+    assert normalize_rule(" RRULE:FREQ=WEEKLY;byday=MO ", date(2030, 1, 1)) == (
+        "FREQ=WEEKLY;BYDAY=MO"
+    )
+    assert normalize_rule("FREQ=DAILY", "2030-01-01T09:30") == "FREQ=DAILY"
+    for text, due_date in [
+        ("FREQ=DAILY", None),
+        ("FREQ=DAILY", "tomorrow"),
+        ("FREQ=SOMETIMES", date(2030, 1, 1)),
+        ("DTSTART:20300101T000000\nRRULE:FREQ=DAILY", date(2030, 1, 1)),
+    ]:
+        with pytest.raises(ValueError):
+            normalize_rule(text, due_date)
+
+
+def test_next_occurrence_counts_down():
+    """Test that each instance's rule starts at its own due date.
+
+    Returns:
+        None
+
+    """
+    assert next_occurrence("FREQ=MONTHLY;COUNT=3", date(2030, 1, 31)) == (
+        datetime(2030, 3, 31),
+        "FREQ=MONTHLY;COUNT=2",
+    )
+    assert next_occurrence("FREQ=MONTHLY;COUNT=1", datetime(2030, 3, 31)) is None
+    assert list(
+        occurrences(
+            "FREQ=DAILY;INTERVAL=2",
+            date(2030, 1, 1),
+            datetime(2030, 1, 4),
+            datetime(2030, 1, 9),
+        )
+    ) == [datetime(2030, 1, 5), datetime(2030, 1, 7), datetime(2030, 1, 9)]
+
+
+def test_listing_generates_occurrences_in_window(app):
+    """Test that listings by due date show upcoming occurrences, page by page.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    daily = create_task("Daily", None, datetime(2030, 1, 1), recurrence="FREQ=DAILY")
+    once = create_task("Once", None, datetime(2030, 1, 3))
+
+    listed, after = [], None
+    while True:
+        page = list_task_rows(
+            after=after, limit=2, sort="due_date", due_to=date(2030, 1, 5)
+        )
+        listed.extend((row.due_date.day, row.id) for row in page.items)
+        after = page.next_cursor
+        if after is None:
+            break
+
+    assert listed == [(1, daily.id), (2, daily.id), (3, daily.id), (3, once.id)] + [
+        (4, daily.id),
+        (5, daily.id),
+    ]
+    assert db.session.scalar(db.select(db.func.count(Task.id))) == 2
+    assert task_stats()["open"] == 2
+
+    window = list_tasks(
+        sort="due_date", due_from=date(2030, 1, 4), due_to=date(2030, 1, 5)
+    ).items
+    assert window == [
+        TaskOccurrence(
+            daily.id, "Daily", None, datetime(2030, 1, day), False, 1, "FREQ=DAILY"
+        )
+        for day in (4, 5)
+    ]
+    assert [row.id for row in list_task_rows(sort="due_date").items] == [
+        daily.id,
+        once.id,
+    ]
+
+
+def test_completion_stores_next_instance(app):
+    """Test that completing an instance stores the next one until the end.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    first = create_task(
+        "Report", "Monthly", datetime(2030, 1, 15), recurrence="FREQ=MONTHLY;COUNT=3"
+    ).id
+    complete_task(first)
+    second = list_tasks(completed=False).items[0]
+    assert (second.due_date, second.recurrence) == (
+        datetime(2030, 2, 15),
+        "FREQ=MONTHLY;COUNT=2",
+    )
+
+    complete_tasks([second.id])
+    third = list_tasks(completed=False).items[0]
+    assert (third.due_date, third.recurrence) == (
+        datetime(2030, 3, 15),
+        "FREQ=MONTHLY;COUNT=1",
+    )
+
+    complete_task(third.id)
+    assert list_tasks(completed=False).items == []
+    assert task_stats()["completed"] == 3
+
+
+def test_listing_pages_through_many_series(app):
+    """Test that series read a page at a time give the full listing.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    series = [
+        create_task(
+            f"Series {day}", None, datetime(2030, 1, day), recurrence="FREQ=WEEKLY"
+        ).id
+        for day in range(1, 8)
+    ]
+    once = create_task("Once", None, datetime(2030, 1, 20)).id
+    expected = sorted(
+        [
+            (datetime(2030, 1, day), task_id)
+            for first_day, task_id in enumerate(series, start=1)
+            for day in range(first_day, 32, 7)
+        ]
+        + [(datetime(2030, 1, 20), once)]
+    )
+
+    listed, after = [], None
+    while True:
+        page = list_task_rows(
+            after=after, limit=2, sort="due_date", due_to=date(2030, 1, 31)
+        )
+        listed.extend((row.due_date, row.id) for row in page.items)
+        after = page.next_cursor
+        if after is None:
+            break
+
+    assert listed == expected
+
+
+def test_occurrences_have_no_actions(client):
+    """Test that the main page offers no actions on generated occurrences.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    create_task("Daily", None, datetime(2030, 1, 1), recurrence="FREQ=DAILY")
+
+    page = client.get("/?sort=due_date&due_to=2030-01-03").get_data(as_text=True)
+
+    assert page.count("(upcoming occurrence)") == 2
+    assert page.count(">Complete</button>") == 1
+    assert page.count(">Delete</button>") == 1
@@ -0,0 +1,182 @@
+import sqlite3
+
+import pytest
+
+from app import create_app, db
+from app.config import extra_engine_options
+from app.replicas import STICKY_COOKIE
+from app.services import create_task, get_task_row, list_task_rows, list_tasks
+
+
+def _copy_database(source, targets):
+    """Copy an SQLite database file, as a replica would.
+
+    Args:
+        source (Path): The primary database file.
+        targets (list): The replica database files.
+
+    Returns:
+        None
+
+    """
+    with sqlite3.connect(source) as primary:
+        for target in targets:
+            with sqlite3.connect(target) as replica:
+                primary.backup(replica)
+
+
+def _titles(path):
+    """Read the task titles stored in a database file.
+
+    Args:
+        path (Path): The database file.
+
+    Returns:
+        list: The titles, by id.
+
+    """
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute("SELECT title FROM tasks ORDER BY id")
+        return [row[0] for row in rows]
+
+
+@pytest.fixture()
+def replicas(tmp_path):
+    """List the replica database files of `replica_app`.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database files.
+
+    Returns:
+        list: The replica database files.
+
+    """
+    return [tmp_path / f"replica{number}.db" for number in range(2)]
+
+
+@pytest.fixture()
+def replica_app(tmp_path, replicas):
+    """Create an application reading from two copies of its database.
+
+    Each replica holds one task titled after it, standing in for data the
+    primary no longer has.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database files.
+        replicas (list): The replica database files.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    primary = tmp_path / "primary.db"
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}",
+        "SQLALCHEMY_REPLICA_URIS": [f"sqlite:///{path}" for path in replicas],
+    }
+    app = create_app(config_object=config, config_name="testing")
+
+    with app.app_context():
+        db.create_all()
+        create_task("Primary", None, None)
+        db.session.remove()
+        _copy_database(primary, replicas)
+        for number, path in enumerate(replicas):
+            with sqlite3.connect(path) as connection:
+                connection.execute("UPDATE tasks SET title = ?", (f"Replica {number}",))
+        yield app
+        db.drop_all()
+        db.engine.dispose()
+        app.extensions["replicas"].dispose()
+
+
+def test_extra_engine_options():
+    """Test building the engine options of the configured replicas.
+
+    Returns:
+        None
+
+    """
+    config = {
+        "SQLALCHEMY_REPLICA_URIS": ["sqlite:///a.db", "", "sqlite:///b.db"],
+        "SQLALCHEMY_POOL_SIZE": 3,
+        "SQLALCHEMY_MAX_OVERFLOW": 0,
+        "SQLALCHEMY_POOL_TIMEOUT": 1,
+        "SQLALCHEMY_POOL_RECYCLE": 60,
+    }
+
+    options = extra_engine_options(config, "SQLALCHEMY_REPLICA_URIS")
+
+    assert [uri for uri, _ in options] == ["sqlite:///a.db", "sqlite:///b.db"]
+    assert options[1][1]["pool_size"] == 3
+
+
+def test_reads_go_to_replicas_in_turn(replica_app, replicas):
+    """Test that each transaction reads from the next replica.
+
+    Args:
+        replica_app (Flask): The application with two replicas.
+        replicas (list): The replica database files.
+
+    Returns:
+        None
+
+    """
+    titles = []
+    for _ in range(4):
+        titles.append(list_tasks().items[0].title)
+        titles.append(get_task_row(1).title)
+        db.session.commit()
+
+    assert titles[:4] in (
+        ["Replica 0", "Replica 0", "Replica 1", "Replica 1"],
+        ["Replica 1", "Replica 1", "Replica 0", "Replica 0"],
+    )
+    assert titles[4:] == titles[:4]
+
+
+def test_session_reads_its_own_writes(replica_app, replicas):
+    """Test that a session that wrote reads from the primary.
+
+    Args:
+        replica_app (Flask): The application with two replicas.
+        replicas (list): The replica database files.
+
+    Returns:
+        None
+
+    """
+    list_task_rows()
+    create_task("New", None, None)
+
+    assert [row.title for row in list_task_rows().items] == ["Primary", "New"]
+    for path in replicas:
+        assert len(_titles(path)) == 1
+
+    db.session.remove()
+    assert [task.title for task in list_tasks().items] in (["Replica 0"], ["Replica 1"])
+
+
+def test_client_reads_its_own_writes(replica_app):
+    """Test that a client that wrote keeps reading from the primary.
+
+    Args:
+        replica_app (Flask): The application with two replicas.
+
+    Returns:
+        None
+
+    """
+    client = replica_app.test_client()
+    response = client.post(
+        "/api/v1/tasks", json={"title": "New", "description": "Desc"}
+    )
+    assert response.status_code == 201
+    assert STICKY_COOKIE in response.headers["Set-Cookie"]
+    location = response.headers["Location"]
+
+    # Requests share the session of the fixture's app context; give each its own.
+    db.session.remove()
+    assert client.get(location).status_code == 200
+    db.session.remove()
+    assert replica_app.test_client().get(location).status_code == 404
@@ -0,0 +1,207 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app, db
+from app.scheduler import OVERDUE, REMINDER, DueDateScheduler, _utcnow
+from app.services import (
+    complete_task,
+    create_task,
+    create_tasks,
+    delete_task,
+    prune_changes,
+)
+
+NOW = datetime(2030, 1, 1, 12)
+HOUR = timedelta(hours=1)
+
+
+@pytest.fixture()
+def fired():
+    """Collect the timers fired by `scheduler`.
+
+    Returns:
+        list: ``(kind, task id)`` pairs, in firing order.
+
+    """
+    return []
+
+
+@pytest.fixture()
+def scheduler(app, fired):
+    """Create a scheduler with a one hour lead and a six hour horizon.
+
+    Batches of two rows exercise the paging of the window queries.
+
+    Args:
+        app (Flask): The Flask application fixture.
+        fired (list): Receives the fired timers.
+
+    Returns:
+        DueDateScheduler: The scheduler, driven by calling `tick`.
+
+    """
+    scheduler = DueDateScheduler(
+        app, lead=3600, horizon=6 * 3600, poll_interval=1, batch_size=2
+    )
+    for kind in (REMINDER, OVERDUE):
+        scheduler.connect(kind, lambda task, kind=kind: fired.append((kind, task.id)))
+    return scheduler
+
+
+def test_window_is_loaded_from_the_index(scheduler, fired):
+    """Test that tasks due within the horizon fire in due date order.
+
+    Args:
+        scheduler (DueDateScheduler): The scheduler.
+        fired (list): The fired timers.
+
+    Returns:
+        None
+
+    """
+    soon = create_task("Soon", None, NOW + timedelta(minutes=10)).id
+    later = [create_task(f"Later {i}", None, NOW + 2 * HOUR).id for i in range(3)]
+    beyond = create_task("Beyond", None, NOW + 24 * HOUR).id
+    create_task("Past", None, NOW - HOUR)
+    create_task("Undated", None, None)
+
+    assert scheduler.tick(NOW) == NOW + timedelta(minutes=10)
+    assert fired == []
+
+    scheduler.tick(NOW + HOUR)
+    assert fired == [(OVERDUE, soon)] + [(REMINDER, task_id) for task_id in later]
+
+    fired.clear()
+    scheduler.tick(NOW + 23 * HOUR)
+    scheduler.tick(NOW + 24 * HOUR)
+    assert fired == [(OVERDUE, task_id) for task_id in later] + [
+        (REMINDER, beyond),
+        (OVERDUE, beyond),
+    ]
+
+
+def test_changes_are_picked_up(scheduler, fired):
+    """Test that new, completed and deleted tasks update the timers.
+
+    Args:
+        scheduler (DueDateScheduler): The scheduler.
+        fired (list): The fired timers.
+
+    Returns:
+        None
+
+    """
+    completed = create_task("Completed", None, NOW + 2 * HOUR).id
+    deleted = create_task("Deleted", None, NOW + 2 * HOUR).id
+    scheduler.tick(NOW)
+
+    created = create_task("Created", None, NOW + timedelta(minutes=30)).id
+    far = create_task("Far", None, NOW + 12 * HOUR).id
+    complete_task(completed)
+    delete_task(deleted)
+    scheduler.tick(NOW + timedelta(minutes=1))
+    assert fired == [(REMINDER, created)]
+
+    scheduler.tick(NOW + 3 * HOUR)
+    assert fired == [(REMINDER, created), (OVERDUE, created)]
+
+    scheduler.tick(NOW + 12 * HOUR)
+    assert fired[2:] == [(REMINDER, far), (OVERDUE, far)]
+
+
+@pytest.mark.parametrize("change", ["bulk", "pruned"])
+def test_window_is_reloaded(scheduler, fired, change):
+    """Test that bulk changes and a pruned change log reload the window.
+
+    Args:
+        scheduler (DueDateScheduler): The scheduler.
+        fired (list): The fired timers.
+        change (str): What happens to the tasks while the scheduler waits.
+
+    Returns:
+        None
+
+    """
+    reminded = create_task("Reminded", None, NOW + timedelta(minutes=80)).id
+    scheduler.tick(NOW)
+    scheduler.tick(NOW + HOUR)
+    assert fired == [(REMINDER, reminded)]
+
+    if change == "bulk":
+        created = create_tasks([{"title": "Bulk", "due_date": NOW + 3 * HOUR}] * 2)
+    else:
+        created = [create_task(f"Task {i}", None, NOW + 3 * HOUR).id for i in range(3)]
+        prune_changes(keep=1)
+    scheduler.tick(NOW + 3 * HOUR)
+
+    assert fired[1:] == [
+        (OVERDUE, reminded),
+        *[(REMINDER, task_id) for task_id in created],
+        *[(OVERDUE, task_id) for task_id in created],
+    ]
+
+
+def test_horizon_must_cover_the_lead(app):
+    """Test that reminders cannot be due before their task is loaded.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    with pytest.raises(ValueError):
+        DueDateScheduler(app, lead=3600, horizon=3600, poll_interval=1, batch_size=1)
+
+
+def test_scheduler_requires_sqlite(app):
+    """Test that the scheduler refuses databases committing ids out of order.
+
+    Args:
+        app (Flask): The Flask application fixture.
+
+    Returns:
+        None
+
+    """
+    app.config["SQLALCHEMY_DATABASE_URI"] = "postgresql://localhost/tasks"
+
+    with pytest.raises(RuntimeError):
+        DueDateScheduler.from_config(app)
+
+
+def test_background_scheduler_wakes_on_commit(tmp_path):
+    """Test that the scheduler thread fires the hooks of a new task.
+
+    The task is due shortly, so that it is found whether the first look at
+    the tasks happens before or after its creation.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        None
+
+    """
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "DUE_SCHEDULER_ENABLED": True,
+        "DUE_SCHEDULER_POLL_INTERVAL": 60,
+    }
+    app = create_app(config_object=config, config_name="testing")
+    scheduler = app.extensions["due_scheduler"]
+    overdue = threading.Event()
+    scheduler.connect(OVERDUE, lambda task: overdue.set())
+
+    with app.app_context():
+        db.create_all()
+        create_task("Soon", None, _utcnow() + timedelta(seconds=0.5))
+        try:
+            assert overdue.wait(5)
+        finally:
+            scheduler.close()
+            db.drop_all()
+            db.engine.dispose()
@@ -1,17 +1,26 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import db
-from app.models import Task
+from app.models import ArchivedTask, Task
 from app.services import (
+    InvalidCursorError,
     TaskNotFoundError,
+    archive_completed_tasks,
+    changes_since,
     complete_task,
+    complete_tasks,
     create_task,
+    create_tasks,
     delete_task,
+    delete_tasks,
+    get_task_row,
     list_tasks,
+    purge_deleted_tasks,
+    search_tasks,
 )
 
 
@@ -114,7 +123,8 @@ def test_list_tasks(client, task_data, create_task_fixture):
     db.session.scalars.return_value.all.return_value = [test_task]
     test_tasks = list_tasks()
     db.session.scalars.assert_called_once()
-    assert test_task in test_tasks
+    assert test_task in test_tasks.items
+    assert test_tasks.next_cursor is None
 
 
 @pytest.mark.parametrize(
@@ -145,10 +155,13 @@ def test_complete_task(client, task_data, create_task_fixture):
         description=task_data["description"],
         due_date=task_data["due_date"],
     )
-    db.session.get.return_value = test_task
+    db.session.scalars.return_value.first.return_value = test_task
     completed_task = complete_task(test_task.id)
-    db.session.get.assert_called_once_with(Task, test_task.id)
-    assert completed_task.completed
+    statement = str(db.session.scalars.call_args.args[0])
+    assert statement.startswith("UPDATE tasks SET completed=")
+    assert "version=(tasks.version + " in statement
+    db.session.get.assert_not_called()
+    assert completed_task is test_task
 
 
 @pytest.mark.parametrize(
@@ -179,7 +192,406 @@ def test_delete_task(client, task_data, create_task_fixture):
         description=task_data["description"],
         due_date=task_data["due_date"],
     )
-    db.session.get.return_value = test_task
+    db.session.scalars.return_value.first.return_value = test_task
     delete_task(test_task.id)
-    db.session.get.assert_called_once_with(Task, test_task.id)
-    db.session.delete.assert_called_once_with(test_task)
+    statement = str(db.session.scalars.call_args.args[0])
+    assert statement.startswith("UPDATE tasks SET deleted_at=")
+    db.session.get.assert_not_called()
+    db.session.delete.assert_not_called()
+
+
+def test_list_tasks_keyset_pagination(client, create_task_fixture):
+    """Test that list_tasks walks all tasks page by page without overlap.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    for i in range(5):
+        create_task_fixture(title=f"Task {i}", due_date=None)
+
+    first = list_tasks(limit=2)
+    second = list_tasks(after=first.next_cursor, limit=2)
+    third = list_tasks(after=second.next_cursor, limit=2)
+
+    assert [task.title for task in first.items] == ["Task 0", "Task 1"]
+    assert [task.title for task in second.items] == ["Task 2", "Task 3"]
+    assert [task.title for task in third.items] == ["Task 4"]
+    assert third.next_cursor is None
+
+
+def test_list_tasks_sorted_by_due_date(client, create_task_fixture):
+    """Test due date ordering across pages, with undated tasks last.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="No date", due_date=None)
+    create_task_fixture(title="Late", due_date=datetime(2031, 1, 1))
+    create_task_fixture(title="Early", due_date=datetime(2030, 1, 1))
+    create_task_fixture(title="Early too", due_date=datetime(2030, 1, 1))
+
+    titles = []
+    cursor = None
+    while True:
+        page = list_tasks(after=cursor, limit=1, sort="due_date")
+        titles.extend(task.title for task in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert titles == ["Early", "Early too", "Late", "No date"]
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({"completed": True}, ["Done"]),
+        ({"completed": False}, ["Open early", "Open late"]),
+        ({"due_from": date(2030, 6, 1)}, ["Open late"]),
+        ({"due_to": date(2030, 1, 1)}, ["Done", "Open early"]),
+        ({"title_prefix": "Open"}, ["Open early", "Open late"]),
+    ],
+)
+def test_list_tasks_filters(client, create_task_fixture, filters, expected):
+    """Test the completed and due date range filters of list_tasks.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+        filters (dict): The filters passed to list_tasks.
+        expected (list): The expected task titles.
+
+    Returns:
+        None
+
+    """
+    done = create_task_fixture(title="Done", due_date=datetime(2030, 1, 1, 12))
+    create_task_fixture(title="Open early", due_date=datetime(2030, 1, 1))
+    create_task_fixture(title="Open late", due_date=datetime(2031, 1, 1))
+    complete_task(done.id)
+
+    page = list_tasks(**filters)
+
+    assert [task.title for task in page.items] == expected
+
+
+def test_list_tasks_limit_is_clamped(app, create_task_fixture):
+    """Test that the page size cannot exceed TASKS_MAX_PER_PAGE.
+
+    Args:
+        app (Flask): The Flask application fixture.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    app.config["TASKS_MAX_PER_PAGE"] = 2
+    for i in range(3):
+        create_task_fixture(title=f"Task {i}", due_date=None)
+
+    page = list_tasks(limit=1000)
+
+    assert len(page.items) == 2
+    assert page.next_cursor is not None
+
+
+def test_list_tasks_invalid_cursor(client):
+    """Test that a malformed cursor raises InvalidCursorError.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    with pytest.raises(InvalidCursorError):
+        list_tasks(after="not-a-cursor")
+
+
+def test_create_tasks(client):
+    """Test that create_tasks inserts all rows and returns their ids.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    task_ids = create_tasks(
+        [
+            {"title": "Bulk 1", "description": "Desc 1", "due_date": None},
+            {"title": "Bulk 2", "description": "Desc 2", "due_date": date(2030, 1, 1)},
+        ]
+    )
+
+    assert len(task_ids) == 2
+    assert [db.session.get(Task, task_id).title for task_id in task_ids] == [
+        "Bulk 1",
+        "Bulk 2",
+    ]
+
+
+def test_complete_tasks_reports_not_found(client, create_task_fixture):
+    """Test that complete_tasks completes existing tasks and reports missing ids.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    first = create_task_fixture(due_date=None)
+    second = create_task_fixture(due_date=None)
+
+    result = complete_tasks([second.id, 1234, first.id])
+
+    assert result.succeeded == [second.id, first.id]
+    assert result.not_found == [1234]
+    assert db.session.get(Task, first.id).completed
+    assert db.session.get(Task, second.id).completed
+
+
+def test_delete_tasks_by_ids(client, create_task_fixture):
+    """Test that delete_tasks removes the given tasks and reports missing ids.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    first_id = create_task_fixture(due_date=None).id
+    second_id = create_task_fixture(due_date=None).id
+
+    result = delete_tasks([first_id, 1234])
+
+    assert result.succeeded == [first_id]
+    assert result.not_found == [1234]
+    assert [task.id for task in list_tasks().items] == [second_id]
+
+
+def test_delete_tasks_by_filter(client, create_task_fixture):
+    """Test that delete_tasks can select the tasks to delete by filter.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    done_id = create_task_fixture(title="Done", due_date=None).id
+    create_task_fixture(title="Open", due_date=None)
+    complete_task(done_id)
+
+    result = delete_tasks(completed=True)
+
+    assert result.succeeded == [done_id]
+    assert [task.title for task in list_tasks().items] == ["Open"]
+
+
+def test_delete_tasks_requires_ids_or_filters(client):
+    """Test that delete_tasks refuses to delete every task.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    with pytest.raises(ValueError):
+        delete_tasks(completed=None)
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_search_tasks(client, create_task_fixture, fts):
+    """Test that search_tasks matches every word and follows deletions.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+        fts (bool): Whether the FTS5 index or the LIKE fallback is used.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(title="Buy milk", description="From the shop", due_date=None)
+    create_task_fixture(title="Call shop", description="About milk", due_date=None)
+    create_task_fixture(title="Write report", description=None, due_date=None)
+
+    with patch("app.services._fts_enabled", return_value=fts):
+        assert {row.title for row in search_tasks("milk").items} == {
+            "Buy milk",
+            "Call shop",
+        }
+        assert {row.title for row in search_tasks("shop mil").items} == {
+            "Buy milk",
+            "Call shop",
+        }
+        assert [row.title for row in search_tasks("repo").items] == ["Write report"]
+        assert search_tasks("!!").items == []
+
+        delete_task(2)
+        assert [row.title for row in search_tasks("milk").items] == ["Buy milk"]
+
+
+def test_search_tasks_ranking(client, create_task_fixture):
+    """Test that full-text results are ordered by relevance.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    create_task_fixture(
+        title="Groceries",
+        description="Eggs, bread, cheese, butter, apples and milk",
+        due_date=None,
+    )
+    create_task_fixture(title="Milk", description="Milk", due_date=None)
+
+    assert [row.title for row in search_tasks("milk").items] == ["Milk", "Groceries"]
+
+
+def test_search_tasks_pagination(client, create_task_fixture):
+    """Test that search results are paginated by offset cursors.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    for i in range(3):
+        create_task_fixture(title=f"Errand {i}", due_date=None)
+
+    first = search_tasks("errand", limit=2)
+    second = search_tasks("errand", after=first.next_cursor, limit=2)
+
+    assert len(first.items) == 2
+    assert len(second.items) == 1
+    assert second.next_cursor is None
+    with pytest.raises(InvalidCursorError):
+        search_tasks("errand", after="-1")
+
+
+def backdate(task_id, **columns):
+    """Move the timestamps of a task back in time.
+
+    Args:
+        task_id (int): The ID of the task.
+        **columns: Timestamp column names and the number of days to go back.
+
+    Returns:
+        None
+
+    """
+    task = db.session.get(Task, task_id)
+    for name, days in columns.items():
+        setattr(task, name, getattr(task, name) - timedelta(days=days))
+    db.session.commit()
+
+
+def test_deleted_tasks_are_hidden(client, create_task_fixture):
+    """Test that soft-deleted tasks are kept but hidden from every service.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    kept = create_task_fixture(title="Kept task", due_date=None)
+    deleted = create_task_fixture(title="Deleted task", due_date=None)
+
+    delete_task(deleted.id)
+
+    assert db.session.get(Task, deleted.id).deleted_at is not None
+    assert [task.id for task in list_tasks().items] == [kept.id]
+    assert [row.id for row in search_tasks("task").items] == [kept.id]
+    with pytest.raises(TaskNotFoundError):
+        get_task_row(deleted.id)
+    with pytest.raises(TaskNotFoundError):
+        complete_task(deleted.id)
+    with pytest.raises(TaskNotFoundError):
+        delete_task(deleted.id)
+    assert delete_tasks([deleted.id]).not_found == [deleted.id]
+
+
+def test_purge_deleted_tasks(client, create_task_fixture):
+    """Test that only tasks deleted before the cutoff are purged.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    old = create_task_fixture(due_date=None).id
+    recent = create_task_fixture(due_date=None).id
+    live = create_task_fixture(due_date=None).id
+    delete_tasks([old, recent])
+    backdate(old, deleted_at=8)
+
+    assert purge_deleted_tasks(older_than_days=7) == 1
+
+    assert db.session.get(Task, old) is None
+    assert db.session.get(Task, recent) is not None
+    assert db.session.get(Task, live) is not None
+
+
+def test_archive_completed_tasks(client, create_task_fixture):
+    """Test that old completed tasks move to the archive table in batches.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+        create_task_fixture (function): The fixture to create a task.
+
+    Returns:
+        None
+
+    """
+    ids = [create_task_fixture(title=f"Task {i}", due_date=None).id for i in range(5)]
+    complete_tasks(ids[:4])
+    for task_id in ids[:3]:
+        backdate(task_id, completed_at=31)
+    recent_change = changes_since(0)[-1].change_id
+
+    assert archive_completed_tasks(older_than_days=30, batch_size=2) == 3
+
+    assert [task.id for task in list_tasks().items] == ids[3:]
+    archived = db.session.scalars(db.select(ArchivedTask).order_by(ArchivedTask.id))
+    assert [(row.task_id, row.title) for row in archived] == [
+        (task_id, f"Task {i}") for i, task_id in enumerate(ids[:3])
+    ]
+    assert [c.kind for c in changes_since(recent_change)] == ["reset", "reset"]
+    assert archive_completed_tasks(older_than_days=30) == 0
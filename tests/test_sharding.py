@@ -0,0 +1,290 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from app import create_app, db
+from app.services import (
+    TaskNotFoundError,
+    compact_tasks,
+    complete_task,
+    complete_tasks,
+    create_task,
+    create_tasks,
+    data_version,
+    delete_task,
+    delete_tasks,
+    get_task_row,
+    import_tasks,
+    iter_task_rows,
+    list_task_rows,
+    list_tasks,
+    reconcile_task_stats,
+    search_tasks,
+    task_stats,
+)
+from app.sharding import SHARD_ID_BITS
+
+SHARDS = 3
+
+
+def _shard_ids(path):
+    """Read the task ids stored in a shard database file.
+
+    Args:
+        path (Path): The database file.
+
+    Returns:
+        list: The ids, in ascending order.
+
+    """
+    with sqlite3.connect(path) as connection:
+        return [
+            row[0] for row in connection.execute("SELECT id FROM tasks ORDER BY id")
+        ]
+
+
+@pytest.fixture()
+def shard_paths(tmp_path):
+    """List the database files of `sharded_app`, by shard number.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database files.
+
+    Returns:
+        list: The database files.
+
+    """
+    return [tmp_path / f"shard{number}.db" for number in range(SHARDS)]
+
+
+@pytest.fixture()
+def sharded_app(shard_paths):
+    """Create an application partitioning tasks across three databases.
+
+    Args:
+        shard_paths (list): The database files, by shard number.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    uris = [f"sqlite:///{path}" for path in shard_paths]
+    config = {"SQLALCHEMY_DATABASE_URI": uris[0], "SQLALCHEMY_SHARD_URIS": uris[1:]}
+    app = create_app(config_object=config, config_name="testing")
+
+    with app.app_context():
+        shards = app.extensions["shards"]
+        for engine in shards.engines:
+            db.metadata.create_all(engine)
+        yield app
+        for engine in shards.engines:
+            db.metadata.drop_all(engine)
+        shards.dispose()
+        db.engine.dispose()
+
+
+def test_tasks_are_spread_across_shards(sharded_app, shard_paths):
+    """Test that new tasks go to every shard in turn, or by shard key.
+
+    Args:
+        sharded_app (Flask): The sharded application.
+        shard_paths (list): The database files, by shard number.
+
+    Returns:
+        None
+
+    """
+    task_ids = [create_task(f"Task {i}", None, None).id for i in range(6)]
+    keyed = [create_task("Keyed", None, None, shard_key="project-1").id for _ in "ab"]
+
+    for number, path in enumerate(shard_paths):
+        stored = _shard_ids(path)
+        assert all(task_id >> SHARD_ID_BITS == number for task_id in stored)
+        assert len(set(stored) & set(task_ids)) == 2
+    assert keyed[0] >> SHARD_ID_BITS == keyed[1] >> SHARD_ID_BITS
+    assert keyed[1] == keyed[0] + 1
+
+
+def test_single_task_operations_are_routed(sharded_app):
+    """Test reading, completing and deleting tasks stored on any shard.
+
+    Args:
+        sharded_app (Flask): The sharded application.
+
+    Returns:
+        None
+
+    """
+    task_ids = [create_task(f"Task {i}", None, None).id for i in range(SHARDS)]
+
+    for task_id in task_ids:
+        assert get_task_row(task_id).title.startswith("Task")
+        assert complete_task(task_id).completed
+    assert delete_task(task_ids[2]).deleted_at is not None
+    with pytest.raises(TaskNotFoundError):
+        get_task_row(task_ids[2])
+    with pytest.raises(TaskNotFoundError):
+        complete_task(SHARDS << SHARD_ID_BITS)
+
+    assert task_stats()["completed"] == 2
+    assert data_version().version == 7
+    assert compact_tasks(archive_after_days=-1, purge_after_days=-1) == {
+        "purged": 1,
+        "archived": 2,
+    }
+    assert reconcile_task_stats()["total"] == 0
+
+
+@pytest.mark.parametrize("sort", ["id", "due_date"])
+def test_listings_merge_shards(sharded_app, sort):
+    """Test that paging through a listing returns every task in order.
+
+    Args:
+        sharded_app (Flask): The sharded application.
+        sort (str): The listing order.
+
+    Returns:
+        None
+
+    """
+    for i in range(10):
+        due_date = datetime(2030, 1, 10 - i) if i % 4 else None
+        create_task(f"Task {i}", None, due_date)
+    create_task("Done", None, None)
+    complete_task(list_tasks(title_prefix="Done").items[0].id)
+
+    listed, after = [], None
+    while True:
+        page = list_task_rows(after=after, limit=3, sort=sort, completed=False)
+        listed.extend(page.items)
+        after = page.next_cursor
+        if after is None:
+            break
+
+    undated = [row for row in listed if row.due_date is None]
+    dated = [row for row in listed if row.due_date is not None]
+    assert len(listed) == 10
+    if sort == "id":
+        assert [row.id for row in listed] == sorted(row.id for row in listed)
+    else:
+        assert listed == dated + undated
+        assert [row.due_date for row in dated] == sorted(row.due_date for row in dated)
+    assert [row.id for row in undated] == sorted(row.id for row in undated)
+
+
+def test_api_on_shards(sharded_app):
+    """Test creating and fetching tasks through the API.
+
+    Args:
+        sharded_app (Flask): The sharded application.
+
+    Returns:
+        None
+
+    """
+    client = sharded_app.test_client()
+    locations = [
+        client.post(
+            "/api/v1/tasks", json={"title": f"Task {i}", "description": "Desc"}
+        ).headers["Location"]
+        for i in range(SHARDS)
+    ]
+
+    for location in locations:
+        assert client.get(location).status_code == 200
+    assert len(client.get("/api/v1/tasks").get_json()["tasks"]) == SHARDS
+
+
+def test_bulk_operations_are_routed(sharded_app, shard_paths):
+    """Test that bulk operations reach the tasks of every shard.
+
+    Args:
+        sharded_app (Flask): The sharded application.
+        shard_paths (list): The database files, by shard number.
+
+    Returns:
+        None
+
+    """
+    task_ids = [
+        create_task(f"Task {i}", None, datetime(2030, 1, 1), recurrence="FREQ=DAILY").id
+        for i in range(SHARDS)
+    ]
+    missing = SHARDS << SHARD_ID_BITS
+
+    result = complete_tasks([missing, *task_ids])
+    assert (result.succeeded, result.not_found) == (task_ids, [missing])
+    following = [row.id for row in list_tasks(completed=False).items]
+    assert [task_id >> SHARD_ID_BITS for task_id in following] == list(range(SHARDS))
+    assert delete_tasks(following[:2]).succeeded == following[:2]
+    assert delete_tasks(title_prefix="Task", completed=True).succeeded == task_ids
+
+    created = create_tasks([{"title": "Created"}] * 2, shard_key="project-1")
+    assert created[1] == created[0] + 1
+    tasks = ({"title": f"Imported {i}"} for i in range(4))
+    assert import_tasks(tasks, batch_size=2) == 4
+    for number, path in enumerate(shard_paths):
+        assert all(task_id >> SHARD_ID_BITS == number for task_id in _shard_ids(path))
+    assert task_stats() == reconcile_task_stats()
+    assert task_stats()["open"] == 7
+
+
+def test_search_and_export_merge_shards(sharded_app):
+    """Test that search pages and exports return the tasks of every shard.
+
+    Args:
+        sharded_app (Flask): The sharded application.
+
+    Returns:
+        None
+
+    """
+    task_ids = [create_task(f"Report {i}", None, None).id for i in range(7)]
+    create_task("Other", None, None)
+
+    found, after = [], None
+    while True:
+        page = search_tasks("report", after=after, limit=3)
+        found.extend(row.id for row in page.items)
+        after = page.next_cursor
+        if after is None:
+            break
+
+    assert sorted(found) == sorted(task_ids)
+    assert [row.id for row in iter_task_rows(title_prefix="Report")] == sorted(task_ids)
+
+
+def test_change_feed_is_unavailable(sharded_app):
+    """Test that the change feed refuses to publish a single shard.
+
+    Args:
+        sharded_app (Flask): The sharded application.
+
+    Returns:
+        None
+
+    """
+    assert sharded_app.test_client().get("/events").status_code == 501
+
+
+@pytest.mark.parametrize(
+    "setting", ["WRITE_BEHIND_ENABLED", "ASYNC_API_ENABLED", "DUE_SCHEDULER_ENABLED"]
+)
+def test_sharding_rejects_unsupported_features(tmp_path, setting):
+    """Test that sharding cannot be combined with features it does not cover.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database files.
+        setting (str): The setting enabling the feature.
+
+    Returns:
+        None
+
+    """
+    config = {
+        "SQLALCHEMY_SHARD_URIS": [f"sqlite:///{tmp_path / 'shard1.db'}"],
+        setting: True,
+    }
+    with pytest.raises(RuntimeError):
+        create_app(config_object=config, config_name="testing")
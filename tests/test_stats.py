@@ -0,0 +1,114 @@
+from datetime import date, datetime
+
+from app.models import TaskDueDay, TaskStats, db
+from app.services import (
+    archive_completed_tasks,
+    complete_task,
+    complete_tasks,
+    create_task,
+    create_tasks,
+    delete_task,
+    delete_tasks,
+    import_tasks,
+    reconcile_task_stats,
+    task_stats,
+)
+
+TODAY = date(2030, 6, 15)
+
+
+def test_task_stats_counts(app):
+    """Test the open, completed, overdue and due today counts.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    overdue = create_task("Overdue", None, datetime(2030, 6, 1)).id
+    create_task("Due today", None, datetime(2030, 6, 15, 18))
+    create_task("Later", None, datetime(2030, 7, 1))
+    create_task("Undated", None, None)
+    done = create_task("Done", None, datetime(2030, 5, 1)).id
+    complete_task(done)
+
+    assert task_stats(TODAY) == {
+        "total": 5,
+        "open": 4,
+        "completed": 1,
+        "overdue": 1,
+        "due_today": 1,
+    }
+
+    complete_task(overdue)
+    delete_task(done)
+    assert task_stats(TODAY) == {
+        "total": 4,
+        "open": 3,
+        "completed": 1,
+        "overdue": 0,
+        "due_today": 1,
+    }
+
+
+def test_task_stats_follow_bulk_operations(app):
+    """Test that every kind of task mutation keeps the counters exact.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    task_ids = create_tasks(
+        [
+            {"title": f"Task {i}", "due_date": datetime(2030, 6, i % 3 + 13)}
+            for i in range(9)
+        ]
+    )
+    import_tasks(
+        ({"title": f"Imported {i}", "due_date": None} for i in range(5)),
+        batch_size=2,
+    )
+    complete_tasks(task_ids[:4] + [task_ids[0], 999])
+    delete_tasks(task_ids[3:6])
+    delete_tasks(completed=False, title_prefix="Imported")
+    archive_completed_tasks(older_than_days=-1)
+
+    incremental = task_stats(TODAY)
+    assert incremental == {
+        "total": 3,
+        "open": 3,
+        "completed": 0,
+        "overdue": 2,
+        "due_today": 1,
+    }
+    reconcile_task_stats()
+    assert task_stats(TODAY) == incremental
+
+
+def test_reconcile_task_stats(app):
+    """Test that reconciling repairs drifted counters and drops empty days.
+
+    Args:
+        app (Flask): The Flask application.
+
+    Returns:
+        None
+
+    """
+    task_id = create_task("Task", None, datetime(2030, 6, 1)).id
+    complete_task(task_id)
+    create_task("Open", None, datetime(2030, 6, 2))
+    db.session.execute(db.update(TaskStats).values(open_tasks=42))
+    db.session.commit()
+
+    stats = reconcile_task_stats()
+
+    assert stats["open"] == 1
+    assert stats["completed"] == 1
+    days = db.session.execute(db.select(TaskDueDay.due_day, TaskDueDay.open_tasks))
+    assert days.all() == [(date(2030, 6, 2), 1)]
@@ -0,0 +1,39 @@
+from app import create_app
+
+
+def test_templates_are_precompiled(tmp_path):
+    """Test that the app factory fills the template bytecode cache.
+
+    Args:
+        tmp_path (Path): A temporary directory for the bytecode cache.
+
+    Returns:
+        None
+
+    """
+    config = {"TEMPLATE_BYTECODE_CACHE_DIR": str(tmp_path)}
+    create_app(config_object=config, config_name="testing")
+
+    assert len(list(tmp_path.iterdir())) == 3
+    app = create_app(config_object=config, config_name="testing")
+    assert app.jinja_env.bytecode_cache.directory == str(tmp_path)
+
+
+def test_template_bytecode_cache_disabled(tmp_path):
+    """Test that no bytecode is written when the cache is disabled.
+
+    Args:
+        tmp_path (Path): A temporary directory for the bytecode cache.
+
+    Returns:
+        None
+
+    """
+    config = {
+        "TEMPLATE_BYTECODE_CACHE": False,
+        "TEMPLATE_BYTECODE_CACHE_DIR": str(tmp_path),
+    }
+    app = create_app(config_object=config, config_name="testing")
+
+    assert app.jinja_env.bytecode_cache is None
+    assert list(tmp_path.iterdir()) == []
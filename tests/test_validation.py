@@ -0,0 +1,76 @@
+from datetime import date
+
+import pytest
+
+from app.validation import TaskValidationError, clean_task_data
+
+
+def test_clean_task_data_valid():
+    """Test that valid task data is cleaned and the due date parsed.
+
+    Returns:
+        None
+
+    """
+    cleaned = clean_task_data(
+        {
+            "title": "Valid Task",
+            "description": "A description",
+            "due_date": "2030-01-01",
+        }
+    )
+    assert cleaned == {
+        "title": "Valid Task",
+        "description": "A description",
+        "due_date": date(2030, 1, 1),
+        "recurrence": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "task_data, field",
+    [
+        ({"title": "", "description": "A description"}, "title"),
+        ({"title": "x" * 101, "description": "A description"}, "title"),
+        ({"title": "Task", "description": "x" * 301}, "description"),
+        (
+            {"title": "Task", "description": "Desc", "due_date": "01/01/2030"},
+            "due_date",
+        ),
+        (
+            {
+                "title": "Task",
+                "description": "Desc",
+                "due_date": "2030-01-01T09:30:00+02:00",
+            },
+            "due_date",
+        ),
+        (
+            {"title": "Task", "description": "Desc", "recurrence": "FREQ=DAILY"},
+            "recurrence",
+        ),
+        (
+            {
+                "title": "Task",
+                "description": "Desc",
+                "due_date": "2030-01-01",
+                "recurrence": "FREQ=SOMETIMES",
+            },
+            "recurrence",
+        ),
+    ],
+)
+def test_clean_task_data_invalid(task_data, field):
+    """Test that invalid task data is rejected with per-field errors.
+
+    Args:
+        task_data (dict): The raw task data.
+        field (str): The field expected to be reported.
+
+    Returns:
+        None
+
+    """
+    with pytest.raises(TaskValidationError) as exc_info:
+        clean_task_data(task_data)
+    assert field in exc_info.value.errors
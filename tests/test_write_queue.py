@@ -0,0 +1,141 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models import Task
+from app.services import (
+    TaskNotFoundError,
+    complete_task,
+    create_task,
+    delete_task,
+    list_task_rows,
+    write_queue,
+)
+
+
+@pytest.fixture()
+def write_behind_app(tmp_path):
+    """Create an application with write-behind enabled on a file database.
+
+    Args:
+        tmp_path (Path): A temporary directory for the database file.
+
+    Returns:
+        Flask: The Flask application.
+
+    """
+    config = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "WRITE_BEHIND_ENABLED": True,
+        "WRITE_BEHIND_INTERVAL_MS": 50,
+        "WRITE_BEHIND_MAX_BATCH": 10,
+    }
+    app = create_app(config_object=config, config_name="testing")
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        write_queue().close()
+        db.drop_all()
+        db.engine.dispose()
+
+
+def count_commits(engine):
+    """Count the transactions committed on an engine.
+
+    Args:
+        engine (Engine): The engine to watch.
+
+    Returns:
+        list: A list whose length is the number of commits so far.
+
+    """
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(threading.get_ident()))
+    return commits
+
+
+def test_write_behind_batches_concurrent_writes(write_behind_app):
+    """Test that concurrent writes are committed in shared transactions.
+
+    Args:
+        write_behind_app (Flask): The application with write-behind enabled.
+
+    Returns:
+        None
+
+    """
+    commits = count_commits(db.engine)
+
+    def create(i):
+        with write_behind_app.app_context():
+            return create_task(f"Task {i}", None, None).id
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        task_ids = list(pool.map(create, range(20)))
+
+    assert sorted(task_ids) == list(range(1, 21))
+    assert db.session.scalar(db.select(db.func.count(Task.id))) == 20
+    assert len(commits) < 20
+
+
+def test_write_behind_isolates_failures(write_behind_app):
+    """Test that a failing operation does not fail the rest of its batch.
+
+    Args:
+        write_behind_app (Flask): The application with write-behind enabled.
+
+    Returns:
+        None
+
+    """
+    created = create_task("Task", None, None, wait=False)
+    missing = complete_task(42, wait=False)
+    completed = complete_task(1, wait=False)
+
+    assert created.result().title == "Task"
+    with pytest.raises(TaskNotFoundError):
+        missing.result()
+    assert completed.result().completed is True
+    assert db.session.get(Task, 1).completed is True
+
+
+def test_write_behind_close_flushes_queue(write_behind_app):
+    """Test that closing the queue writes the pending operations.
+
+    Args:
+        write_behind_app (Flask): The application with write-behind enabled.
+
+    Returns:
+        None
+
+    """
+    futures = [create_task(f"Task {i}", None, None, wait=False) for i in range(3)]
+    futures.append(delete_task(1, wait=False))
+
+    write_queue().close()
+
+    assert all(future.done() for future in futures)
+    assert len(list_task_rows().items) == 2
+    with pytest.raises(RuntimeError):
+        create_task("Late", None, None)
+
+
+def test_create_task_without_write_behind_returns_future(client):
+    """Test that wait=False returns a resolved future when writes are direct.
+
+    Args:
+        client (FlaskClient): The Flask test client.
+
+    Returns:
+        None
+
+    """
+    future = create_task("Direct", None, None, wait=False)
+
+    assert isinstance(future, Future)
+    assert future.result().id == 1
+    assert write_queue() is None